@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the encoding of the coordinates for the GML and JSON output.
+
+It encodes the perimeter of a forest with the requested number of vertices in LV95, once as done by the
+former templates and JSON renderer and once using the coordinate encoder and the first installed JSON
+backend. Run it with:
+
+    python benchmarks/coordinates.py
+"""
+import json
+import math
+import optparse
+import timeit
+from itertools import chain
+
+from shapely.geometry import Polygon, mapping
+
+from pyramid_oereb.lib.renderer.coordinates import CoordinateEncoder
+from pyramid_oereb.lib.renderer.json_backends import create_json_backend
+
+
+def create_perimeter(vertices):
+    """
+    Creates an irregular polygon around Liestal with a hole, like the perimeter of a large forest.
+    """
+    def ring(count, radius, center):
+        coords = list()
+        for i in range(count):
+            angle = 2 * math.pi * i / count
+            r = radius * (1 + 0.05 * math.sin(37 * angle) + 0.01 * math.cos(1013 * angle))
+            coords.append((center[0] + r * math.cos(angle), center[1] + r * math.sin(angle)))
+        return coords
+    center = (2622000.123456, 1259000.654321)
+    return Polygon(ring(vertices - vertices // 10, 2000.0, center), [ring(vertices // 10, 300.0, center)])
+
+
+def gml_former(polygon):
+    return [' '.join(map(str, chain.from_iterable(linear_ring.coords)))
+            for linear_ring in [polygon.exterior] + list(polygon.interiors)]
+
+
+def gml_encoded(encoder, polygon):
+    return [encoder.pos_list(linear_ring.coords)
+            for linear_ring in [polygon.exterior] + list(polygon.interiors)]
+
+
+def json_former(polygon):
+    return json.dumps(mapping(polygon)['coordinates'])
+
+
+def json_encoded(encoder, json_backend, polygon):
+    return json_backend.dumps(encoder.arrays(polygon))
+
+
+def run():
+    parser = optparse.OptionParser(
+        usage='usage: %prog [options]',
+        description='Benchmarks the encoding of the coordinates for the GML and JSON output.'
+    )
+    parser.add_option(
+        '-v', '--vertices',
+        dest='vertices',
+        type='int',
+        default=50000,
+        help='The number of vertices of the perimeter (default is: 50000).'
+    )
+    parser.add_option(
+        '-p', '--precision',
+        dest='precision',
+        type='int',
+        default=3,
+        help='The number of decimals of the encoded coordinates (default is: 3).'
+    )
+    parser.add_option(
+        '-r', '--repeat',
+        dest='repeat',
+        type='int',
+        default=10,
+        help='The number of encoded perimeters (default is: 10).'
+    )
+    options, args = parser.parse_args()
+    polygon = create_perimeter(options.vertices)
+    encoder = CoordinateEncoder(options.precision)
+    json_backend = create_json_backend()
+
+    print('{0} vertices, {1} decimals, {2} perimeters, JSON backend {3}'.format(
+        options.vertices, options.precision, options.repeat, json_backend.name))
+    for output, former, encoded in [
+        ('GML', gml_former, lambda p: gml_encoded(encoder, p)),
+        ('JSON', json_former, lambda p: json_encoded(encoder, json_backend, p))
+    ]:
+        timings = dict()
+        sizes = dict()
+        for name, function in [('former', former), ('encoded', encoded)]:
+            timings[name] = min(timeit.repeat(
+                lambda: function(polygon),
+                repeat=3,
+                number=options.repeat
+            )) / options.repeat
+            sizes[name] = sum(len(part) for part in function(polygon)) if output == 'GML' \
+                else len(function(polygon))
+            print('{0:>5} {1:>8}: {2:8.2f} ms per perimeter, {3:10d} characters'.format(
+                output, name, timings[name] * 1000, sizes[name]))
+        print('{0:>5} {1:>8}: {2:8.2f}x'.format(output, 'speedup', timings['former'] / timings['encoded']))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the generation of the MapFish print spec of an extract.
+
+It compares rendering the extract as JSON and converting it for the print with building the printable
+extract directly from the extract record. The extract contains the requested number of public law
+restrictions distributed over the configured themes. Run it with:
+
+    python benchmarks/print_spec.py -c pyramid_oereb/standard/pyramid_oereb.yml
+"""
+import datetime
+import json
+import optparse
+import os
+import timeit
+
+from pyramid import testing
+from shapely.geometry import MultiPolygon, Point, Polygon, mapping
+
+from pyramid_oereb.contrib.print_proxy.mapfish_print import Renderer
+from pyramid_oereb.contrib.print_proxy.print_model import PrintModelBuilder
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.records.documents import DocumentRecord, LegalProvisionRecord
+from pyramid_oereb.lib.records.embeddable import EmbeddableRecord
+from pyramid_oereb.lib.records.extract import ExtractRecord
+from pyramid_oereb.lib.records.geometry import GeometryRecord
+from pyramid_oereb.lib.records.image import ImageRecord
+from pyramid_oereb.lib.records.law_status import LawStatusRecord
+from pyramid_oereb.lib.records.office import OfficeRecord
+from pyramid_oereb.lib.records.plr import PlrRecord
+from pyramid_oereb.lib.records.real_estate import RealEstateRecord
+from pyramid_oereb.lib.records.view_service import ViewServiceRecord, LegendEntryRecord
+from pyramid_oereb.views.webservice import Parameter
+
+SYMBOL = os.path.join(os.path.dirname(__file__), '..', 'tests', 'resources', 'python.svg')
+WMS_URL = 'https://wms.geo.admin.ch/?SERVICE=WMS&REQUEST=GetMap&VERSION=1.1.1&STYLES=default' \
+          '&SRS=EPSG:2056&BBOX=2475000,1065000,2850000,1300000&WIDTH=493&HEIGHT=280&FORMAT=image/png' \
+          '&LAYERS={0}'
+
+
+class DummyRenderInfo(object):
+    name = 'benchmark'
+
+
+def create_extract(count, legends_per_theme):
+    """
+    Creates an extract with the public law restrictions of the configured themes. Each restriction has its
+    own view service, legal provision and law as if they were read from the database.
+    """
+    with open(SYMBOL, 'rb') as f:
+        symbol = f.read()
+    law_status = LawStatusRecord(u'inForce', {u'de': u'In Kraft', u'fr': u'En vigueur'})
+    office = OfficeRecord({u'de': u'Amt für Geoinformation'}, postal_code=4410, city=u'Liestal')
+    themes = Config.get_themes()
+    plrs = list()
+    for i in range(count):
+        theme = themes[i % len(themes)]
+        type_code = u'Code{0}'.format(i % legends_per_theme)
+        legends = [
+            LegendEntryRecord(ImageRecord(symbol), {u'de': u'Legende {0}'.format(j)}, u'Code{0}'.format(j),
+                              u'TypeCodeList', theme, view_service_id=1)
+            for j in range(legends_per_theme)
+        ]
+        law = DocumentRecord('Law', law_status, datetime.date(2016, 1, 1), {u'de': u'Gesetz {0}'.format(i)},
+                             office, {u'de': u'http://my.law.ch/{0}'.format(i)})
+        legal_provision = LegalProvisionRecord(
+            law_status, datetime.date(2016, 1, 1), {u'de': u'Vorschrift {0}'.format(i)}, office,
+            {u'de': u'http://my.legal-provision.ch/{0}'.format(i)}, references=[law]
+        )
+        plr = PlrRecord(
+            theme, {u'de': u'Information {0}'.format(i)}, law_status, datetime.date(2016, 1, 1), office,
+            ImageRecord(symbol), ViewServiceRecord(WMS_URL.format(theme.code), 1, 0.75, None, legends),
+            [GeometryRecord(law_status, datetime.date(2016, 1, 1), Point(0.5, 0.2), office=office)],
+            type_code=type_code, type_code_list=u'TypeCodeList', documents=[legal_provision],
+            view_service_id=1
+        )
+        plr._area_share = 100 + i
+        plr.part_in_percent = 1.5
+        plrs.append(plr)
+    real_estate = RealEstateRecord(u'RealEstate', u'BL', u'Liestal', 2829, 11395,
+                                   MultiPolygon([Polygon([(0, 0), (1, 1), (1, 0)])]),
+                                   egrid=u'CH775979211712', public_law_restrictions=plrs)
+    real_estate.set_view_service(ViewServiceRecord(WMS_URL.format('av'), 1, 0.6, None, None))
+    real_estate.set_main_page_view_service(ViewServiceRecord(WMS_URL.format('pk'), 1, 0.5, None, None))
+    date = datetime.datetime.now()
+    return ExtractRecord(
+        real_estate, ImageRecord(symbol), ImageRecord(symbol), ImageRecord(symbol), ImageRecord(symbol),
+        office, {u'de': u'Grundlagedaten'}, EmbeddableRecord(date, office, office, date, []),
+        concerned_theme=themes, not_concerned_theme=[], theme_without_data=[]
+    )
+
+
+def convert(renderer, extract, params):
+    return renderer.convert_to_printable_extract(
+        renderer._render(extract, params), mapping(extract.real_estate.limit), set()
+    )
+
+
+def build(renderer, extract, params):
+    return PrintModelBuilder(renderer, params).build(extract, mapping(extract.real_estate.limit), set())
+
+
+def run():
+    parser = optparse.OptionParser(
+        usage='usage: %prog [options]',
+        description='Benchmarks the generation of the MapFish print spec of an extract.'
+    )
+    parser.add_option(
+        '-c', '--configuration',
+        dest='configuration',
+        metavar='YAML',
+        type='string',
+        default='pyramid_oereb/standard/pyramid_oereb.yml',
+        help='The absolute path to the configuration yaml file.'
+    )
+    parser.add_option(
+        '-s', '--section',
+        dest='section',
+        metavar='SECTION',
+        type='string',
+        default='pyramid_oereb',
+        help='The section which contains configuration (default is: pyramid_oereb).'
+    )
+    parser.add_option(
+        '-n', '--restrictions',
+        dest='restrictions',
+        type='int',
+        default=200,
+        help='The number of public law restrictions per extract (default is: 200).'
+    )
+    parser.add_option(
+        '-l', '--legends',
+        dest='legends',
+        type='int',
+        default=20,
+        help='The number of legend entries per view service (default is: 20).'
+    )
+    parser.add_option(
+        '-r', '--repeat',
+        dest='repeat',
+        type='int',
+        default=10,
+        help='The number of built extracts (default is: 10).'
+    )
+    options, args = parser.parse_args()
+    Config.init(options.configuration, options.section)
+
+    pyramid_config = testing.setUp()
+    pyramid_config.include('pyramid_oereb.routes')
+    try:
+        extract = create_extract(options.restrictions, options.legends)
+        params = Parameter('pdf', 'reduced', egrid='CH775979211712', language='de')
+        renderer = Renderer(DummyRenderInfo())
+        renderer._request = testing.DummyRequest()
+        renderer._fallback_language = Config.get('default_language')
+        if json.dumps(convert(renderer, extract, params), sort_keys=True) != \
+                json.dumps(build(renderer, extract, params), sort_keys=True):
+            raise AssertionError('The built print spec differs from the converted one.')
+
+        print('{0} restrictions, {1} legend entries per view service, {2} extracts'.format(
+            options.restrictions, options.legends, options.repeat))
+        timings = dict()
+        for name, function in [('converted', convert), ('built', build)]:
+            timings[name] = min(timeit.repeat(
+                lambda: function(renderer, extract, params),
+                repeat=3,
+                number=options.repeat
+            )) / options.repeat
+            print('{0:>10}: {1:8.2f} ms per extract'.format(name, timings[name] * 1000))
+        print('{0:>10}: {1:8.2f}x'.format('speedup', timings['converted'] / timings['built']))
+    finally:
+        testing.tearDown()
+
+
+if __name__ == '__main__':
+    run()
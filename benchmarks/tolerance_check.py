@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the tolerance check of the geometries of an extract.
+
+It uses the real estate and the PLR geometries of the sample data. The geometries are copied on a grid
+around the real estate to simulate a parcel with many public law restrictions. Run it with:
+
+    python benchmarks/tolerance_check.py -c pyramid_oereb/standard/pyramid_oereb.yml
+"""
+import glob
+import json
+import optparse
+import os
+import timeit
+from datetime import date
+
+from shapely import wkt
+from shapely.affinity import translate
+
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.records.geometry import GeometryRecord, GeometryTypes, ToleranceCheckBatch
+from pyramid_oereb.lib.records.real_estate import RealEstateRecord
+
+SAMPLE_DATA = os.path.join(os.path.dirname(__file__), '..', 'sample_data')
+
+
+class OverlayGeometryRecord(GeometryRecord):
+    """
+    Geometry record always computing the full intersection, as done without the prepared real estate limit.
+    """
+    def _intersection(self, real_estate):
+        return self.geom.intersection(real_estate.limit)
+
+
+def _from_ewkt(value):
+    return wkt.loads(value.split(';', 1)[-1])
+
+
+def load_real_estate():
+    real_estate = json.load(open(os.path.join(SAMPLE_DATA, 'real_estates.json')))[0]
+    return _from_ewkt(real_estate['limit']), real_estate['land_registry_area']
+
+
+def load_geometries(limit, count):
+    """
+    Loads the sample geometries and copies them on a grid covering the real estate and its surrounding
+    until the requested count is reached.
+    """
+    parts = list()
+    for path in sorted(glob.glob(os.path.join(SAMPLE_DATA, 'plr119', '*', 'geometry.json'))):
+        for geometry in json.load(open(path)):
+            geom = _from_ewkt(geometry['geom'])
+            parts.extend(geom.geoms if geom.type == 'GeometryCollection' else [geom])
+    min_x, min_y, max_x, max_y = limit.bounds
+    size = int(count ** 0.5) + 1
+    step_x = 2 * (max_x - min_x) / size
+    step_y = 2 * (max_y - min_y) / size
+    geometries = list()
+    for i in range(count):
+        geom = parts[i % len(parts)]
+        column, row = i % size, i // size
+        geometries.append(translate(geom, (column - size / 2) * step_x, (row - size / 2) * step_y))
+    return geometries
+
+
+def check(record_class, limit, land_registry_area, geometries):
+    real_estate = RealEstateRecord('Liegenschaft', 'BL', 'Nusshof', 2771, land_registry_area, limit)
+    geometry_types = GeometryTypes.from_config()
+    records = list()
+    for geom in geometries:
+        record = record_class('inForce', date(2016, 2, 25), geom)
+        record.calculate(real_estate, 1.0, 1.0, 'm', 'm2', geometry_types)
+        records.append(record)
+    return results(records)
+
+
+def check_batch(limit, land_registry_area, geometries):
+    real_estate = RealEstateRecord('Liegenschaft', 'BL', 'Nusshof', 2771, land_registry_area, limit)
+    batch = ToleranceCheckBatch(real_estate)
+    records = list()
+    for geom in geometries:
+        record = GeometryRecord('inForce', date(2016, 2, 25), geom)
+        batch.add(record, 1.0, 1.0, 'm', 'm2')
+        records.append(record)
+    batch.calculate()
+    return results(records)
+
+
+def results(records):
+    # The overlay may differ in the last digits of the shares, which are rounded in the extract anyway
+    return [(
+        record._test_passed,
+        record._nr_of_points,
+        None if record._length_share is None else round(record._length_share, 6),
+        None if record._area_share is None else round(record._area_share, 6)
+    ) for record in records]
+
+
+def run():
+    parser = optparse.OptionParser(
+        usage='usage: %prog [options]',
+        description='Benchmarks the tolerance check of the geometries of an extract.'
+    )
+    parser.add_option(
+        '-c', '--configuration',
+        dest='configuration',
+        metavar='YAML',
+        type='string',
+        default='pyramid_oereb/standard/pyramid_oereb.yml',
+        help='The absolute path to the configuration yaml file.'
+    )
+    parser.add_option(
+        '-s', '--section',
+        dest='section',
+        metavar='SECTION',
+        type='string',
+        default='pyramid_oereb',
+        help='The section which contains configuration (default is: pyramid_oereb).'
+    )
+    parser.add_option(
+        '-n', '--geometries',
+        dest='geometries',
+        type='int',
+        default=500,
+        help='The number of geometries per extract (default is: 500).'
+    )
+    parser.add_option(
+        '-r', '--repeat',
+        dest='repeat',
+        type='int',
+        default=20,
+        help='The number of checked extracts (default is: 20).'
+    )
+    options, args = parser.parse_args()
+    Config.init(options.configuration, options.section)
+
+    limit, land_registry_area = load_real_estate()
+    geometries = load_geometries(limit, options.geometries)
+    overlay = check(OverlayGeometryRecord, limit, land_registry_area, geometries)
+    prepared = check(GeometryRecord, limit, land_registry_area, geometries)
+    if overlay != prepared:
+        raise AssertionError('The prepared tolerance check returned different results.')
+    if overlay != check_batch(limit, land_registry_area, geometries):
+        raise AssertionError('The batch tolerance check returned different results.')
+
+    print('{0} geometries, {1} passed, {2} extracts'.format(
+        len(geometries), len([result for result in prepared if result[0]]), options.repeat))
+    timings = dict()
+    for name, function in [
+        ('overlay', lambda: check(OverlayGeometryRecord, limit, land_registry_area, geometries)),
+        ('prepared', lambda: check(GeometryRecord, limit, land_registry_area, geometries)),
+        ('batch', lambda: check_batch(limit, land_registry_area, geometries))
+    ]:
+        timings[name] = min(timeit.repeat(function, repeat=3, number=options.repeat)) / options.repeat
+        print('{0:>10}: {1:8.2f} ms per extract'.format(name, timings[name] * 1000))
+    print('{0:>10}: {1:8.2f}x'.format('speedup', timings['overlay'] / timings['batch']))
+
+
+if __name__ == '__main__':
+    run()
@@ -153,6 +153,9 @@ vars:
     # your importing process!
     srid: 2056
 
+    # The templates are compiled to this directory while building the image (see Dockerfile).
+    template_module_directory: /var/cache/pyramid_oereb/templates
+
     # definition of the available geometry types for different checks
     geometry_types:
       point:
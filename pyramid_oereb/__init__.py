@@ -65,3 +65,21 @@ def includeme(config):
     config.add_renderer('pyramid_oereb_getegrid_xml', 'pyramid_oereb.lib.renderer.getegrid.xml_.Renderer')
 
     config.include('pyramid_oereb.routes')
+
+    # Compile the templates once per process
+    from pyramid_oereb.lib.renderer.templates import init_template_lookups
+    init_template_lookups()
+
+    # Create the plr sources once per process, they are shared between all requests
+    from pyramid_oereb.lib.processor import init_processor_factory
+    init_processor_factory()
+
+    # Create the extract, image and document caches once per process, if they are configured
+    from pyramid_oereb.lib.cache import init_extract_cache, init_image_cache, init_document_cache
+    init_extract_cache()
+    init_image_cache()
+    init_document_cache()
+
+    # Create the queue of the asynchronous print jobs once per process, if it is configured
+    from pyramid_oereb.lib.print_jobs import init_print_job_queue
+    init_print_job_queue()
@@ -13,7 +13,7 @@ from pyramid_oereb.standard.models import NAMING_CONVENTION
 from pyramid_oereb.lib.config import Config
 from sqlalchemy.ext.declarative import declarative_base
 from geoalchemy2.types import Geometry as GeoAlchemyGeometry
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, configure_mappers, joinedload, selectinload
 from sqlalchemy_utils import JSONType
 
 metadata = sa.MetaData(naming_convention=NAMING_CONVENTION)
@@ -348,3 +348,39 @@ class PublicLawRestrictionRefinement(Base):
         PublicLawRestriction,
         foreign_keys=[public_law_restriction_refinement_id]
     )
+
+
+def public_law_restriction_loader_options(strategy='selectin', geometries=True):
+    """
+    Creates the loader options to load public law restrictions together with all relations used to create
+    their records in a fixed number of queries, instead of one query per lazy loaded relation. The documents
+    are not part of this model, they are loaded from OEREBlex.
+
+    Args:
+        strategy (str): The strategy used to load the related collections. Possible values are 'selectin'
+            (one additional query per collection) and 'joined' (one single query). Single related objects
+            are always joined.
+        geometries (bool): Switch to load the geometries too. They can be left out if they are loaded in
+            another way.
+
+    Returns:
+        list of sqlalchemy.orm.strategy_options.Load: The loader options for a query of
+        :class:`pyramid_oereb.contrib.models.oereblex.groundwater_protection_zones.PublicLawRestriction`.
+    """
+    configure_mappers()
+    collection_loader = selectinload if strategy == 'selectin' else joinedload
+    options = [
+        joinedload(PublicLawRestriction.view_service),
+        joinedload(PublicLawRestriction.responsible_office),
+        collection_loader(PublicLawRestriction.basis).options(
+            joinedload(PublicLawRestrictionBase.base)
+        ),
+        collection_loader(PublicLawRestriction.refinements).options(
+            joinedload(PublicLawRestrictionRefinement.refinement)
+        )
+    ]
+    if geometries:
+        options.append(collection_loader(PublicLawRestriction.geometries).options(
+            joinedload(Geometry.responsible_office)
+        ))
+    return options
@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 import io
 import json
 import logging
+import os
+import shutil
 import requests
 from shapely.geometry import mapping
 import subprocess
@@ -10,14 +12,20 @@ import sys
 import tempfile
 import time
 from urllib import parse as urlparse
+import warnings
 
-from pyramid.httpexceptions import HTTPBadRequest
+from pyramid.httpexceptions import HTTPBadRequest, HTTPServiceUnavailable
+from pyramid.response import FileIter
 from pyramid_oereb import Config
 from pyramid_oereb.lib.renderer.extract.json_ import Renderer as JsonRenderer
+from pyramid_oereb.lib.download import download_document_files
+from pyramid_oereb.lib.print_jobs import get_print_job_queue, PrintJobQueueFull
 from pyramid_oereb.lib.url import parse_url
+from pyramid_oereb.views.webservice import Parameter, PrintJob
 from pyramid.httpexceptions import HTTPInternalServerError
-from PyPDF2 import PdfFileReader
+from PyPDF2 import PdfFileReader, PdfFileMerger
 from PyPDF2.utils import PdfReadError
+from .print_model import PrintModelBuilder
 from .toc_pages import TocPages
 
 
@@ -48,7 +56,8 @@ class Renderer(JsonRenderer):
     def __call__(self, value, system):
         """
         Implements a subclass of pyramid_oereb.lib.renderer.extract.json_.Renderer to create a print result
-        out of a json. The json extract is reformatted to fit the structure of mapfish print.
+        out of an extract. The extract record is built into the structure of mapfish print by the
+        :py:class:`pyramid_oereb.contrib.print_proxy.print_model.PrintModelBuilder`.
 
         Args:
             value (tuple): A tuple containing the generated extract record and the params
@@ -73,19 +82,33 @@ class Renderer(JsonRenderer):
         if 'lang' in self._lowercase_GET_dict:
             self._language = self._lowercase_GET_dict.get('lang')
 
-        # Based on extract record and webservice parameter, render the extract data as JSON
+        params = value[1]
+        if not isinstance(params, Parameter):
+            raise TypeError('Missing parameter definition; Expected {0}, got {1} instead'.format(
+                Parameter,
+                params.__class__
+            ))
+        self._params = params
+        if params.language is not None:
+            self._language = str(params.language).lower()
+        else:
+            self._language = Config.get('default_language')
+
+        # Based on extract record and webservice parameter, build the printable extract
         extract_record = value[0]
-        extract_as_dict = self._render(extract_record, value[1])
         feature_geometry = mapping(extract_record.real_estate.limit)
         pdf_to_join = set()
+        extract_as_dict = PrintModelBuilder(self, params).build(extract_record, feature_geometry, pdf_to_join)
 
         if Config.get('print', {}).get('compute_toc_pages', False):
-            extract_as_dict['nbTocPages'] = TocPages(extract_as_dict).getNbPages()
+            extract_as_dict['nbTocPages'] = TocPages(
+                extract_as_dict,
+                Config.get('print', {}).get('template_name'),
+                self._language
+            ).getNbPages()
         else:
             extract_as_dict['nbTocPages'] = 1
 
-        self.convert_to_printable_extract(extract_as_dict, feature_geometry, pdf_to_join)
-
         print_config = Config.get('print', {})
 
         extract_as_dict['Display_RealEstate_SubunitOfLandRegister'] = print_config.get(
@@ -108,17 +131,62 @@ class Renderer(JsonRenderer):
         if self._request.GET.get('getspec', 'no') != 'no':
             response.headers['Content-Type'] = 'application/json; charset=UTF-8'
             return json.dumps(spec, sort_keys=True, indent=4)
-        pdf_url = urlparse.urljoin(Config.get('print', {})['base_url'] + '/', 'buildreport.pdf')
-        pdf_headers = Config.get('print', {})['headers']
-        print_result = requests.post(
-            pdf_url,
-            headers=pdf_headers,
-            data=json.dumps(spec)
-        )
+
+        print_job_queue = get_print_job_queue()
+        if print_job_queue is not None:
+            return self.submit_print_job(print_job_queue, spec, extract_as_dict, pdf_to_join, response)
+
+        pdf_headers = print_config['headers']
+        pdf_url = urlparse.urljoin(print_config['base_url'] + '/', 'buildreport.pdf')
+
+        def print_pdf(print_spec):
+            return requests.post(
+                pdf_url,
+                headers=pdf_headers,
+                data=json.dumps(print_spec)
+            )
+
+        print_result, content = self.print_extract(print_pdf, spec, extract_as_dict, pdf_to_join)
+
+        response.status_code = print_result.status_code
+        response.headers = print_result.headers
+        if 'Transfer-Encoding' in response.headers:
+            del response.headers['Transfer-Encoding']
+        if 'Connection' in response.headers:
+            del response.headers['Connection']
+
+        if isinstance(content, bytes):
+            response.content_length = len(content)
+            return content
+        # Stream the merged file to the client instead of loading it into memory
+        response.content_length = os.fstat(content.fileno()).st_size
+        return FileIter(content)
+
+    def print_extract(self, print_pdf, spec, extract_as_dict, pdf_to_join):
+        """
+        Prints the extract, inserts the separately printed table of contents, appends the legal provisions
+        of full extracts and archives the result.
+
+        Args:
+            print_pdf (callable): The function printing a spec, returning the response of the print service.
+            spec (dict): The spec of the extract.
+            extract_as_dict (dict): The printable extract (the attributes of the spec).
+            pdf_to_join (set of str): The URLs of the documents to append.
+
+        Returns:
+            tuple: The response of the print service (requests.Response) and the printed extract (bytes or
+            file).
+        """
+        print_config = Config.get('print', {})
+        toc_content = None
         try:
-            if Config.get('print', {}).get('compute_toc_pages', False):
-                with io.BytesIO() as pdf:
-                    pdf.write(print_result.content)
+            if print_config.get('toc_template_name'):
+                toc_content = self.print_toc(print_pdf, spec, print_config['toc_template_name'])
+                extract_as_dict['Display_TOC'] = False
+            print_result = print_pdf(spec)
+            if toc_content is None and print_config.get('compute_toc_pages', False) and \
+                    print_result.status_code == 200:
+                with io.BytesIO(print_result.content) as pdf:
                     pdf_reader = PdfFileReader(pdf)
                     x = []
                     for i in range(len(pdf_reader.getOutlines())):
@@ -129,58 +197,227 @@ class Renderer(JsonRenderer):
                         true_nb_of_toc = 1
 
                     if true_nb_of_toc != extract_as_dict['nbTocPages']:
-                        log.warning('nbTocPages in result pdf: {} are not equal to the one predicted : {}, request new pdf'.format(true_nb_of_toc,extract_as_dict['nbTocPages'])) # noqa
-                        extract_as_dict['nbTocPages'] = true_nb_of_toc
-                        print_result = requests.post(
-                            pdf_url,
-                            headers=pdf_headers,
-                            data=json.dumps(spec)
-                        )
+                        log.warning('nbTocPages in result pdf: {} are not equal to the one predicted : {}, calibrate the "toc_layouts"'.format(true_nb_of_toc,extract_as_dict['nbTocPages'])) # noqa
         except PdfReadError as e:
             err_msg = 'a problem occurred while generating the pdf file'
             log.error(err_msg + ': ' + str(e))
             raise HTTPInternalServerError(err_msg)
 
+        content = print_result.content
+        if toc_content is not None and print_result.status_code == 200:
+            content = self.insert_pdf(content, toc_content, print_config.get('toc_insert_after_page', 1))
+
         if not extract_as_dict['isReduced'] and print_result.status_code == 200:
-            main = tempfile.NamedTemporaryFile(suffix='.pdf')
-            main.write(print_result.content)
-            main.flush()
-            cmd = ['pdftk', main.name]
-            temp_files = [main]
+            content = self.merge_pdf(content, pdf_to_join)
+
+        # Save printed file to the specified path.
+        pdf_archive_path = print_config.get('pdf_archive_path', None)
+        if pdf_archive_path is not None:
+            self.archive_pdf_file(pdf_archive_path, content, extract_as_dict)
+
+        return print_result, content
+
+    def submit_print_job(self, print_job_queue, spec, extract_as_dict, pdf_to_join, response):
+        """
+        Prints the extract as background job using the report API of MapFish print. If the request
+        contains the parameter "async", the state of the job is returned immediately. Otherwise the job is
+        awaited and the printed extract returned like a synchronous print.
+
+        Args:
+            print_job_queue (pyramid_oereb.lib.print_jobs.PrintJobQueue): The queue of the print jobs.
+            spec (dict): The spec of the extract.
+            extract_as_dict (dict): The printable extract (the attributes of the spec).
+            pdf_to_join (set of str): The URLs of the documents to append.
+            response (pyramid.response.Response): The response.
+
+        Returns:
+            str or pyramid.response.FileIter: The state of the job as JSON or the printed extract.
+        """
+        print_config = Config.get('print', {})
+        jobs_config = print_config.get('jobs', {})
+        base_url = print_config['base_url']
+
+        def print_pdf(print_spec):
+            return self.print_report(
+                base_url,
+                print_config['headers'],
+                print_spec,
+                poll_interval=jobs_config.get('poll_interval', 0.5),
+                timeout=jobs_config.get('timeout', 300),
+                request_timeout=jobs_config.get('request_timeout', 30)
+            )
+
+        def print_job(path):
+            print_result, content = self.print_extract(print_pdf, spec, extract_as_dict, pdf_to_join)
+            if print_result.status_code != 200:
+                raise LookupError('The print service returned the status {}'.format(print_result.status_code))
+            with open(path, 'wb') as f:
+                if isinstance(content, bytes):
+                    f.write(content)
+                else:
+                    with content:
+                        shutil.copyfileobj(content, f)
+
+        try:
+            job_id = print_job_queue.submit(base_url, print_job)
+        except PrintJobQueueFull as e:
+            log.warning(str(e))
+            raise HTTPServiceUnavailable('The print service is busy, please try again later')
+
+        if self._lowercase_GET_dict.get('async', 'no') not in ['no', 'false']:
+            response.status_code = 202
+            response.headers['Content-Type'] = 'application/json; charset=UTF-8'
+            return json.dumps(PrintJob.format_state(self._request, print_job_queue.store.get(job_id)))
+
+        state = print_job_queue.wait(job_id)
+        if state is None or state['status'] != 'finished':
+            raise HTTPInternalServerError('a problem occurred while generating the pdf file')
+        content = open(print_job_queue.store.result_path(job_id), 'rb')
+        print_job_queue.store.remove(job_id)
+        response.content_type = 'application/pdf'
+        response.content_length = os.fstat(content.fileno()).st_size
+        return FileIter(content)
+
+    @staticmethod
+    def print_report(base_url, headers, spec, poll_interval=0.5, timeout=300, request_timeout=30):
+        """
+        Prints a spec using the asynchronous report API of MapFish print. The report is started, its status
+        polled until it is done and the result downloaded.
+
+        Args:
+            base_url (str): The base URL of the print application.
+            headers (dict): The headers sent with all requests to the print application.
+            spec (dict): The spec to print.
+            poll_interval (float): The time in seconds between two status requests.
+            timeout (float): The maximum time in seconds to wait for the report.
+            request_timeout (float): The maximum time in seconds to wait for the print application to
+                respond to a single request.
+
+        Returns:
+            requests.Response: The response containing the report or the failed start of the report.
+
+        Raises:
+            LookupError: Raised if the report failed or timed out.
+            requests.exceptions.RequestException: Raised if a request to the print application failed or
+                timed out.
+        """
+        report_url = urlparse.urljoin(base_url + '/', 'report.pdf')
+        start_result = requests.post(report_url, headers=headers, data=json.dumps(spec),
+                                     timeout=request_timeout)
+        if start_result.status_code != 200:
+            return start_result
+        reference = start_result.json()
+        status_url = urlparse.urljoin(report_url, reference['statusURL'])
+        deadline = time.time() + timeout
+        while True:
+            status_result = requests.get(status_url, headers=headers, timeout=request_timeout)
+            if status_result.status_code != 200:
+                raise LookupError('The status of the print report {} could not be read: {}'.format(
+                    reference['ref'], status_result.status_code))
+            status = status_result.json()
+            if status.get('done'):
+                break
+            if time.time() > deadline:
+                try:
+                    requests.delete(urlparse.urljoin(base_url + '/', 'cancel/{}'.format(reference['ref'])),
+                                    headers=headers, timeout=request_timeout)
+                except requests.exceptions.RequestException:
+                    log.warning('The print report {} could not be canceled'.format(reference['ref']))
+                raise LookupError('The print report {} timed out'.format(reference['ref']))
+            time.sleep(poll_interval)
+        if status.get('status') != 'finished':
+            raise LookupError('The print report {} failed: {}'.format(reference['ref'], status.get('error')))
+        download_url = status.get('downloadURL') or reference['downloadURL']
+        return requests.get(urlparse.urljoin(report_url, download_url), headers=headers,
+                            timeout=request_timeout)
+
+    @staticmethod
+    def print_toc(print_pdf, spec, toc_template_name):
+        """
+        Prints the table of contents as separate job with its own template. If the number of pages differs
+        from the estimated "nbTocPages", only the table of contents is printed again with the actual number,
+        so the main extract is printed once with the correct page numbering. The number of pages is updated
+        in the attributes of the passed spec.
+
+        Args:
+            print_pdf (callable): The function printing a spec, returning the response of the print service.
+            spec (dict): The spec of the main extract.
+            toc_template_name (str): The name of the template printing the table of contents.
+
+        Returns:
+            bytes: The printed table of contents.
+        """
+        attributes = spec['attributes']
+        toc_spec = dict(spec, layout=toc_template_name)
+        for i in range(2):
+            toc_result = print_pdf(toc_spec)
+            if toc_result.status_code != 200:
+                log.error('The table of contents could not be printed: {}'.format(toc_result.content))
+                raise HTTPInternalServerError('a problem occurred while generating the pdf file')
+            with io.BytesIO(toc_result.content) as pdf:
+                nb_of_toc = PdfFileReader(pdf).getNumPages()
+            if nb_of_toc == attributes['nbTocPages']:
+                break
+            log.debug('nbTocPages of the printed table of contents: {} are not equal to the one predicted: '
+                      '{}'.format(nb_of_toc, attributes['nbTocPages']))
+            attributes['nbTocPages'] = nb_of_toc
+        return toc_result.content
+
+    @staticmethod
+    def insert_pdf(main_content, content, after_page):
+        """
+        Inserts the pages of a PDF into another one.
+
+        Args:
+            main_content (bytes): The PDF to insert the pages into.
+            content (bytes): The PDF containing the pages to insert.
+            after_page (int): The number of the page after which the pages are inserted.
+
+        Returns:
+            bytes: The resulting PDF.
+        """
+        merger = PdfFileMerger()
+        merger.append(io.BytesIO(main_content))
+        merger.merge(after_page, io.BytesIO(content))
+        with io.BytesIO() as output:
+            merger.write(output)
+            return output.getvalue()
+
+    @staticmethod
+    def merge_pdf(main_content, pdf_to_join):
+        """
+        Appends the PDF documents of the legal provisions to the printed extract using pdftk. The documents
+        are downloaded concurrently and streamed to temporary files (or linked from the document cache).
+
+        Args:
+            main_content (bytes): The printed extract.
+            pdf_to_join (set of str): The URLs of the documents to append.
+
+        Returns:
+            file: The merged PDF opened for reading. The file is deleted as soon as it is closed.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            main_path = os.path.join(directory, 'main.pdf')
+            with open(main_path, 'wb') as main:
+                main.write(main_content)
+            cmd = ['pdftk', main_path]
+            files = download_document_files(pdf_to_join, directory, ignore_errors=True)
             for url in pdf_to_join:
-                result = requests.get(url)
-                content_type = result.headers.get('content-type')
-                log.debug("document url: " + url + " => content_type: " + content_type)
+                if url not in files:
+                    continue
+                path, content_type = files[url]
+                log.debug("document url: {} => content_type: {}".format(url, content_type))
                 if content_type != 'application/pdf':
                     msg = "Skipped document inclusion (url: '{}') because content_type: '{}'"
                     log.warning(msg.format(url, content_type))
                     continue
-                tmp_file = tempfile.NamedTemporaryFile(suffix='.pdf')
-                tmp_file.write(result.content)
-                tmp_file.flush()
-                temp_files.append(tmp_file)
-                cmd.append(tmp_file.name)
+                cmd.append(path)
             out = tempfile.NamedTemporaryFile(suffix='.pdf')
             cmd += ['cat', 'output', out.name]
             sys.stdout.flush()
-            time.sleep(0.1)
             subprocess.check_call(cmd)
-            content = out.file.read()
-        else:
-            content = print_result.content
-
-        # Save printed file to the specified path.
-        pdf_archive_path = print_config.get('pdf_archive_path', None)
-        if pdf_archive_path is not None:
-            self.archive_pdf_file(pdf_archive_path, content, extract_as_dict)
-
-        response.status_code = print_result.status_code
-        response.headers = print_result.headers
-        if 'Transfer-Encoding' in response.headers:
-            del response.headers['Transfer-Encoding']
-        if 'Connection' in response.headers:
-            del response.headers['Connection']
-        return content
+            out.seek(0)
+            return out
 
     @staticmethod
     def archive_pdf_file(pdf_archive_path, binary_content, extract_as_dict):
@@ -191,8 +428,12 @@ class Renderer(JsonRenderer):
         egrid = extract_as_dict.get('RealEstate_EGRID', 'no_egrid')
         path_and_filename = pdf_archive_path + time_info + '_' + egrid + '.pdf'
 
-        archive = open(path_and_filename, 'ab')
-        archive.write(binary_content)
+        with open(path_and_filename, 'ab') as archive:
+            if isinstance(binary_content, bytes):
+                archive.write(binary_content)
+            else:
+                shutil.copyfileobj(binary_content, archive)
+                binary_content.seek(0)
         log.debug('Pdf file archived at: ' + path_and_filename)
         return path_and_filename
 
@@ -222,6 +463,10 @@ class Renderer(JsonRenderer):
         """
         Converts an oereb extract into a form suitable for printing by mapfish print.
 
+        .. deprecated:: 1.9.0
+            The printable extract is built from the extract record by
+            :py:class:`pyramid_oereb.contrib.print_proxy.print_model.PrintModelBuilder`.
+
         Args:
             extract_dict: the oereb extract, will get converted by this function into a form
                             convenient for mapfish-print
@@ -229,6 +474,10 @@ class Renderer(JsonRenderer):
             pdf_to_join: a set of additional information for the pdf. Will get filled by this function.
                          Used in the full extract only
         """
+        warnings.warn(
+            'convert_to_printable_extract is deprecated, use the PrintModelBuilder instead',
+            DeprecationWarning
+        )
 
         log.debug("Starting transformation, extract_dict is {}".format(extract_dict))
         log.debug("Parameter feature_geometry is {}".format(feature_geometry))
@@ -361,11 +610,54 @@ class Renderer(JsonRenderer):
 
                 del restriction_on_landownership['LegalProvisions']
 
+            for documents in [legal_provisions, laws, hints]:
+                self.lpra_flatten(documents.values())
             restriction_on_landownership['LegalProvisions'] = legal_provisions
             restriction_on_landownership['Laws'] = laws
             restriction_on_landownership['Hints'] = hints
 
-        # One restriction entry per theme
+        extract_dict['RealEstate_RestrictionOnLandownership'] = self.merge_restrictions_by_theme(
+            extract_dict.get('RealEstate_RestrictionOnLandownership', []),
+            pdf_to_join
+        )
+
+        for item in extract_dict.get('ExclusionOfLiability', []):
+            self._multilingual_text(item, 'Title')
+            self._multilingual_text(item, 'Content')
+
+        extract_dict['features'] = {
+            'features': {
+                'type': 'FeatureCollection',
+                'features': [{
+                    'type': 'Feature',
+                    'geometry': feature_geometry,
+                    'properties': {}
+                }]
+            }
+        }
+
+        # Reformat land registry area
+        extract_dict['RealEstate_LandRegistryArea'] = u'{0} m²'.format(
+            extract_dict['RealEstate_LandRegistryArea']
+        )
+
+        log.debug("After transformation, extract_dict is {}".format(extract_dict))
+        return extract_dict
+
+    def merge_restrictions_by_theme(self, restrictions, pdf_to_join):
+        """
+        Merges the restrictions of a printable extract into one restriction per theme (or sub theme if
+        configured) with combined legends, documents and texts.
+
+        Args:
+            restrictions (list of dict): The restrictions with flattened and localized attributes and their
+                documents categorized into *LegalProvisions*, *Laws* and *Hints* by their unique key.
+            pdf_to_join (set): The URLs of the legal provisions to be joined to the printed PDF. Will get
+                filled by this method.
+
+        Returns:
+            list of dict: The merged restrictions sorted by theme.
+        """
         theme_restriction = {}
         text_element = [
             'Information', 'Lawstatus_Code', 'Lawstatus_Text', 'SymbolRef', 'TypeCode'
@@ -375,7 +667,7 @@ class Renderer(JsonRenderer):
             'SymbolRef', 'Information'
         ]
         split_sub_themes = Config.get('print', {}).get('split_sub_themes', False)
-        for restriction_on_landownership in extract_dict.get('RealEstate_RestrictionOnLandownership', []):
+        for restriction_on_landownership in restrictions:
             theme = restriction_on_landownership['Theme_Code']
 
             if split_sub_themes:
@@ -450,7 +742,6 @@ class Renderer(JsonRenderer):
                 restriction_on_landownership[element] = '\n'.join(restriction_on_landownership[element])
             for element in ['Laws', 'LegalProvisions', 'Hints']:
                 values = list(restriction_on_landownership[element].values())
-                self.lpra_flatten(values)
                 restriction_on_landownership[element] = values
                 if element == 'LegalProvisions':
                     # This adds the first URL of TextAtWeb to the pdf_to_join set. At this point of the code
@@ -479,8 +770,8 @@ class Renderer(JsonRenderer):
                 self.sort_hints
             )
 
-        restrictions = list(theme_restriction.values())
-        for restriction in restrictions:
+        merged_restrictions = list(theme_restriction.values())
+        for restriction in merged_restrictions:
             legends = {}
             for legend in restriction['Legend']:
                 type_ = legend['TypeCode']
@@ -501,39 +792,16 @@ class Renderer(JsonRenderer):
         sorted_restrictions = []
         if split_sub_themes:
             # sort sub themes if sub theme splitting is enabled
-            sorted_restrictions = self._sort_sub_themes(restrictions)
+            sorted_restrictions = self._sort_sub_themes(merged_restrictions)
         else:
             # default sorting
             for theme in Config.get_themes():
-                for restriction in restrictions:
+                for restriction in merged_restrictions:
                     if theme.code == restriction.get('Theme_Code'):
                         sorted_restrictions.append(restriction)
 
-        extract_dict['RealEstate_RestrictionOnLandownership'] = sorted_restrictions
-        # End one restriction entry per theme
-
-        for item in extract_dict.get('ExclusionOfLiability', []):
-            self._multilingual_text(item, 'Title')
-            self._multilingual_text(item, 'Content')
-
-        extract_dict['features'] = {
-            'features': {
-                'type': 'FeatureCollection',
-                'features': [{
-                    'type': 'Feature',
-                    'geometry': feature_geometry,
-                    'properties': {}
-                }]
-            }
-        }
-
-        # Reformat land registry area
-        extract_dict['RealEstate_LandRegistryArea'] = u'{0} m²'.format(
-            extract_dict['RealEstate_LandRegistryArea']
-        )
-
         # Reformat AreaShare, LengthShare, NrOfPoints and part in percent values
-        for restriction in extract_dict['RealEstate_RestrictionOnLandownership']:
+        for restriction in sorted_restrictions:
             for legend in restriction['Legend']:
                 if 'LengthShare' in legend:
                     legend['LengthShare'] = '{0} m'.format(legend['LengthShare'])
@@ -544,8 +812,7 @@ class Renderer(JsonRenderer):
                 if 'NrOfPoints' in legend:
                     legend['NrOfPoints'] = '{0}'.format(legend['NrOfPoints'])
 
-        log.debug("After transformation, extract_dict is {}".format(extract_dict))
-        return extract_dict
+        return sorted_restrictions
 
     @staticmethod
     def group_legal_provisions(legal_provisions):
@@ -0,0 +1,530 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from urllib import parse as urlparse
+
+from pyramid_oereb import Config, route_prefix
+from pyramid_oereb.lib.records.documents import ArticleRecord
+from pyramid_oereb.lib.sources.plr import PlrRecord
+from pyramid_oereb.lib.url import parse_url
+
+log = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1024)
+def parse_wms_url(reference_wms):
+    """
+    Splits the URL of a WMS into its base URL and its parameters. The result is cached, as the restrictions
+    of a theme usually share the same view service.
+
+    Args:
+        reference_wms (str): The URL of the WMS.
+
+    Returns:
+        tuple: The base URL and the parameters as tuple of names and tuples of values.
+    """
+    url, params = parse_url(reference_wms)
+    base_url = urlparse.urlunsplit((url.scheme, url.netloc, url.path, None, None))
+    return base_url, tuple((key, tuple(values)) for key, values in params.items())
+
+
+class LegendCache(object):
+    """
+    Least recently used cache of the other legend entries of the view services. The legend entries are the
+    same for all extracts of a theme, but the symbol references of all of them have to be created for
+    each extract.
+
+    Args:
+        max_entries (int): The maximum number of cached view service legends.
+    """
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+legend_cache = LegendCache()
+
+
+class PrintModelBuilder(object):
+    """
+    Builds the attributes of the MapFish print spec directly from the extract record in one pass. The
+    result is the same as rendering the extract with the JSON renderer and converting it with
+    :py:meth:`pyramid_oereb.contrib.print_proxy.mapfish_print.Renderer.convert_to_printable_extract`,
+    except that no *Base64TextAtWeb* is embedded, as the legal provisions are joined to the printed PDF.
+
+    Args:
+        renderer (pyramid_oereb.contrib.print_proxy.mapfish_print.Renderer): The renderer providing the
+            request, the language and the helpers shared with the conversion of the JSON extract.
+        params (pyramid_oereb.views.webservice.Parameter): The parameters of the request.
+    """
+
+    def __init__(self, renderer, params):
+        self._renderer = renderer
+        self._params = params
+        self._request = renderer._request
+        self._language = renderer._language
+
+    def localized(self, values):
+        """
+        Args:
+            values (str or dict): The multilingual values.
+
+        Returns:
+            str: The text in the language of the extract.
+        """
+        return self._renderer.get_localized_text(values)['Text']
+
+    def build(self, extract, feature_geometry, pdf_to_join):
+        """
+        Builds the printable extract.
+
+        Args:
+            extract (pyramid_oereb.lib.records.extract.ExtractRecord): The extract record.
+            feature_geometry (dict): The geometry of the real estate as GeoJSON.
+            pdf_to_join (set): The URLs of the legal provisions to be joined to the printed PDF. Will get
+                filled by this method.
+
+        Returns:
+            dict: The printable extract.
+        """
+        creation_date = datetime.strptime(self._renderer.date_time(extract.creation_date),
+                                          '%Y-%m-%dT%H:%M:%S')
+        extract_dict = {
+            'Footer': '   '.join([
+                creation_date.strftime('%d.%m.%Y'),
+                creation_date.strftime('%H:%M:%S'),
+                extract.extract_identifier
+            ]),
+            'CreationDate': creation_date.strftime('%d.%m.%Y'),
+            'isReduced': self._params.flavour in ['reduced', 'embeddable'],
+            'ExtractIdentifier': extract.extract_identifier,
+            'BaseData': self.localized(extract.base_data),
+            'ConcernedTheme': [self.format_theme(theme) for theme in extract.concerned_theme],
+            'NotConcernedTheme': [self.format_theme(theme) for theme in extract.not_concerned_theme],
+            'ThemeWithoutData': [self.format_theme(theme) for theme in extract.theme_without_data],
+            'LogoPLRCadastreRef': self._logo_ref('oereb', extract.logo_plr_cadastre),
+            'FederalLogoRef': self._logo_ref('confederation', extract.federal_logo),
+            'CantonalLogoRef': self._logo_ref('canton', extract.cantonal_logo),
+            'MunicipalityLogoRef': self._request.route_url(
+                '{0}/image/municipality'.format(route_prefix),
+                fosnr=extract.real_estate.fosnr,
+                extension=extract.municipality_logo.extension
+            )
+        }
+        self._flatten_office(extract_dict, 'PLRCadastreAuthority', extract.plr_cadastre_authority)
+
+        if extract.certification:
+            extract_dict['Certification'] = self.localized(extract.certification)
+        if extract.certification_at_web:
+            extract_dict['CertificationAtWeb'] = self.localized(extract.certification_at_web)
+        if extract.electronic_signature is not None:
+            extract_dict['ElectronicSignature'] = extract.electronic_signature
+        if extract.qr_code is not None:
+            extract_dict['QRCode'] = extract.qr_code
+        if extract.general_information is not None:
+            extract_dict['GeneralInformation'] = self.localized(extract.general_information)
+
+        if isinstance(extract.exclusions_of_liability, list) and len(extract.exclusions_of_liability) > 0:
+            extract_dict['ExclusionOfLiability'] = [{
+                'Title': self.localized(eol.title),
+                'Content': self.localized(eol.content)
+            } for eol in extract.exclusions_of_liability]
+
+        if isinstance(extract.glossaries, list) and len(extract.glossaries) > 0:
+            glossaries = list()
+            for gls in extract.glossaries:
+                if self.localized(gls.title) is not None:
+                    glossaries.append(gls)
+                else:
+                    log.warning("glossary entry in requested language missing for title {}".format(gls.title))
+            extract_dict['Glossary'] = [{
+                'Title': self.localized(gls.title),
+                'Content': self.localized(gls.content)
+            } for gls in self._renderer.sort_by_localized_text(glossaries, lambda element: element.title)]
+
+        self.format_real_estate(extract_dict, extract.real_estate, pdf_to_join)
+
+        extract_dict['features'] = {
+            'features': {
+                'type': 'FeatureCollection',
+                'features': [{
+                    'type': 'Feature',
+                    'geometry': feature_geometry,
+                    'properties': {}
+                }]
+            }
+        }
+        return extract_dict
+
+    def _logo_ref(self, logo, image):
+        return self._request.route_url(
+            '{0}/image/logo'.format(route_prefix),
+            logo=logo,
+            language=self._language,
+            extension=image.extension
+        )
+
+    def format_real_estate(self, extract_dict, real_estate, pdf_to_join):
+        """
+        Adds the real estate and its restrictions on landownership to the printable extract.
+
+        Args:
+            extract_dict (dict): The printable extract.
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real estate record.
+            pdf_to_join (set): The URLs of the legal provisions to be joined to the printed PDF.
+        """
+        extract_dict.update({
+            'RealEstate_Type': real_estate.type,
+            'RealEstate_Canton': real_estate.canton,
+            'RealEstate_Municipality': real_estate.municipality,
+            'RealEstate_FosNr': real_estate.fosnr,
+            'RealEstate_LandRegistryArea': u'{0} m²'.format(real_estate.land_registry_area),
+            'RealEstate_PlanForLandRegisterMainPage': self._renderer.format_map(
+                real_estate.plan_for_land_register_main_page
+            )
+        })
+        if self._params.with_geometry:
+            extract_dict['RealEstate_Limit'] = self._renderer.from_shapely(real_estate.limit)
+        for name, value in [
+            ('Number', real_estate.number),
+            ('IdentDN', real_estate.identdn),
+            ('EGRID', real_estate.egrid),
+            ('SubunitOfLandRegister', real_estate.subunit_of_land_register),
+            ('MetadataOfGeographicalBaseData', real_estate.metadata_of_geographical_base_data)
+        ]:
+            if value is not None:
+                extract_dict['RealEstate_{0}'.format(name)] = value
+
+        wms_url_params = self._renderer.get_wms_url_params()
+        main_page_map = real_estate.plan_for_land_register_main_page
+        extract_dict['baseLayers'] = {'layers': [
+            self.format_base_map(main_page_map.reference_wms, main_page_map.layer_opacity, wms_url_params)
+        ]}
+        plan_for_land_register = real_estate.plan_for_land_register
+        basemap = self.format_base_map(
+            plan_for_land_register.reference_wms,
+            plan_for_land_register.layer_opacity,
+            wms_url_params
+        )
+
+        if isinstance(real_estate.public_law_restrictions, list) \
+                and len(real_estate.public_law_restrictions) > 0:
+            restrictions = [self.format_plr(plr, basemap) for plr in real_estate.public_law_restrictions
+                            if isinstance(plr, PlrRecord)]
+            extract_dict['RealEstate_RestrictionOnLandownership'] = \
+                self._renderer.merge_restrictions_by_theme(restrictions, pdf_to_join)
+        else:
+            extract_dict['RealEstate_RestrictionOnLandownership'] = []
+
+        if isinstance(real_estate.references, list) and len(real_estate.references) > 0:
+            extract_dict['RealEstate_Reference'] = [
+                self.format_document(reference) for reference in real_estate.references
+            ]
+
+        if self._params.flavour == 'full' and Config.get('full_extract_use_sld', True):
+            highlight = self._renderer.format_map(real_estate.highlight)
+            highlight.pop('Image', None)
+            extract_dict['RealEstate_Highlight'] = highlight
+
+    @staticmethod
+    def format_base_map(reference_wms, opacity, wms_url_params):
+        """
+        Formats the base map of the extract as layer of the print spec.
+
+        Args:
+            reference_wms (str): The URL of the WMS.
+            opacity (float): The opacity of the layer.
+            wms_url_params (dict): The configured additional WMS parameters.
+
+        Returns:
+            dict: The layer.
+        """
+        base_url, params = parse_wms_url(reference_wms)
+        return {
+            'type': 'wms',
+            'styles': 'default',
+            'opacity': opacity,
+            'baseURL': base_url,
+            'layers': dict(params)['LAYERS'][0].split(','),
+            'imageFormat': 'image/png',
+            'customParams': wms_url_params,
+        }
+
+    def format_layer(self, view_service):
+        """
+        Formats the view service of a restriction as layer of the print spec.
+
+        Args:
+            view_service (pyramid_oereb.lib.records.view_service.ViewServiceRecord): The view service.
+
+        Returns:
+            dict: The layer.
+        """
+        base_url, params = parse_wms_url(view_service.reference_wms)
+        params = dict((key, list(values)) for key, values in params)
+        return {
+            'type': params.pop('SERVICE', ['wms'])[0].lower(),
+            'opacity': view_service.layer_opacity,
+            'styles': params.pop('STYLES', ['default'])[0],
+            'baseURL': base_url,
+            'layers': params.pop('LAYERS', '')[0].split(','),
+            'imageFormat': params.pop('FORMAT', ['image/png'])[0],
+            'customParams': self._renderer.get_custom_wms_params(params),
+        }
+
+    def format_other_legend(self, view_service):
+        """
+        Formats the legend entries of a view service. The entries are cached by their content, so the
+        symbol references of a theme are created once for all extracts.
+
+        Args:
+            view_service (pyramid_oereb.lib.records.view_service.ViewServiceRecord): The view service.
+
+        Returns:
+            list of dict: The legend entries sorted by their text.
+        """
+        if not isinstance(view_service.legends, list) or len(view_service.legends) == 0:
+            return []
+        key = (self._request.application_url, self._language, Config.get('default_language')) + tuple(
+            (
+                legend_entry.theme.code,
+                legend_entry.view_service_id,
+                legend_entry.type_code,
+                legend_entry.type_code_list,
+                self._hashable(legend_entry.legend_text),
+                legend_entry.symbol.content
+            ) for legend_entry in view_service.legends
+        )
+        other_legend = legend_cache.get(key)
+        if other_legend is None:
+            other_legend = [{
+                'LegendText': self.localized(legend_entry.legend_text),
+                'SymbolRef': self._renderer.get_symbol_ref(self._request, legend_entry),
+                'TypeCode': legend_entry.type_code
+            } for legend_entry in self._renderer.sort_by_localized_text(
+                view_service.legends,
+                lambda element: element.legend_text
+            )]
+            legend_cache.set(key, other_legend)
+        return [dict(legend_entry) for legend_entry in other_legend]
+
+    @staticmethod
+    def _hashable(values):
+        if isinstance(values, dict):
+            return tuple(sorted(values.items()))
+        return values
+
+    def format_plr(self, plr, basemap):
+        """
+        Formats a public law restriction for the grouping by theme.
+
+        Args:
+            plr (pyramid_oereb.lib.records.plr.PlrRecord): The public law restriction.
+            basemap (dict): The layer of the plan for the land register.
+
+        Returns:
+            dict: The formatted restriction.
+        """
+        # PLR without legal provision is allowed in reduced extract only!
+        if self._params.flavour != 'reduced' and isinstance(plr.documents, list) and \
+                len(plr.documents) == 0:
+            raise ValueError('Restrictions on landownership without legal provision are only allowed '
+                             'in reduced extracts!')
+
+        view_service = plr.view_service
+        legend = ''
+        if view_service.legend_at_web is not None:
+            if self._language in view_service.legend_at_web:
+                legend = view_service.legend_at_web[self._language]
+            else:
+                log.warning("map_.legend_at_web has no element {}".format(self._language))
+
+        plr_dict = {
+            'Information': self.localized(plr.information),
+            'Theme_Code': plr.theme.code,
+            'Theme_Text': self.localized(plr.theme.text),
+            'Lawstatus_Code': plr.law_status.code,
+            'Lawstatus_Text': self.localized(plr.law_status.text),
+            'ResponsibleOffice': [self.format_office(plr.responsible_office)],
+            'baseLayers': {'layers': [self.format_layer(view_service), basemap]},
+            'legend': legend,
+            'OtherLegend': self.format_other_legend(view_service)
+        }
+
+        # Link to symbol is only available if type code is set!
+        if plr.type_code:
+            plr_dict['SymbolRef'] = self._renderer.get_symbol_ref(self._request, plr)
+        for name, value in [
+            ('AreaShare', plr.area_share),
+            ('LengthShare', plr.length_share),
+            ('NrOfPoints', plr.nr_of_points),
+            ('OtherTheme', plr.other_theme),
+            ('TypeCode', plr.type_code),
+            ('TypeCodelist', plr.type_code_list),
+            ('PartInPercent', plr.part_in_percent)
+        ]:
+            if value is not None:
+                plr_dict[name] = value
+        if plr.sub_theme is not None:
+            plr_dict['SubTheme'] = self.localized(plr.sub_theme)
+
+        if self._params.with_geometry and isinstance(plr.geometries, list) and len(plr.geometries) > 0:
+            plr_dict['Geometry'] = [self.format_geometry(geometry) for geometry in plr.geometries]
+
+        legal_provisions = {}
+        laws = {}
+        hints = {}
+        for document in plr.documents or []:
+            for nested in (getattr(document, 'references', None) or []) + \
+                    (getattr(document, 'articles', None) or []):
+                self._categorize_document(self.format_printable_document(nested, True),
+                                          legal_provisions, laws, hints)
+            self._categorize_document(self.format_printable_document(document, False),
+                                      legal_provisions, laws, hints)
+        plr_dict['LegalProvisions'] = legal_provisions
+        plr_dict['Laws'] = laws
+        plr_dict['Hints'] = hints
+        return plr_dict
+
+    @staticmethod
+    def _categorize_document(document, legal_provisions, laws, hints):
+        document_type = document.get('DocumentType')
+        if document_type is None:
+            error_msg = "mandatory attribute document_type is missing in document " \
+                        ": {}".format(document)
+            log.error(error_msg)
+            raise AttributeError(error_msg)
+        uid = '_'.join([document['TextAtWeb'][0]['URL'], document['Title']])
+        if document_type == 'LegalProvision':
+            legal_provisions[uid] = document
+        elif document_type == 'Law':
+            laws[uid] = document
+        else:
+            hints[uid] = document
+
+    def format_printable_document(self, document, with_nested_documents):
+        """
+        Formats a document with flattened and localized attributes as listed in the restrictions of the
+        printable extract.
+
+        Args:
+            document (pyramid_oereb.lib.records.documents.DocumentBaseRecord): The document.
+            with_nested_documents (bool): True to add the articles and references of the document.
+
+        Returns:
+            dict: The formatted document.
+        """
+        if isinstance(document, ArticleRecord):
+            return {}
+        document_dict = {
+            'DocumentType': document.document_type,
+            'Lawstatus_Code': document.law_status.code,
+            'Lawstatus_Text': self.localized(document.law_status.text),
+            'TextAtWeb': [{'URL': self.localized(document.text_at_web)}],
+            'Title': self.localized(document.title)
+        }
+        self._flatten_office(document_dict, 'ResponsibleOffice', document.responsible_office)
+        if document.official_title is not None:
+            document_dict['OfficialTitle'] = self.localized(document.official_title)
+        if document.abbreviation is not None:
+            document_dict['Abbreviation'] = self.localized(document.abbreviation)
+        for name, value in [
+            ('OfficialNumber', document.official_number),
+            ('Canton', document.canton),
+            ('Municipality', document.municipality)
+        ]:
+            if value is not None:
+                document_dict[name] = value
+        if isinstance(document.article_numbers, list) and len(document.article_numbers) > 0:
+            document_dict['ArticleNumber'] = document.article_numbers
+        if with_nested_documents:
+            self._add_nested_documents(document_dict, document)
+        return document_dict
+
+    def format_document(self, document):
+        """
+        Formats a document as done by the JSON renderer, but without *Base64TextAtWeb*.
+
+        Args:
+            document (pyramid_oereb.lib.records.documents.DocumentBaseRecord): The document.
+
+        Returns:
+            dict: The formatted document.
+        """
+        return self._renderer.format_document(document, base64_text_at_web=False)
+
+    def _add_nested_documents(self, document_dict, document):
+        if isinstance(document.articles, list) and len(document.articles) > 0:
+            document_dict['Article'] = [self.format_document(article) for article in document.articles]
+        if isinstance(document.references, list) and len(document.references) > 0:
+            document_dict['Reference'] = [
+                self.format_document(reference) for reference in document.references
+            ]
+
+    def format_geometry(self, geometry):
+        """
+        Formats a geometry of a restriction with its flattened responsible office.
+
+        Args:
+            geometry (pyramid_oereb.lib.records.geometry.GeometryRecord): The geometry.
+
+        Returns:
+            dict: The formatted geometry.
+        """
+        geometry_dict = self._renderer.format_geometry(geometry)
+        office = geometry_dict.pop('ResponsibleOffice')
+        office['Name'] = self.localized(geometry.office.name)
+        for key, value in office.items():
+            geometry_dict['ResponsibleOffice_{0}'.format(key)] = value
+        return geometry_dict
+
+    def format_theme(self, theme):
+        """
+        Args:
+            theme (pyramid_oereb.lib.records.theme.ThemeRecord): The theme.
+
+        Returns:
+            dict: The theme with its localized text.
+        """
+        return {
+            'Code': theme.code,
+            'Text': self.localized(theme.text)
+        }
+
+    def format_office(self, office):
+        """
+        Args:
+            office (pyramid_oereb.lib.records.office.OfficeRecord): The office.
+
+        Returns:
+            dict: The office with its localized name.
+        """
+        office_dict = self._renderer.format_office(office)
+        office_dict['Name'] = self.localized(office.name)
+        return office_dict
+
+    def _flatten_office(self, parent, name, office):
+        for key, value in self.format_office(office).items():
+            parent['{0}_{1}'.format(name, key)] = value
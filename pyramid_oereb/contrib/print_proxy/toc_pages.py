@@ -1,115 +1,239 @@
 # -*- coding: utf-8 -*-
 import logging
-import textwrap
+import unicodedata
+from functools import lru_cache
+
+from pyramid_oereb.lib.config import Config
 
 log = logging.getLogger(__name__)
 
+# Character widths of Helvetica in 1/1000 em (Adobe font metrics) used to measure the wrapped texts
+CHARACTER_WIDTHS = dict(zip(
+    ' !"#$%&\'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~',
+    [
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+        1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+        333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584
+    ]
+))
+DEFAULT_CHARACTER_WIDTH = 556
+
+# Layout of the table of contents, taken from the templates toc.jrxml and exclusion_of_liability.jrxml.
+# All sizes are in points. The texts are described by the width available for a line, the font size used
+# to measure the characters and the height of each line. It can be calibrated per print template and
+# language with the "toc_layouts" of the print configuration.
+DEFAULT_LAYOUT = {
+    'page_height': 842,
+    'header_footer_height': 70,
+    'd1_height': 77,
+    'd2_height': 29,
+    'd3_height': 61,
+    'd4_height': 44,
+    'd5_height': 15,
+    'd6_height': 90,
+    'd6_stuff_y_location': 39,
+    'toc_item': {'width': 430, 'font_size': 10, 'line_height': 20},
+    'not_concerned_themes_title_height': 15 + 26,
+    'not_concerned_themes_item': {'width': 430, 'font_size': 8, 'line_height': 12},
+    'theme_without_data_item': {'width': 430, 'font_size': 8, 'line_height': 12},
+    'general_information': {
+        'min_height': 10 + 10 + 5 + 10 + 10,
+        'offset': 39,
+        'paragraph_space': 11,
+        'base_data_space': 5,
+        'text': {'width': 390, 'font_size': 10, 'line_height': 10}
+    },
+    'exclusion_of_liability': {
+        'min_height': 23,
+        'space_above': 4,
+        'space_title_content': 2,
+        'title': {'width': 455, 'font_size': 14, 'line_height': 14},
+        'content': {'width': 390, 'font_size': 10, 'line_height': 10}
+    }
+}
+
+
+def _merge(layout, overrides):
+    merged = dict(layout)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+@lru_cache(maxsize=None)
+def get_layout(template_name, language):
+    """
+    Returns the layout of the table of contents for a print template and language. It is the
+    :py:data:`DEFAULT_LAYOUT` updated with the configured "toc_layouts" of the template and their
+    "languages" overrides. The result is cached per template and language.
+
+    Args:
+        template_name (str or None): The name of the print template.
+        language (str or None): The language of the extract.
+
+    Returns:
+        dict: The layout.
+    """
+    overrides = dict((Config.get('print') or {}).get('toc_layouts') or {}).get(template_name) or {}
+    overrides = dict(overrides)
+    languages = overrides.pop('languages', None) or {}
+    return _merge(_merge(DEFAULT_LAYOUT, overrides), languages.get(language))
+
+
+def text_width(text, font_size):
+    """
+    Measures the width of a text using the :py:data:`CHARACTER_WIDTHS`. Accented characters are measured as
+    their base character.
+
+    Args:
+        text (str): The text to measure.
+        font_size (float): The font size in points.
+
+    Returns:
+        float: The width of the text in points.
+    """
+    width = 0
+    for character in text:
+        character_width = CHARACTER_WIDTHS.get(character)
+        if character_width is None:
+            base = unicodedata.normalize('NFD', character)[:1]
+            character_width = CHARACTER_WIDTHS.get(base, DEFAULT_CHARACTER_WIDTH)
+        width += character_width
+    return width * font_size / 1000.0
+
+
+@lru_cache(maxsize=4096)
+def count_lines(text, width, font_size):
+    """
+    Counts the lines of a text wrapped word by word at the specified width. Explicit line breaks are kept
+    and words longer than a line are split.
+
+    Args:
+        text (str): The text to wrap.
+        width (float): The available width of a line in points.
+        font_size (float): The font size in points.
+
+    Returns:
+        int: The number of lines.
+    """
+    space_width = text_width(' ', font_size)
+    lines = 0
+    for paragraph in text.splitlines() or ['']:
+        lines += 1
+        line_width = 0
+        for word in paragraph.split():
+            word_width = text_width(word, font_size)
+            if line_width and line_width + space_width + word_width > width:
+                lines += 1
+                line_width = 0
+            elif line_width:
+                line_width += space_width
+            while word_width > width:
+                lines += 1
+                word_width -= width
+            line_width += word_width
+    return lines
+
+
+def _text(value):
+    # Returns the text of a localized or multilingual value of the JSON extract
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get('Text')
+    return value or ''
+
+
+def _paragraphs(value):
+    # Returns the paragraphs of a multilingual value of the JSON extract or of a localized text of the
+    # printable extract
+    if isinstance(value, list):
+        return value
+    return [{'Text': value}]
+
 
 class TocPages():
+    """
+    Estimates the number of pages of the table of contents of a printed extract without rendering it.
 
-    def __init__(self, extract):
-        # variables taken from template toc.jrxml
-        self.disposable_height = 842 - 70  # A4 size - (footer + header)
-        self.d1_height = 77
-        self.d2_height = 29
-        self.d3_height = 61
-        self.d4_height = 44
-        self.d5_height = 15
-        self.d6_height = 90
-        self.d6_right_height = 23
-        self.d6_right_width = 233
-        self.d6_stuff_y_location = 39
-        self.d6_left_height = 0  # FIXME: compute this
-        self.title_size = 62
-        self.toc_title_height = 15 + 62 + 12  # height + location + item starting position
-        self.toc_item_height = 20
-        self.not_concerned_themes_title_height = 15 + 26  # height + location
-        self.not_concerned_themes_item_height = 12
-        self.theme_without_data_title_height = 12
-        self.theme_without_data_item_height = 12
+    Args:
+        extract (dict): The extract as rendered by the JSON renderer or the printable extract.
+        template_name (str or None): The name of the print template. Defaults to the configured one.
+        language (str or None): The language of the extract.
+    """
+
+    def __init__(self, extract, template_name=None, language=None):
+        if template_name is None:
+            template_name = (Config.get('print') or {}).get('template_name')
+        self.layout = get_layout(template_name, language)
+        self.disposable_height = self.layout['page_height'] - self.layout['header_footer_height']
         self.extract = extract
         self.total_length = self.compute_total_lenght()
 
+    def compute_text_height(self, text, text_layout):
+        return count_lines(_text(text), text_layout['width'], text_layout['font_size']) * \
+            text_layout['line_height']
+
+    def compute_items_height(self, items, item_layout):
+        return sum(self.compute_text_height(item.get('Text'), item_layout) for item in items)
+
     def compute_d1(self):
-        return self.d1_height
+        return self.layout['d1_height']
 
     def compute_d2(self):
-        x = len(self.extract['ConcernedTheme'] * self.toc_item_height)
-        if x > self.d2_height:
-            return x
-        else:
-            return self.d2_height
+        x = self.compute_items_height(self.extract['ConcernedTheme'], self.layout['toc_item'])
+        return max(x, self.layout['d2_height'])
 
     def compute_d3(self):
-        x = self.not_concerned_themes_title_height + len(self.extract['NotConcernedTheme'] * self.not_concerned_themes_item_height)  # noqa
-        if x > self.d3_height:
-            return x
-        else:
-            return self.d3_height
+        x = self.layout['not_concerned_themes_title_height'] + self.compute_items_height(
+            self.extract['NotConcernedTheme'],
+            self.layout['not_concerned_themes_item']
+        )
+        return max(x, self.layout['d3_height'])
 
     def compute_d4(self):
-        return self.d4_height
+        return self.layout['d4_height']
 
     def compute_d5(self):
-        x = len(self.extract['ThemeWithoutData'] * self.theme_without_data_item_height)
-        if x > self.d5_height:
-            return x
-        else:
-            return self.d5_height
+        x = self.compute_items_height(
+            self.extract['ThemeWithoutData'],
+            self.layout['theme_without_data_item']
+        )
+        return max(x, self.layout['d5_height'])
 
     def compute_d6_left(self):
-        content_min_size = 10 + 10 + 5 + 10 + 10  # spacing between paragraphs
-        total_size = 39
-        paragraph_space = 11
-        for i in self.extract['GeneralInformation']:
-            total_size += paragraph_space
-            total_size += self.compute_length_of_wrapped_text(i['Text'],
-                                                              78,
-                                                              10)
-        total_size += 5
-        for i in self.extract['BaseData']:
-            total_size += paragraph_space
-            total_size += self.compute_length_of_wrapped_text(i['Text'],
-                                                              78,
-                                                              10)
+        layout = self.layout['general_information']
+        total_size = layout['offset']
+        for i in _paragraphs(self.extract['GeneralInformation']):
+            total_size += layout['paragraph_space']
+            total_size += self.compute_text_height(i['Text'], layout['text'])
+        total_size += layout['base_data_space']
+        for i in _paragraphs(self.extract['BaseData']):
+            total_size += layout['paragraph_space']
+            total_size += self.compute_text_height(i['Text'], layout['text'])
         log.debug('d6 left total_size : {}'.format(total_size))
-        if total_size > content_min_size:
-            return total_size
-        else:
-            return content_min_size
-
-    @staticmethod
-    def compute_length_of_wrapped_text(text, nb_char, font_size):
-        t = textwrap.wrap(text, nb_char)
-        return len(t) * font_size
+        return max(total_size, layout['min_height'])
 
     def compute_d6_right(self):
-        # variables taken from template exclusion_of_liability.jrxml
-        space_above = 4
-        space_title_content = 2
-        content_min_size = 23
+        layout = self.layout['exclusion_of_liability']
         total_size = 0
         for i in self.extract['ExclusionOfLiability']:
-            total_size += space_above
-            total_size += self.compute_length_of_wrapped_text(i['Title'][0]['Text'],
-                                                              65,
-                                                              14)
-            total_size += space_title_content
-            total_size += self.compute_length_of_wrapped_text(i['Content'][0]['Text'],
-                                                              78,
-                                                              10)
-        log.debug('d6 ritght total_size : {}'.format(total_size))
-        if total_size > content_min_size:
-            return total_size
-        else:
-            return content_min_size
+            total_size += layout['space_above']
+            total_size += self.compute_text_height(i['Title'], layout['title'])
+            total_size += layout['space_title_content']
+            total_size += self.compute_text_height(i['Content'], layout['content'])
+        log.debug('d6 right total_size : {}'.format(total_size))
+        return max(total_size, layout['min_height'])
 
     def compute_d6(self):
-        x = max(self.compute_d6_left(), self.compute_d6_right()) + self.d6_stuff_y_location
-        if x > self.d6_height:
-            return x
-        else:
-            return self.d6_height
+        x = max(self.compute_d6_left(), self.compute_d6_right()) + self.layout['d6_stuff_y_location']
+        return max(x, self.layout['d6_height'])
 
     def compute_total_lenght(self):
         x = self.compute_d1() + \
@@ -122,4 +246,4 @@ class TocPages():
         return x
 
     def getNbPages(self):
-        return -(-self.total_length // self.disposable_height)  # ceil number of pages needed
+        return int(-(-self.total_length // self.disposable_height))  # ceil number of pages needed
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import copy
 import logging
 
 from pyramid_oereb import Config
@@ -37,6 +38,21 @@ class DatabaseOEREBlexSource(DatabaseSource):
         self._oereblex_source = OEREBlexSource(**Config.get_oereblex_config())
         self._queried_lexlinks = {}
 
+    def create_read_context(self):
+        """
+        Creates a request scoped copy of this source with its own OEREBlex document source and an empty
+        cache of already queried lexlinks.
+
+        Returns:
+            pyramid_oereb.contrib.sources.plr_oereblex.DatabaseOEREBlexSource: The request scoped copy of
+            this source.
+        """
+        context = super(DatabaseOEREBlexSource, self).create_read_context()
+        context._oereblex_source = copy.copy(self._oereblex_source)
+        context._oereblex_source.records = list()
+        context._queried_lexlinks = {}
+        return context
+
     @staticmethod
     def get_config_value_for_plr_code(url_param_config, plr_code):
         """
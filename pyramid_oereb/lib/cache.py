@@ -0,0 +1,821 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+from pyramid.config import ConfigurationError
+from pyramid.path import DottedNameResolver
+
+from pyramid_oereb.lib.config import Config
+
+log = logging.getLogger(__name__)
+
+
+def _write_file(directory, path, data):
+    # Write to a temporary file first, so other processes never read a partially written file
+    handle, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(handle, 'wb') as f:
+        f.write(data)
+    os.replace(temporary_path, path)
+
+
+def _evict_files(directory, extension, max_entries):
+    # Removes the oldest files with the extension exceeding the maximum number of entries
+    entries = list()
+    for name in os.listdir(directory):
+        if name.endswith(extension):
+            path = os.path.join(directory, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+    evicted = list()
+    if len(entries) > max_entries:
+        entries.sort()
+        for mtime, path in entries[:len(entries) - max_entries]:
+            try:
+                os.remove(path)
+                evicted.append(path)
+            except OSError:
+                pass
+    return evicted
+
+
+class BaseCache(object):
+    """
+    Base class of all caches counting their hits, misses, stores and evictions.
+
+    Args:
+        ttl (int or None): The time in seconds an entry is kept in the cache. None keeps it until it is
+            evicted.
+    """
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0
+        }
+
+    @property
+    def stats(self):
+        """
+        dict: The number of hits, misses, stores and evictions of this cache since the start of the process.
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _count(self, name, value=1):
+        with self._stats_lock:
+            self._stats[name] += value
+
+    def _expired(self, created, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        return ttl is not None and time.time() - created > ttl
+
+
+class ExtractCache(BaseCache):
+    """
+    Base class of the caches for processed extracts. The extracts are stored pickled, so every delivered
+    extract is an independent copy which can be modified by the renderers. Subclasses only have to
+    implement the storage of the pickled extracts in :meth:`_load` and :meth:`_store`.
+
+    Args:
+        ttl (int or None): The time in seconds an extract is kept in the cache. None keeps it until it is
+            evicted.
+    """
+
+    @staticmethod
+    def create_key(params, sld_url, plr_sources):
+        """
+        Creates the cache key of an extract. It contains all request parameters, the URL of the SLD used for
+        the highlight of the real estate and the data versions of all topics (see
+        :attr:`pyramid_oereb.lib.sources.plr.PlrBaseSource.data_version`). A new import of a topic
+        therefore leads to new keys for all extracts.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the extract request.
+            sld_url (str): The URL which provides the sld to style and filter the highlight of the real
+                estate.
+            plr_sources (list of pyramid_oereb.lib.sources.plr.PlrBaseSource): The plr sources used to
+                create the extract.
+
+        Returns:
+            str: The cache key.
+        """
+        key = (
+            params.flavour,
+            params.format,
+            params.with_geometry,
+            params.images,
+            params.egrid,
+            params.identdn,
+            params.number,
+            params.language,
+            tuple(sorted(params.topics)) if params.topics else None,
+            params.generalize,
+            sld_url,
+            tuple((plr_source.info.get('code'), plr_source.data_version) for plr_source in plr_sources)
+        )
+        return hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached extract for the specified key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            pyramid_oereb.lib.records.extract.ExtractRecord or None: A copy of the cached extract or None if
+            there is no valid extract cached for this key.
+        """
+        try:
+            data = self._load(key)
+        except Exception:
+            log.exception('Loading the extract {} from the cache failed'.format(key))
+            data = None
+        if data is not None:
+            try:
+                extract = pickle.loads(data)
+            except Exception:
+                # E.g. a truncated entry or one pickled by another version of the application
+                log.exception('Unpickling the cached extract {} failed, removing it'.format(key))
+                self._discard(key)
+            else:
+                self._count('hits')
+                return extract
+        self._count('misses')
+        return None
+
+    def _discard(self, key):
+        try:
+            self._delete(key)
+        except Exception:
+            log.exception('Removing the extract {} from the cache failed'.format(key))
+
+    def set(self, key, extract):
+        """
+        Stores the extract in the cache.
+
+        Args:
+            key (str): The cache key.
+            extract (pyramid_oereb.lib.records.extract.ExtractRecord): The processed extract.
+        """
+        try:
+            self._store(key, pickle.dumps(extract, pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            log.exception('Storing the extract {} in the cache failed'.format(key))
+            return
+        self._count('stores')
+
+    def _load(self, key):
+        """
+        Loads the pickled extract.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            bytes or None: The pickled extract or None if there is no valid entry for this key.
+        """
+        pass  # pragma: no cover
+
+    def _store(self, key, data):
+        """
+        Stores the pickled extract.
+
+        Args:
+            key (str): The cache key.
+            data (bytes): The pickled extract.
+        """
+        pass  # pragma: no cover
+
+    def _delete(self, key):
+        """
+        Removes the pickled extract.
+
+        Args:
+            key (str): The cache key.
+        """
+        pass  # pragma: no cover
+
+
+class MemoryExtractCache(ExtractCache):
+    """
+    Least recently used cache of the extracts in the memory of the process.
+
+    Args:
+        max_entries (int): The maximum number of cached extracts.
+        ttl (int or None): The time in seconds an extract is kept in the cache.
+    """
+    def __init__(self, max_entries=100, ttl=300):
+        super(MemoryExtractCache, self).__init__(ttl)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0]):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key, data):
+        evictions = 0
+        with self._lock:
+            self._entries[key] = (time.time(), data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evictions += 1
+        if evictions:
+            self._count('evictions', evictions)
+
+    def _delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DiskExtractCache(ExtractCache):
+    """
+    Cache of the extracts in a directory, which can be shared by all processes of a server. The oldest
+    extracts are evicted if the maximum number of entries is exceeded.
+
+    Args:
+        directory (str): The directory containing the cached extracts. It is created if it does not
+            exist.
+        max_entries (int): The maximum number of cached extracts.
+        ttl (int or None): The time in seconds an extract is kept in the cache.
+    """
+    def __init__(self, directory, max_entries=1000, ttl=300):
+        super(DiskExtractCache, self).__init__(ttl)
+        self.directory = directory
+        self.max_entries = max_entries
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, key):
+        return os.path.join(self.directory, '{0}.extract'.format(key))
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            if self._expired(os.path.getmtime(path)):
+                os.remove(path)
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, key, data):
+        _write_file(self.directory, self._path(key), data)
+        self._count('evictions', len(_evict_files(self.directory, '.extract', self.max_entries)))
+
+    def _delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+class RedisExtractCache(ExtractCache):
+    """
+    Cache of the extracts in a Redis compatible server, which can be shared by several servers. The
+    eviction of the entries is left to the server (e.g. by its `maxmemory-policy`). This cache needs the
+    `redis` package to be installed.
+
+    Args:
+        url (str): The URL of the Redis server, e.g. `redis://localhost:6379/0`.
+        ttl (int or None): The time in seconds an extract is kept in the cache.
+        prefix (str): The prefix of the keys used for the extracts.
+    """
+    def __init__(self, url, ttl=300, prefix='pyramid_oereb:extract:'):
+        super(RedisExtractCache, self).__init__(ttl)
+        try:
+            import redis
+        except ImportError:
+            raise ConfigurationError('The package "redis" is needed to use the RedisExtractCache.')
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def _load(self, key):
+        return self._client.get(self.prefix + key)
+
+    def _store(self, key, data):
+        if self.ttl is None:
+            self._client.set(self.prefix + key, data)
+        else:
+            self._client.setex(self.prefix + key, int(self.ttl), data)
+
+    def _delete(self, key):
+        self._client.delete(self.prefix + key)
+
+
+class ImageCache(BaseCache):
+    """
+    Base class of the caches for downloaded WMS images. The images are stored content addressed: each
+    distinct image (e.g. the empty image of a layer without features) is stored only once, while its
+    normalized URLs only reference it. Subclasses have to implement :meth:`_load` and :meth:`_store`.
+
+    Args:
+        max_size (int): The maximum size of all cached images in bytes. The least recently used images are
+            evicted if it is exceeded.
+        ttl (int or None): The time in seconds an image is kept in the cache.
+        host_ttl (dict or None): Time to live in seconds per WMS host, overriding the ttl for this host.
+        invalidate_on_data_change (bool): Switch whether the data version of the topic is part of the key,
+            so a new import of a topic invalidates its cached images.
+    """
+    def __init__(self, max_size=64 * 1024 * 1024, ttl=3600, host_ttl=None, invalidate_on_data_change=True):
+        super(ImageCache, self).__init__(ttl)
+        self.max_size = max_size
+        self.host_ttl = host_ttl or {}
+        self.invalidate_on_data_change = invalidate_on_data_change
+
+    @staticmethod
+    def normalize_url(url):
+        """
+        Normalizes the URL of a WMS request: the scheme and host are lower cased, the parameter names upper
+        cased (they are case insensitive in WMS) and the parameters sorted.
+
+        Args:
+            url (str): The URL to normalize.
+
+        Returns:
+            str: The normalized URL.
+        """
+        parsed = urlparse(url)
+        query = parse_qsl(parsed.query, keep_blank_values=True)
+        query = sorted((name.upper(), value) for name, value in query)
+        return urlunparse((
+            parsed.scheme.lower(),
+            parsed.netloc.lower(),
+            parsed.path,
+            parsed.params,
+            urlencode(query),
+            ''
+        ))
+
+    def create_key(self, url, data_version=None):
+        """
+        Creates the cache key of an image.
+
+        Args:
+            url (str): The URL of the image.
+            data_version (object): The data version of the topic the image belongs to.
+
+        Returns:
+            str: The cache key.
+        """
+        key = self.normalize_url(url)
+        if self.invalidate_on_data_change and data_version is not None:
+            key = '{0}|{1!r}'.format(key, data_version)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get_ttl(self, url):
+        """
+        Args:
+            url (str): The URL of the image.
+
+        Returns:
+            int or None: The time to live of images from the host of this URL.
+        """
+        return self.host_ttl.get(urlparse(url).hostname, self.ttl)
+
+    def get(self, url, data_version=None):
+        """
+        Returns the cached image of the specified URL.
+
+        Args:
+            url (str): The URL of the image.
+            data_version (object): The data version of the topic the image belongs to.
+
+        Returns:
+            bytes or None: The content of the image or None if it is not cached.
+        """
+        try:
+            content = self._load(self.create_key(url, data_version), self.get_ttl(url))
+        except Exception:
+            log.exception('Loading the image {} from the cache failed'.format(url))
+            content = None
+        self._count('misses' if content is None else 'hits')
+        return content
+
+    def set(self, url, content, data_version=None):
+        """
+        Stores the image of the specified URL.
+
+        Args:
+            url (str): The URL of the image.
+            content (bytes): The content of the image.
+            data_version (object): The data version of the topic the image belongs to.
+        """
+        try:
+            self._store(self.create_key(url, data_version), hashlib.sha256(content).hexdigest(), content)
+        except Exception:
+            log.exception('Storing the image {} in the cache failed'.format(url))
+            return
+        self._count('stores')
+
+    def _load(self, key, ttl):
+        """
+        Loads the content of an image.
+
+        Args:
+            key (str): The cache key.
+            ttl (int or None): The time to live of the image.
+
+        Returns:
+            bytes or None: The content of the image or None if there is no valid entry for this key.
+        """
+        pass  # pragma: no cover
+
+    def _store(self, key, content_key, content):
+        """
+        Stores the content of an image.
+
+        Args:
+            key (str): The cache key.
+            content_key (str): The hash of the content.
+            content (bytes): The content of the image.
+        """
+        pass  # pragma: no cover
+
+
+class MemoryImageCache(ImageCache):
+    """
+    Least recently used cache of the WMS images in the memory of the process.
+    """
+    def __init__(self, **kwargs):
+        super(MemoryImageCache, self).__init__(**kwargs)
+        self._entries = OrderedDict()
+        self._contents = dict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _load(self, key, ttl):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0], ttl):
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return self._contents[entry[1]][0]
+
+    def _store(self, key, content_key, content):
+        evictions = 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time(), content_key)
+            if content_key in self._contents:
+                self._contents[content_key][1] += 1
+            else:
+                self._contents[content_key] = [content, 1]
+                self._size += len(content)
+            while self._size > self.max_size and self._entries:
+                self._remove(next(iter(self._entries)))
+                evictions += 1
+        if evictions:
+            self._count('evictions', evictions)
+
+    def _remove(self, key):
+        created, content_key = self._entries.pop(key)
+        content = self._contents[content_key]
+        content[1] -= 1
+        if content[1] == 0:
+            del self._contents[content_key]
+            self._size -= len(content[0])
+
+
+class DiskImageCache(ImageCache):
+    """
+    Cache of the WMS images in a directory, which can be shared by all processes of a server. Each URL is
+    stored as small file referencing the file of its content. The least recently used contents are evicted
+    if the maximum size is exceeded.
+
+    Args:
+        directory (str): The directory containing the cached images. It is created if it does not exist.
+    """
+    def __init__(self, directory, **kwargs):
+        super(DiskImageCache, self).__init__(**kwargs)
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, name, extension):
+        return os.path.join(self.directory, '{0}.{1}'.format(name, extension))
+
+    def _load(self, key, ttl):
+        url_path = self._path(key, 'url')
+        try:
+            created = os.path.getmtime(url_path)
+            with open(url_path, 'r') as f:
+                content_key = f.read()
+        except OSError:
+            return None
+        try:
+            if self._expired(created, ttl):
+                os.remove(url_path)
+                return None
+            content_path = self._path(content_key, 'image')
+            with open(content_path, 'rb') as f:
+                content = f.read()
+            # The modification time of the content is its last use
+            os.utime(content_path)
+            return content
+        except OSError:
+            # The content was evicted, the reference is removed too
+            try:
+                os.remove(url_path)
+            except OSError:
+                pass
+            return None
+
+    def _store(self, key, content_key, content):
+        content_path = self._path(content_key, 'image')
+        if os.path.isfile(content_path):
+            os.utime(content_path)
+        else:
+            _write_file(self.directory, content_path, content)
+        _write_file(self.directory, self._path(key, 'url'), content_key.encode('utf-8'))
+        self._evict()
+
+    def _evict(self):
+        contents = list()
+        size = 0
+        for name in os.listdir(self.directory):
+            if name.endswith('.image'):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                contents.append((stat.st_mtime, stat.st_size, path))
+                size += stat.st_size
+        if size > self.max_size:
+            # The references of evicted contents are removed when they are loaded the next time
+            contents.sort()
+            for mtime, content_size, path in contents:
+                if size <= self.max_size:
+                    break
+                try:
+                    os.remove(path)
+                    self._count('evictions')
+                except OSError:
+                    pass
+                size -= content_size
+
+
+class DocumentCacheEntry(namedtuple('DocumentCacheEntry',
+                                    ['created', 'etag', 'last_modified', 'content_type', 'path'])):
+    """
+    A document in the :py:class:`DocumentCache`. The content is stored in the file at `path`.
+    """
+    __slots__ = ()
+
+    @property
+    def content(self):
+        """bytes: The content of the document."""
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+
+class DocumentCache(BaseCache):
+    """
+    Persistent cache of downloaded documents (e.g. the legal provisions embedded in the full extract) in a
+    directory, which can be shared by all processes of a server. Each document is stored as file, so it can
+    be passed on without loading it into memory, together with its `ETag`, `Last-Modified` and
+    `Content-Type` headers. Within the time to live a document is used without any request. Afterwards it is
+    revalidated by a conditional request and only downloaded again if it changed. The oldest documents are
+    evicted if the maximum number of entries is exceeded.
+
+    Args:
+        directory (str): The directory containing the cached documents. It is created if it does not exist.
+        max_entries (int): The maximum number of cached documents.
+        ttl (int or None): The time in seconds a document is used without revalidation.
+    """
+    def __init__(self, directory, max_entries=1000, ttl=3600):
+        super(DocumentCache, self).__init__(ttl)
+        self.directory = directory
+        self.max_entries = max_entries
+        self._stats['revalidations'] = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, url, extension='document'):
+        return os.path.join(self.directory, '{0}.{1}'.format(
+            hashlib.sha256(url.encode('utf-8')).hexdigest(),
+            extension
+        ))
+
+    def lookup(self, url):
+        """
+        Looks up the cached document of the specified URL.
+
+        Args:
+            url (str): The URL of the document.
+
+        Returns:
+            tuple: The cached entry (DocumentCacheEntry or None) and whether it can be used without
+            revalidation (bool).
+        """
+        entry = None
+        try:
+            with open(self._path(url, 'meta'), 'rb') as f:
+                created, etag, last_modified, content_type = pickle.load(f)
+            path = self._path(url)
+            if os.path.isfile(path):
+                entry = DocumentCacheEntry(created, etag, last_modified, content_type, path)
+        except Exception:
+            pass
+        if entry is None:
+            self._count('misses')
+            return None, False
+        if self._expired(entry.created):
+            return entry, False
+        self._count('hits')
+        return entry, True
+
+    def set(self, url, content, etag=None, last_modified=None, content_type=None):
+        """
+        Stores a downloaded document.
+
+        Args:
+            url (str): The URL of the document.
+            content (bytes): The content of the document.
+            etag (str or None): The `ETag` header of the response.
+            last_modified (str or None): The `Last-Modified` header of the response.
+            content_type (str or None): The `Content-Type` header of the response.
+
+        Returns:
+            DocumentCacheEntry or None: The stored entry or None if the document could not be stored.
+        """
+        try:
+            _write_file(self.directory, self._path(url), content)
+        except Exception:
+            log.exception('Storing the document {} in the cache failed'.format(url))
+            return None
+        return self._store_meta(url, etag, last_modified, content_type)
+
+    def set_file(self, url, path, etag=None, last_modified=None, content_type=None):
+        """
+        Stores a document downloaded into a file. The file is moved into the cache, so it has to be located
+        on the same file system as the cache directory, preferably in the directory returned by
+        :py:meth:`get_download_directory`.
+
+        Args:
+            url (str): The URL of the document.
+            path (str): The path of the downloaded file.
+            etag (str or None): The `ETag` header of the response.
+            last_modified (str or None): The `Last-Modified` header of the response.
+            content_type (str or None): The `Content-Type` header of the response.
+
+        Returns:
+            DocumentCacheEntry or None: The stored entry or None if the document could not be stored.
+        """
+        try:
+            os.replace(path, self._path(url))
+        except Exception:
+            log.exception('Storing the document {} in the cache failed'.format(url))
+            return None
+        return self._store_meta(url, etag, last_modified, content_type)
+
+    def get_download_directory(self):
+        """
+        Returns:
+            str: The directory to download documents into, which are stored with :py:meth:`set_file`.
+        """
+        return self.directory
+
+    def revalidated(self, url, entry):
+        """
+        Marks a cached document as unchanged after a conditional request, so it is used without
+        revalidation for the time to live again.
+
+        Args:
+            url (str): The URL of the document.
+            entry (DocumentCacheEntry): The cached entry.
+
+        Returns:
+            DocumentCacheEntry: The revalidated entry.
+        """
+        self._count('revalidations')
+        return self._store_meta(url, entry.etag, entry.last_modified, entry.content_type) or entry
+
+    def _store_meta(self, url, etag, last_modified, content_type):
+        created = time.time()
+        try:
+            _write_file(self.directory, self._path(url, 'meta'), pickle.dumps(
+                (created, etag, last_modified, content_type),
+                pickle.HIGHEST_PROTOCOL
+            ))
+        except Exception:
+            log.exception('Storing the document {} in the cache failed'.format(url))
+            return None
+        self._count('stores')
+        for path in _evict_files(self.directory, '.meta', self.max_entries):
+            try:
+                os.remove('{0}.document'.format(os.path.splitext(path)[0]))
+            except OSError:
+                pass
+            self._count('evictions')
+        return DocumentCacheEntry(created, etag, last_modified, content_type, self._path(url))
+
+
+extract_cache = None
+image_cache = None
+document_cache = None
+
+
+def init_extract_cache():
+    """
+    Initializes the application scoped extract cache as configured in `extract.cache`. This is done by the
+    includeme of the application.
+
+    Returns:
+        ExtractCache or None: The initialized extract cache or None if no cache is configured.
+    """
+    global extract_cache
+    cache_config = Config.get_extract_config().get('cache')
+    if cache_config:
+        cache_class = DottedNameResolver().maybe_resolve(cache_config.get('class'))
+        extract_cache = cache_class(**cache_config.get('params', {}))
+    else:
+        extract_cache = None
+    return extract_cache
+
+
+def get_extract_cache():
+    """
+    Returns:
+        ExtractCache or None: The application scoped extract cache or None if no cache is configured.
+    """
+    return extract_cache
+
+
+def init_image_cache():
+    """
+    Initializes the application scoped cache of the WMS images as configured in `image_download.cache`. This
+    is done by the includeme of the application.
+
+    Returns:
+        ImageCache or None: The initialized image cache or None if no cache is configured.
+    """
+    global image_cache
+    cache_config = (Config.get('image_download') or {}).get('cache')
+    if cache_config:
+        cache_class = DottedNameResolver().maybe_resolve(cache_config.get('class'))
+        image_cache = cache_class(**cache_config.get('params', {}))
+    else:
+        image_cache = None
+    return image_cache
+
+
+def get_image_cache():
+    """
+    Returns:
+        ImageCache or None: The application scoped image cache or None if no cache is configured.
+    """
+    return image_cache
+
+
+def init_document_cache():
+    """
+    Initializes the application scoped cache of the downloaded documents as configured in `document_cache`.
+    This is done by the includeme of the application.
+
+    Returns:
+        DocumentCache or None: The initialized document cache or None if no cache is configured.
+    """
+    global document_cache
+    cache_config = Config.get('document_cache')
+    if cache_config:
+        document_cache = DocumentCache(**cache_config)
+    else:
+        document_cache = None
+    return document_cache
+
+
+def get_document_cache():
+    """
+    Returns:
+        DocumentCache or None: The application scoped document cache or None if no cache is configured.
+    """
+    return document_cache
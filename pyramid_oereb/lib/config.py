@@ -3,8 +3,10 @@ import os
 
 import logging
 import datetime
+import threading
 import yaml
 from io import open as ioopen
+from types import MappingProxyType
 from pyramid.config import ConfigurationError
 from pyramid_oereb.lib.adapter import FileAdapter
 from pyramid_oereb.lib.records.office import OfficeRecord
@@ -22,6 +24,7 @@ class Config(object):
     """
 
     _config = None
+    _snapshot = None
 
     @staticmethod
     def init(configfile, configsection, c2ctemplate_style=False):
@@ -35,6 +38,24 @@ class Config(object):
         assert Config._config is None
 
         Config._config = _parse(configfile, configsection, c2ctemplate_style)
+        Config._snapshot = None
+
+    @staticmethod
+    def get_snapshot():
+        """
+        Returns the snapshot of the current configuration. It is built on first use after the configuration
+        has been loaded.
+
+        Returns:
+            ConfigSnapshot: The snapshot of the current configuration.
+        """
+        assert Config._config is not None
+
+        snapshot = Config._snapshot
+        if snapshot is None or snapshot.config is not Config._config:
+            snapshot = ConfigSnapshot(Config._config)
+            Config._snapshot = snapshot
+        return snapshot
 
     @staticmethod
     def get_config():
@@ -58,18 +79,7 @@ class Config(object):
         Returns:
             list of pyramid_oereb.lib.records.theme.ThemeRecord: The available themes.
         """
-        assert Config._config is not None
-
-        result = []
-        plrs = Config._config.get('plrs')
-        if plrs and isinstance(plrs, list):
-            for position, theme in enumerate(plrs, start=1):
-                result.append(ThemeRecord(
-                    theme.get('code'),
-                    theme.get('text'),
-                    position
-                ))
-        return result
+        return list(Config.get_snapshot().themes)
 
     @staticmethod
     def get_theme(code):
@@ -83,18 +93,7 @@ class Config(object):
             pyramid_oereb.lib.records.theme.ThemeRecord or None: The theme with the specified
             code.
         """
-        assert Config._config is not None
-
-        plrs = Config._config.get('plrs')
-        if plrs and isinstance(plrs, list):
-            for position, theme in enumerate(plrs, start=1):
-                if theme.get('code') == code:
-                    return ThemeRecord(
-                        theme.get('code'),
-                        theme.get('text'),
-                        position
-                    )
-        return None
+        return Config.get_snapshot().themes_by_code.get(code)
 
     @staticmethod
     def get_theme_thresholds(code):
@@ -106,13 +105,9 @@ class Config(object):
         :return: The geometric tolerances for this theme.
         :rtype: dict
         """
-        assert Config._config is not None
-
-        plrs = Config._config.get('plrs')
-        if plrs and isinstance(plrs, list):
-            for theme in plrs:
-                if theme.get('code') == code:
-                    return theme.get('plr_thresholds')
+        plr = Config.get_snapshot().plrs_by_code.get(code)
+        if plr is not None:
+            return plr.get('plr_thresholds')
         return None
 
     @staticmethod
@@ -301,45 +296,15 @@ class Config(object):
     @staticmethod
     def get_logo_config(language=None):
         """
-        Returns a dictionary of the configured file path's to the logos.
+        Returns a dictionary of the configured logos. The logos are read once per language.
+
+        Args:
+            language (str or None): The language of the OEREB logo. Defaults to the default language.
 
         Returns:
-            dict: The configured paths to the logos wrapped in a dictionary.
+            dict: The configured logos as image records wrapped in a dictionary.
         """
-        assert Config._config is not None
-
-        confederation_key = 'confederation'
-        oereb_key = 'oereb'
-        canton_key = 'canton'
-        msg = 'The definition for "{key}" must be set. Got: {found_config}'
-        logo_dict = Config._config.get('logo')
-
-        if not logo_dict.get(confederation_key):
-            raise ConfigurationError(msg.format(key=confederation_key, found_config=logo_dict))
-        if not logo_dict.get(oereb_key):
-            raise ConfigurationError(msg.format(key=oereb_key, found_config=logo_dict))
-        if not logo_dict.get(canton_key):
-            raise ConfigurationError(msg.format(key=canton_key, found_config=logo_dict))
-
-        file_adapter = FileAdapter()
-
-        confederation_logo = ImageRecord(file_adapter.read(logo_dict.get(confederation_key)))
-        canton_logo = ImageRecord(file_adapter.read(logo_dict.get(canton_key)))
-
-        if isinstance(logo_dict.get(oereb_key), dict):
-            if language is None or language not in logo_dict.get(oereb_key):
-                logo_language = Config.get('default_language')
-            else:
-                logo_language = language
-            oereb_logo = ImageRecord(file_adapter.read(logo_dict.get(oereb_key).get(logo_language)))
-        else:
-            oereb_logo = ImageRecord(file_adapter.read(logo_dict.get(oereb_key)))
-
-        return {
-            confederation_key: confederation_logo,
-            oereb_key: oereb_logo,
-            canton_key: canton_logo
-        }
+        return dict(Config.get_snapshot().get_logos(language))
 
     @staticmethod
     def get_oereblex_config():
@@ -468,6 +433,19 @@ class Config(object):
                 )
             )
 
+    @staticmethod
+    def get_law_status_record(code):
+        """
+        Returns the law status record with the configured translations.
+
+        Args:
+            code (str): The law status code. This must be "inForce" or "runningModifications".
+
+        Returns:
+            pyramid_oereb.lib.records.law_status.LawStatusRecord: The law status record.
+        """
+        return Config.get_snapshot().get_law_status_record(code)
+
     @staticmethod
     def get_law_status_translations(code):
         """
@@ -507,24 +485,21 @@ class Config(object):
         Returns:
             list: Layer index (int) and layer opacity (float).
         """
-        assert Config._config is not None
-        themes = Config._config.get('plrs')
-        if themes and isinstance(themes, list):
-            for theme in themes:
-                if theme.get('code') == theme_code:
-                    view_service = theme.get('view_service')
-                    if view_service and isinstance(view_service, dict):
-                        layer_index = view_service.get('layer_index')
-                        layer_opacity = view_service.get('layer_opacity')
-                        if layer_opacity is None:
-                            raise ConfigurationError(
-                                'For {} the "layer_opacity" was not found!'.format(theme_code)
-                            )
-                        if layer_index is None:
-                            raise ConfigurationError(
-                                'For {} the "layer_index" was not found!'.format(theme_code)
-                            )
-                        return layer_index, layer_opacity
+        plr = Config.get_snapshot().plrs_by_code.get(theme_code)
+        if plr is not None:
+            view_service = plr.get('view_service')
+            if view_service and isinstance(view_service, dict):
+                layer_index = view_service.get('layer_index')
+                layer_opacity = view_service.get('layer_opacity')
+                if layer_opacity is None:
+                    raise ConfigurationError(
+                        'For {} the "layer_opacity" was not found!'.format(theme_code)
+                    )
+                if layer_index is None:
+                    raise ConfigurationError(
+                        'For {} the "layer_index" was not found!'.format(theme_code)
+                    )
+                return layer_index, layer_opacity
         return None, None
 
     @classmethod
@@ -541,12 +516,7 @@ class Config(object):
             unicode: The mapped type or the original one if no mapping fits.
 
         """
-        real_estate_config = cls.get_real_estate_config()
-        type_mapping = real_estate_config.get('type_mapping', [])
-        for mapping in type_mapping:
-            if mapping['type'] == real_estate_type:
-                return mapping['mapping']
-        return real_estate_type
+        return cls.get_snapshot().real_estate_types.get(real_estate_type, real_estate_type)
 
     @staticmethod
     def get_sub_theme_sorter_config(theme_code):
@@ -556,14 +526,11 @@ class Config(object):
             'class_name': 'BaseSort',
             'params': {}
         }
-        themes = Config._config.get('plrs')
-        if themes and isinstance(themes, list):
-            for theme in themes:
-                if theme.get('code') == theme_code:
-                    sub_themes = theme.get('sub_themes', {})
-                    if 'sorter' in sub_themes:
-                        sorter = sub_themes.get('sorter')
-                    break
+        plr = Config.get_snapshot().plrs_by_code.get(theme_code)
+        if plr is not None:
+            sub_themes = plr.get('sub_themes', {})
+            if 'sorter' in sub_themes:
+                sorter = sub_themes.get('sorter')
         # Check if sorter is valid
         if 'module' not in sorter:
             log.error("Invalid configuration for sub theme sorter for theme {}, "
@@ -574,6 +541,110 @@ class Config(object):
         return sorter
 
 
+class ConfigSnapshot(object):
+    """
+    A frozen and indexed snapshot of the parts of the configuration used for each extract. The themes are
+    looked up by their code instead of scanning the configured PLRs, and the law status records and the
+    logos are created once instead of on each request.
+
+    Args:
+        config (dict): The parsed configuration.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        themes = list()
+        themes_by_code = dict()
+        plrs_by_code = dict()
+        plrs = config.get('plrs')
+        if plrs and isinstance(plrs, list):
+            for position, plr in enumerate(plrs, start=1):
+                theme = ThemeRecord(plr.get('code'), plr.get('text'), position)
+                themes.append(theme)
+                # The first configuration of a code is used, as done by scanning the list
+                themes_by_code.setdefault(theme.code, theme)
+                plrs_by_code.setdefault(theme.code, plr)
+        self.themes = tuple(themes)
+        self.themes_by_code = MappingProxyType(themes_by_code)
+        self.plrs_by_code = MappingProxyType(plrs_by_code)
+
+        real_estate_types = dict()
+        for mapping in (config.get('real_estate') or {}).get('type_mapping', []):
+            real_estate_types.setdefault(mapping['type'], mapping['mapping'])
+        self.real_estate_types = MappingProxyType(real_estate_types)
+
+        self._lock = threading.Lock()
+        self._law_status_records = dict()
+        self._logos = dict()
+
+    def get_law_status_record(self, code):
+        """
+        Args:
+            code (str): The law status code. This must be "inForce" or "runningModifications".
+
+        Returns:
+            pyramid_oereb.lib.records.law_status.LawStatusRecord: The law status record.
+        """
+        record = self._law_status_records.get(code)
+        if record is None:
+            from pyramid_oereb.lib.records.law_status import LawStatusRecord
+            record = LawStatusRecord(code, Config.get_law_status_translations(code))
+            with self._lock:
+                record = self._law_status_records.setdefault(code, record)
+        return record
+
+    def get_logos(self, language=None):
+        """
+        Args:
+            language (str or None): The language of the OEREB logo. Defaults to the default language.
+
+        Returns:
+            dict: The logos as image records. The returned dictionary must not be modified.
+        """
+        logo_dict = self.config.get('logo')
+        oereb_logo = logo_dict.get('oereb') if isinstance(logo_dict, dict) else None
+        if isinstance(oereb_logo, dict) and language is not None and language in oereb_logo:
+            logo_language = language
+        else:
+            logo_language = self.config.get('default_language')
+        logos = self._logos.get(logo_language)
+        if logos is None:
+            logos = self._read_logos(logo_dict, logo_language)
+            with self._lock:
+                logos = self._logos.setdefault(logo_language, logos)
+        return logos
+
+    @staticmethod
+    def _read_logos(logo_dict, logo_language):
+        confederation_key = 'confederation'
+        oereb_key = 'oereb'
+        canton_key = 'canton'
+        msg = 'The definition for "{key}" must be set. Got: {found_config}'
+
+        if not logo_dict.get(confederation_key):
+            raise ConfigurationError(msg.format(key=confederation_key, found_config=logo_dict))
+        if not logo_dict.get(oereb_key):
+            raise ConfigurationError(msg.format(key=oereb_key, found_config=logo_dict))
+        if not logo_dict.get(canton_key):
+            raise ConfigurationError(msg.format(key=canton_key, found_config=logo_dict))
+
+        file_adapter = FileAdapter()
+
+        confederation_logo = ImageRecord(file_adapter.read(logo_dict.get(confederation_key)))
+        canton_logo = ImageRecord(file_adapter.read(logo_dict.get(canton_key)))
+
+        if isinstance(logo_dict.get(oereb_key), dict):
+            oereb_logo = ImageRecord(file_adapter.read(logo_dict.get(oereb_key).get(logo_language)))
+        else:
+            oereb_logo = ImageRecord(file_adapter.read(logo_dict.get(oereb_key)))
+
+        return MappingProxyType({
+            confederation_key: confederation_logo,
+            oereb_key: oereb_logo,
+            canton_key: canton_logo
+        })
+
+
 def _parse(cfg_file, cfg_section, c2ctemplate_style=False):
     """
     Parses the defined YAML file and returns the defined section as dictionary.
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pyramid_oereb.lib.cache import get_document_cache
+from pyramid_oereb.lib.config import Config
+
+log = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+_lock = threading.Lock()
+_session = None
+_executor = None
+
+
+def _get_download_config():
+    return Config.get('image_download') or {}
+
+
+def get_session():
+    """
+    Returns the process wide HTTP session used to download the images. Its connections are pooled per host
+    and limited to the configured "max_connections_per_host". Failed connections and the status codes 502,
+    503 and 504 are retried up to the configured number of "retries".
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            download_config = _get_download_config()
+            max_connections_per_host = download_config.get('max_connections_per_host', 4)
+            retry = Retry(
+                total=download_config.get('retries', 2),
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=['GET'],
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=max_connections_per_host,
+                pool_block=True,
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_get_download_config().get('max_workers', 8),
+                thread_name_prefix='image_download'
+            )
+        return _executor
+
+
+def download(url, headers=None, stream=False):
+    """
+    Downloads the specified URL using the shared session, the configured proxies and timeout.
+
+    Args:
+        url (str): The URL to download.
+        headers (dict or None): Additional request headers.
+        stream (bool): Whether the content is streamed instead of being read immediately.
+
+    Returns:
+        requests.Response: The response.
+    """
+    return get_session().get(
+        url,
+        headers=headers,
+        stream=stream,
+        proxies=Config.get('proxies'),
+        timeout=_get_download_config().get('timeout', 30)
+    )
+
+
+def _download_document(url, document_cache, stream=False):
+    # Returns the cached entry if it can be used, the response of the download otherwise
+    entry = None
+    headers = dict()
+    if document_cache is not None:
+        entry, fresh = document_cache.lookup(url)
+        if fresh:
+            return entry, None
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+    response = download(url, headers=headers, stream=stream)
+    if response.status_code == 304 and entry is not None:
+        response.close()
+        return document_cache.revalidated(url, entry), None
+    if response.status_code != 200:
+        raise LookupError('The url could not be downloaded. URL was: {url}, Response was {response}'.format(
+            url=url,
+            response=response.content.decode('utf-8', errors='replace')
+        ))
+    return None, response
+
+
+def _cache_headers(response):
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'content_type': response.headers.get('Content-Type')
+    }
+
+
+def download_document(url):
+    """
+    Downloads the document of the specified URL using the configured document cache. A cached document is
+    returned without any request within its time to live. Afterwards it is revalidated with a conditional
+    request and downloaded again only if it changed.
+
+    Args:
+        url (str): The URL of the document.
+
+    Returns:
+        bytes: The content of the document.
+
+    Raises:
+        LookupError: Raised if the document could not be downloaded.
+    """
+    document_cache = get_document_cache()
+    entry, response = _download_document(url, document_cache)
+    if entry is not None:
+        return entry.content
+    if document_cache is not None:
+        document_cache.set(url, response.content, **_cache_headers(response))
+    return response.content
+
+
+def download_document_file(url, directory):
+    """
+    Downloads the document of the specified URL into a new file in the specified directory. The content is
+    streamed to the file in chunks instead of being loaded into memory. Like :py:func:`download_document`
+    the configured document cache is used. Cached documents are linked into the directory if possible.
+
+    Args:
+        url (str): The URL of the document.
+        directory (str): The directory to create the file in.
+
+    Returns:
+        tuple: The path of the created file (str) and the content type of the document (str or None).
+
+    Raises:
+        LookupError: Raised if the document could not be downloaded.
+    """
+    document_cache = get_document_cache()
+    entry, response = _download_document(url, document_cache, stream=True)
+    if entry is not None:
+        return _copy_to_directory(entry.path, directory), entry.content_type
+
+    if document_cache is None:
+        download_directory = directory
+    else:
+        download_directory = document_cache.get_download_directory()
+    handle, path = tempfile.mkstemp(dir=download_directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+    except Exception:
+        os.remove(path)
+        raise
+    finally:
+        response.close()
+    headers = _cache_headers(response)
+    if document_cache is None:
+        return path, headers['content_type']
+
+    entry = document_cache.set_file(url, path, **headers)
+    if entry is None:
+        copied_path = _copy_to_directory(path, directory)
+        os.remove(path)
+        return copied_path, headers['content_type']
+    return _copy_to_directory(entry.path, directory), entry.content_type
+
+
+def _copy_to_directory(source, directory):
+    # Hard links the file if possible, so a cached document is neither copied nor affected by its eviction
+    handle, path = tempfile.mkstemp(dir=directory)
+    os.close(handle)
+    try:
+        os.remove(path)
+        os.link(source, path)
+    except OSError:
+        shutil.copyfile(source, path)
+    return path
+
+
+def _map_concurrently(function, urls):
+    urls = list(OrderedDict.fromkeys(urls))
+    if len(urls) < 2:
+        return dict((url, function(url)) for url in urls)
+    executor = _get_executor()
+    futures = dict((executor.submit(function, url), url) for url in urls)
+    return dict(
+        (futures[future], future.result()) for future in _as_completed(futures, lambda future: future)
+    )
+
+
+def download_documents(urls):
+    """
+    Downloads the documents of all passed URLs concurrently, each URL only once.
+
+    Args:
+        urls (list of str): The URLs of the documents.
+
+    Returns:
+        dict: The content (bytes) of the documents by their URL.
+
+    Raises:
+        LookupError: Raised if a document could not be downloaded.
+    """
+    return _map_concurrently(download_document, urls)
+
+
+def download_document_files(urls, directory, ignore_errors=False):
+    """
+    Downloads the documents of all passed URLs concurrently into files in the specified directory, each URL
+    only once. See :py:func:`download_document_file`.
+
+    Args:
+        urls (list of str): The URLs of the documents.
+        directory (str): The directory to create the files in.
+        ignore_errors (bool): If set, documents which could not be downloaded are logged and omitted instead
+            of raising an error.
+
+    Returns:
+        dict: The path of the file (str) and the content type (str or None) of the documents by their URL.
+
+    Raises:
+        LookupError: Raised if a document could not be downloaded and errors are not ignored.
+    """
+    def download_file(url):
+        try:
+            return download_document_file(url, directory)
+        except Exception:
+            if not ignore_errors:
+                raise
+            log.warning('Skipped document (url: \'{}\') because it could not be downloaded'.format(url),
+                        exc_info=True)
+            return None
+
+    files = _map_concurrently(download_file, urls)
+    return dict((url, result) for url, result in files.items() if result is not None)
+
+
+def download_wms_images(view_services):
+    """
+    Downloads the images of all passed view services concurrently. View services with the same URL (e.g. the
+    public law restrictions of one topic sharing a layer) are downloaded only once. The image of each URL is
+    set on its view services as soon as its download completed.
+
+    Args:
+        view_services (list of pyramid_oereb.lib.records.view_service.ViewServiceRecord): The view services
+            whose images should be downloaded. Their URLs have to be complete already.
+
+    Raises:
+        LookupError: Raised if an image could not be downloaded.
+        AttributeError: Raised if an URL isn't valid at all.
+    """
+    if not view_services:
+        return
+    by_url = OrderedDict()
+    for view_service in view_services:
+        by_url.setdefault(view_service.reference_wms, list()).append(view_service)
+    log.debug('download_wms_images() downloading {} images of {} view services'.format(
+        len(by_url), len(view_services)))
+
+    if len(by_url) == 1:
+        # A single image is downloaded in the calling thread
+        groups = list(by_url.values())
+        groups[0][0].download_wms_content()
+    else:
+        executor = _get_executor()
+        futures = dict()
+        for group in by_url.values():
+            futures[executor.submit(group[0].download_wms_content)] = group
+        groups = _as_completed(futures, lambda future: futures[future])
+
+    for group in groups:
+        for view_service in group[1:]:
+            view_service.image = group[0].image
+
+
+def _as_completed(futures, result):
+    try:
+        for future in as_completed(futures):
+            future.result()
+            yield result(future)
+    except Exception:
+        for future in futures:
+            future.cancel()
+        raise
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from pyramid_oereb.lib.cache import _write_file
+from pyramid_oereb.lib.config import Config
+
+log = logging.getLogger(__name__)
+
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+JOB_ERROR = 'The print job failed'
+"""str: The error returned to clients for failed jobs, the details of the error are only logged."""
+
+
+class PrintJobQueueFull(Exception):
+    """
+    Raised if a print job is submitted while the queue of its print backend is full.
+    """
+    pass
+
+
+class PrintJobStore(object):
+    """
+    Stores the state and the result of print jobs in a directory, which can be shared by all processes of a
+    server. So the status and the result of a job can be requested from any process, while the job is
+    processed by the process which accepted it. The files of jobs older than the time to live are removed.
+
+    Args:
+        directory (str): The directory containing the print jobs. It is created if it does not exist.
+        ttl (int): The time in seconds the state and the result of a job are kept.
+    """
+    def __init__(self, directory, ttl=3600):
+        self.directory = directory
+        self.ttl = ttl
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, job_id, extension):
+        if not JOB_ID_PATTERN.match(job_id):
+            raise ValueError('Invalid print job id: {0}'.format(job_id))
+        return os.path.join(self.directory, '{0}.{1}'.format(job_id, extension))
+
+    def result_path(self, job_id):
+        """
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            str: The path of the file the result of the job is written to.
+        """
+        return self._path(job_id, 'pdf')
+
+    def create(self):
+        """
+        Creates a new pending job.
+
+        Returns:
+            str: The id of the created job.
+        """
+        job_id = uuid.uuid4().hex
+        self.update(job_id, status='pending')
+        return job_id
+
+    def update(self, job_id, status, error=None):
+        """
+        Updates the state of a job.
+
+        Args:
+            job_id (str): The id of the job.
+            status (str): The status of the job (pending, running, finished or error).
+            error (str or None): The error message of a failed job.
+        """
+        _write_file(self.directory, self._path(job_id, 'json'), json.dumps({
+            'id': job_id,
+            'status': status,
+            'error': error,
+            'updated': time.time()
+        }).encode('utf-8'))
+
+    def get(self, job_id):
+        """
+        Returns the state of a job.
+
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            dict or None: The state of the job or None if the job is unknown or expired.
+        """
+        try:
+            with open(self._path(job_id, 'json'), 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        except (ValueError, OSError):
+            return None
+
+    def remove(self, job_id):
+        """
+        Removes the state and the result of a job.
+
+        Args:
+            job_id (str): The id of the job.
+        """
+        for extension in ['json', 'pdf']:
+            try:
+                os.remove(self._path(job_id, extension))
+            except OSError:
+                pass
+
+    def cleanup(self):
+        """
+        Removes the jobs older than the time to live.
+        """
+        expired = time.time() - self.ttl
+        for name in os.listdir(self.directory):
+            job_id, extension = os.path.splitext(name)
+            if extension == '.json' and JOB_ID_PATTERN.match(job_id):
+                try:
+                    if os.path.getmtime(os.path.join(self.directory, name)) < expired:
+                        self.remove(job_id)
+                except OSError:
+                    pass
+
+
+class PrintJobQueue(object):
+    """
+    Processes print jobs in background threads. Each print backend gets its own workers, so the number of
+    concurrent jobs is limited per backend, and its own bounded queue of waiting jobs.
+
+    Args:
+        store (PrintJobStore): The store of the job states and results.
+        max_jobs_per_backend (int): The maximum number of jobs processed concurrently by a print backend.
+        max_queued_jobs (int): The maximum number of jobs waiting for a print backend.
+    """
+    def __init__(self, store, max_jobs_per_backend=2, max_queued_jobs=20):
+        self.store = store
+        self.max_jobs_per_backend = max_jobs_per_backend
+        self.max_queued_jobs = max_queued_jobs
+        self._lock = threading.Lock()
+        self._executors = dict()
+        self._pending = dict()
+        self._futures = dict()
+
+    def submit(self, backend, function):
+        """
+        Submits a print job.
+
+        Args:
+            backend (str): The print backend (e.g. its URL) processing the job.
+            function (callable): The function printing the job. It is called with the path the result has
+                to be written to.
+
+        Returns:
+            str: The id of the job.
+
+        Raises:
+            PrintJobQueueFull: Raised if the queue of the backend is full.
+        """
+        with self._lock:
+            pending = self._pending.get(backend, 0)
+            if pending >= self.max_jobs_per_backend + self.max_queued_jobs:
+                raise PrintJobQueueFull('The print queue of {0} is full'.format(backend))
+            self._pending[backend] = pending + 1
+            executor = self._executors.get(backend)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.max_jobs_per_backend,
+                    thread_name_prefix='print_job'
+                )
+                self._executors[backend] = executor
+        try:
+            self.store.cleanup()
+            job_id = self.store.create()
+            future = executor.submit(self._run, backend, job_id, function)
+        except Exception:
+            self._done(backend)
+            raise
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._forget(job_id))
+        return job_id
+
+    def _run(self, backend, job_id, function):
+        try:
+            self.store.update(job_id, 'running')
+            function(self.store.result_path(job_id))
+            self.store.update(job_id, 'finished')
+        except Exception as e:
+            log.exception('The print job {0} failed'.format(job_id))
+            self.store.update(job_id, 'error', error=str(e) or e.__class__.__name__)
+        finally:
+            self._done(backend)
+
+    def _done(self, backend):
+        with self._lock:
+            self._pending[backend] -= 1
+
+    def _forget(self, job_id):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def wait(self, job_id, timeout=None):
+        """
+        Waits for a job submitted by this process to be finished.
+
+        Args:
+            job_id (str): The id of the job.
+            timeout (float or None): The maximum time in seconds to wait.
+
+        Returns:
+            dict or None: The state of the job.
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout)
+        return self.store.get(job_id)
+
+
+print_job_queue = None
+
+
+def init_print_job_queue():
+    """
+    Initializes the application scoped queue of the print jobs as configured in `print.jobs`. This is done by
+    the includeme of the application.
+
+    Returns:
+        PrintJobQueue or None: The initialized queue or None if print jobs are not configured.
+    """
+    global print_job_queue
+    jobs_config = dict((Config.get('print') or {}).get('jobs') or {})
+    if jobs_config:
+        store = PrintJobStore(jobs_config.pop('directory'), ttl=jobs_config.pop('ttl', 3600))
+        print_job_queue = PrintJobQueue(
+            store,
+            max_jobs_per_backend=jobs_config.get('max_jobs_per_backend', 2),
+            max_queued_jobs=jobs_config.get('max_queued_jobs', 20)
+        )
+    else:
+        print_job_queue = None
+    return print_job_queue
+
+
+def get_print_job_queue():
+    """
+    Returns:
+        PrintJobQueue or None: The application scoped queue of the print jobs or None if print jobs are not
+        configured.
+    """
+    return print_job_queue
@@ -6,7 +6,9 @@ from operator import attrgetter
 from pyramid.path import DottedNameResolver
 
 from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.download import download_wms_images
 from pyramid_oereb.lib.records.documents import DocumentRecord
+from pyramid_oereb.lib.records.geometry import GeometryGeneralization, ToleranceCheckBatch
 from pyramid_oereb.lib.records.plr import PlrRecord
 from pyramid_oereb.lib.readers.exclusion_of_liability import ExclusionOfLiabilityReader
 from pyramid_oereb.lib.readers.extract import ExtractReader
@@ -78,7 +80,7 @@ class Processor(object):
             record.references = published_docs
         return record
 
-    def plr_tolerance_check(self, extract):
+    def plr_tolerance_check(self, extract, generalization=None):
         """
         The function checking if the found plr results exceed the minimal surface or length
         value defined in the configuration and should therefor be represented in the extract
@@ -87,6 +89,9 @@ class Processor(object):
         Args:
             extract (pyramid_oereb.lib.records.extract.ExtractRecord): The extract in it's
                 unvalidated form
+            generalization (pyramid_oereb.lib.records.geometry.GeometryGeneralization or None): The
+                generalization applied to the geometries of the remaining plrs, reusing the intersections
+                of the tolerance check. The geometries are not generalized if it is None.
 
         Returns:
             pyramid_oereb.lib.records.extract.ExtractRecord: Returns the updated extract
@@ -95,18 +100,30 @@ class Processor(object):
         real_estate = extract.real_estate
         inside_plrs = []
         outside_plrs = []
-
-        for public_law_restriction in real_estate.public_law_restrictions:
-            if isinstance(public_law_restriction, PlrRecord) and public_law_restriction.published:
-                # Test if the geometries list is now empty - if so remove plr from plr list
-                if public_law_restriction.calculate(real_estate):
-                    log.debug("plr_tolerance_check: keeping as potentially concerned plr {}".
-                              format(public_law_restriction))
-                    inside_plrs.append(self.filter_published_documents(public_law_restriction))
-                else:
-                    log.debug("plr_tolerance_check: removing from the concerned plrs {}".
-                              format(public_law_restriction))
-                    outside_plrs.append(public_law_restriction)
+        public_law_restrictions = [
+            public_law_restriction for public_law_restriction in real_estate.public_law_restrictions
+            if isinstance(public_law_restriction, PlrRecord) and public_law_restriction.published
+        ]
+
+        # The tolerances of all geometries of the extract are checked in one batch
+        batch = ToleranceCheckBatch(real_estate, keep_intersections=generalization is not None)
+        for public_law_restriction in public_law_restrictions:
+            public_law_restriction.add_geometries(batch)
+        batch.calculate()
+
+        for public_law_restriction in public_law_restrictions:
+            # Test if the geometries list is now empty - if so remove plr from plr list
+            if public_law_restriction.apply_tolerance_check(real_estate):
+                log.debug("plr_tolerance_check: keeping as potentially concerned plr {}".
+                          format(public_law_restriction))
+                if generalization is not None:
+                    for geometry in public_law_restriction.geometries:
+                        geometry.generalize(real_estate, generalization)
+                inside_plrs.append(self.filter_published_documents(public_law_restriction))
+            else:
+                log.debug("plr_tolerance_check: removing from the concerned plrs {}".
+                          format(public_law_restriction))
+                outside_plrs.append(public_law_restriction)
 
         # Check if theme is concerned
         def is_inside_plr(theme_code):
@@ -136,11 +153,13 @@ class Processor(object):
         return extract
 
     @staticmethod
-    def view_service_handling(real_estate, images, format):
+    def view_service_handling(real_estate, images, format, highlight_sld_url=None):
         """
         Handles all view service related stuff. In the moment this is:
             * construction of the correct url (reference_wms) depending on the real estate
-            * downloading of the image if parameter was set
+            * creation of the highlight of the real estate if a SLD URL was passed
+            * downloading of the images if parameter was set, all images of the extract are downloaded
+              concurrently (see :func:`pyramid_oereb.lib.download.download_wms_images`)
 
         Args:
             real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord):
@@ -148,20 +167,30 @@ class Processor(object):
             images (bool): Switch whether the images should be downloaded or not.
             format (string): The format currently used. For 'pdf' format,
                 the used map size will be adapted to the pdf format,
+            highlight_sld_url (str or None): The URL which provides the sld to style and filter the
+                highlight of the real estate. The highlight is created and its image downloaded
+                independently of the parameter images, if it is set.
 
         Returns:
             pyramid_oereb.lib.records.real_estate.RealEstateRecord: The updated extract.
         """
+        view_services = []
         real_estate.plan_for_land_register.get_full_wms_url(real_estate, format)
         real_estate.plan_for_land_register_main_page.get_full_wms_url(real_estate, format)
         if images:
-            real_estate.plan_for_land_register.download_wms_content()
-            real_estate.plan_for_land_register_main_page.download_wms_content()
+            view_services.append(real_estate.plan_for_land_register)
+            view_services.append(real_estate.plan_for_land_register_main_page)
 
         for public_law_restriction in real_estate.public_law_restrictions:
             public_law_restriction.view_service.get_full_wms_url(real_estate, format)
             if images:
-                public_law_restriction.view_service.download_wms_content()
+                view_services.append(public_law_restriction.view_service)
+
+        if highlight_sld_url is not None:
+            real_estate.set_highlight_url(highlight_sld_url, download=False)
+            view_services.append(real_estate.highlight)
+
+        download_wms_images(view_services)
         return real_estate
 
     @staticmethod
@@ -291,7 +320,8 @@ class Processor(object):
         exclusions_of_liability = self._exclusion_of_liability_reader_.read(params)
         glossaries = self._glossary_reader_.read(params)
         extract_raw = self._extract_reader_.read(params, real_estate, municipality)
-        extract = self.plr_tolerance_check(extract_raw)
+        generalization = GeometryGeneralization.from_config() if params.generalize else None
+        extract = self.plr_tolerance_check(extract_raw, generalization)
 
         resolver = DottedNameResolver()
         sort_within_themes_method_string = Config.get('extract').get('sort_within_themes_method')
@@ -302,27 +332,109 @@ class Processor(object):
             log.info("No configuration is provided for extract sort_within_themes_method;"
                      " no further sorting is applied.")
 
+        # obtain the highlight wms url and its content only if the parameter full was requested (PDF)
+        highlight_sld_url = None
+        if params.flavour == 'full':
+            if Config.get('full_extract_use_sld', True):
+                highlight_sld_url = sld_url
+
         # the selection of view services is done after the tolerance check. This enables us to take
         # care about the circumstance that after tolerance check plrs will be dismissed which were
         # recognized as intersecting before. To avoid this the tolerance check is gathering all plrs
         # intersecting and not intersecting and starts the legend entry sorting after.
-        self.view_service_handling(extract.real_estate, params.images, params.format)
+        self.view_service_handling(extract.real_estate, params.images, params.format, highlight_sld_url)
 
         extract.exclusions_of_liability = exclusions_of_liability
         extract.glossaries = glossaries
-        # obtain the highlight wms url and its content only if the parameter full was requested (PDF)
-        if params.flavour == 'full':
-            if Config.get('full_extract_use_sld', True):
-                extract.real_estate.set_highlight_url(sld_url)
         log.debug("process() done, returning extract.")
         return extract
 
 
+class ProcessorFactory(object):
+
+    def __init__(self):
+        """
+        Application scoped factory for processors. The public law restriction sources are expensive to
+        create, because each of them reads its availabilities and data integration records from the
+        database. This factory creates them only once and hands out request scoped read contexts of them
+        (see :meth:`pyramid_oereb.lib.sources.plr.PlrBaseSource.create_read_context`) with each created
+        processor. This way the sources can be shared between concurrent requests safely.
+        """
+        self._plr_sources_ = create_plr_sources()
+
+    @property
+    def plr_sources(self):
+        """
+        Returns:
+            list of pyramid_oereb.lib.sources.plr.PlrBaseSource: The list of the application scoped plr
+            source instances.
+        """
+        return self._plr_sources_
+
+    def create_processor(self):
+        """
+        Creates and returns a processor using read contexts of the application scoped plr sources.
+
+        Returns:
+            pyramid_oereb.lib.processor.Processor: A processor.
+        """
+        return _create_processor([plr_source.create_read_context() for plr_source in self._plr_sources_])
+
+
+processor_factory = None
+
+
+def init_processor_factory():
+    """
+    Initializes the application scoped processor factory. Once it is initialized, all processors created
+    with :func:`create_processor` share the same plr sources. This is done by the includeme of the
+    application.
+
+    Returns:
+        pyramid_oereb.lib.processor.ProcessorFactory: The initialized processor factory.
+    """
+    global processor_factory
+    processor_factory = ProcessorFactory()
+    return processor_factory
+
+
+def create_plr_sources():
+    """
+    Creates the public law restriction sources based on the application configuration.
+
+    Returns:
+        list of pyramid_oereb.lib.sources.plr.PlrBaseSource: The plr source instances in the order of the
+        configuration.
+    """
+    plr_sources = []
+    for plr in Config.get('plrs'):
+        plr_source_class = DottedNameResolver().maybe_resolve(plr.get('source').get('class'))
+        plr_sources.append(plr_source_class(**plr))
+    return plr_sources
+
+
 def create_processor():
     """
     Creates and returns a processor based on the application configuration.
     You should use one (and only one) processor per request. Otherwise some results can be mixed or
-    missing.
+    missing. If the application scoped processor factory is initialized, the processor uses read contexts
+    of the shared plr sources. Otherwise new plr sources are created.
+
+    Returns:
+        pyramid_oereb.lib.processor.Processor: A processor.
+    """
+    if processor_factory is not None:
+        return processor_factory.create_processor()
+    return _create_processor(create_plr_sources())
+
+
+def _create_processor(plr_sources):
+    """
+    Creates and returns a processor using the passed plr sources.
+
+    Args:
+        plr_sources (list of pyramid_oereb.lib.sources.plr.PlrBaseSource): The plr sources to be used
+            by the processor.
 
     Returns:
         pyramid_oereb.lib.processor.Processor: A processor.
@@ -358,11 +470,6 @@ def create_processor():
         **glossary_config.get('source').get('params')
     )
 
-    plr_sources = []
-    for plr in Config.get('plrs'):
-        plr_source_class = DottedNameResolver().maybe_resolve(plr.get('source').get('class'))
-        plr_sources.append(plr_source_class(**plr))
-
     extract_reader = ExtractReader(
         plr_sources,
         plr_cadastre_authority,
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import datetime
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pyramid.path import DottedNameResolver
 
 from shapely.geometry import box
@@ -11,9 +13,14 @@ from pyramid_oereb.lib.records.extract import ExtractRecord
 from pyramid_oereb.lib.records.image import ImageRecord
 from pyramid_oereb.lib.records.plr import PlrRecord, EmptyPlrRecord
 from pyramid_oereb.lib.records.view_service import ViewServiceRecord
+from pyramid_oereb.lib.sources.plr import read_combined
 
 log = logging.getLogger(__name__)
 
+_executor = None
+_executor_lock = threading.Lock()
+_connection_semaphores = dict()
+
 
 class ExtractReader(object):
     """
@@ -76,6 +83,63 @@ class ExtractReader(object):
         """
         return self._certification_at_web
 
+    def _read_plr_sources(self, params, real_estate, bbox):
+        """
+        Reads all requested plr sources. If "combined_plr_read" is enabled in the extract section, the
+        topics sharing a database connection are queried together first. If "concurrent_plr_read" is
+        configured, the sources are read at the same time in a bounded thread pool. Otherwise they are read
+        one after another.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the extract request.
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real
+                estate for which the report should be generated
+            bbox (shapely.geometry.base.BaseGeometry): The bbox to search the records.
+
+        Returns:
+            list of pyramid_oereb.lib.sources.plr.PlrBaseSource: The read plr sources in the configured
+            theme order.
+        """
+        plr_sources = list()
+        for position, plr_source in enumerate(self._plr_sources_, start=1):
+            if not params.skip_topic(plr_source.info.get('code')):
+                plr_sources.append((position, plr_source))
+
+        if Config.get('extract').get('combined_plr_read'):
+            read_combined([plr_source for position, plr_source in plr_sources], real_estate, bbox)
+
+        concurrent_config = Config.get('extract').get('concurrent_plr_read')
+        if concurrent_config and len(plr_sources) > 1:
+            executor = _get_executor(concurrent_config.get('max_workers', 8))
+            max_per_connection = concurrent_config.get('max_workers_per_connection', 4)
+            futures = [
+                executor.submit(self._read_plr_source, plr_source, params, real_estate, bbox, position,
+                                _get_connection_semaphore(plr_source, max_per_connection))
+                for position, plr_source in plr_sources
+            ]
+            # Wait for all futures in the configured order, this also re-raises any error of a source
+            for future in futures:
+                future.result()
+        else:
+            for position, plr_source in plr_sources:
+                self._read_plr_source(plr_source, params, real_estate, bbox, position)
+
+        return [plr_source for position, plr_source in plr_sources]
+
+    @staticmethod
+    def _read_plr_source(plr_source, params, real_estate, bbox, position, semaphore=None):
+        """
+        Reads one plr source, optionally limited by the semaphore of its connection.
+        """
+        if semaphore is None:
+            log.debug("read() going to read from plr_source {}".format(plr_source))
+            plr_source.read(params, real_estate, bbox, position)
+        else:
+            with semaphore:
+                log.debug("read() going to read from plr_source {}".format(plr_source))
+                plr_source.read(params, real_estate, bbox, position)
+        log.debug("read() done reading from plr_source {}".format(plr_source))
+
     def read(self, params, real_estate, municipality):
         """
         This method finally creates the extract.
@@ -109,15 +173,11 @@ class ExtractReader(object):
 
         if municipality.published:
 
-            for position, plr_source in enumerate(self._plr_sources_, start=1):
-                if not params.skip_topic(plr_source.info.get('code')):
-                    log.debug("read() going to read from plr_source {}".format(plr_source))
-                    plr_source.read(params, real_estate, bbox, position)
-                    log.debug("read() done reading from plr_source {}".format(plr_source))
-                    for ds in plr_source.datasource:
-                        if not params.skip_topic(ds.theme.code):
-                            datasource.append(ds)
-                    real_estate.public_law_restrictions.extend(plr_source.records)
+            for plr_source in self._read_plr_sources(params, real_estate, bbox):
+                for ds in plr_source.datasource:
+                    if not params.skip_topic(ds.theme.code):
+                        datasource.append(ds)
+                real_estate.public_law_restrictions.extend(plr_source.records)
 
             for plr in real_estate.public_law_restrictions:
 
@@ -179,3 +239,41 @@ class ExtractReader(object):
 
         log.debug("read() done")
         return self.extract
+
+
+def _get_executor(max_workers):
+    """
+    Returns the process wide thread pool used to read plr sources concurrently.
+
+    Args:
+        max_workers (int): The maximum number of threads of the pool. Only used on creation of the pool.
+
+    Returns:
+        concurrent.futures.ThreadPoolExecutor: The thread pool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='plr_source')
+        return _executor
+
+
+def _get_connection_semaphore(plr_source, max_per_connection):
+    """
+    Returns the semaphore limiting the concurrent reads over the database connection of the plr source.
+
+    Args:
+        plr_source (pyramid_oereb.lib.sources.plr.PlrBaseSource): The plr source.
+        max_per_connection (int): The maximum number of concurrent reads per connection. Only used on
+            creation of the semaphore.
+
+    Returns:
+        threading.BoundedSemaphore or None: The semaphore or None if the source has no database connection.
+    """
+    key = getattr(plr_source, '_key_', None)
+    if key is None:
+        return None
+    with _executor_lock:
+        if key not in _connection_semaphores:
+            _connection_semaphores[key] = threading.BoundedSemaphore(max_per_connection)
+        return _connection_semaphores[key]
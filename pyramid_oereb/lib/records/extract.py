@@ -99,3 +99,14 @@ class ExtractRecord(object):
             self.glossaries = glossaries
         else:
             self.glossaries = []
+
+    def renew(self):
+        """
+        Gives the extract a new identifier and creation date. Every delivered extract has to be identified
+        uniquely, so this is done for extracts delivered again from the cache. The signature and the QR code
+        refer to the previous identity and are removed.
+        """
+        self.extract_identifier = str(uuid.uuid4())
+        self.creation_date = datetime.now()
+        self.electronic_signature = None
+        self.qr_code = None
@@ -2,6 +2,7 @@
 import logging
 from datetime import datetime
 
+import numpy as np
 from shapely.ops import linemerge, cascaded_union
 
 from pyramid_oereb.lib.config import Config
@@ -10,6 +11,129 @@ from shapely.geometry import Point, MultiPoint, LineString, Polygon, GeometryCol
 
 log = logging.getLogger(__name__)
 
+MEASURE_NONE = -1
+"""int: The geometry has no part inside the real estate to be measured."""
+
+MEASURE_POINTS = 0
+"""int: The measure is the number of points inside the real estate."""
+
+MEASURE_LENGTH = 1
+"""int: The measure is the length inside the real estate."""
+
+MEASURE_AREA = 2
+"""int: The measure is the area inside the real estate, not yet compensated by its areas ratio."""
+
+
+def tolerance_passed(kinds, values, min_lengths, min_areas, areas_ratio):
+    """
+    Checks the measures of geometries against the tolerances. It works on single values as well as on
+    arrays of the measures of many geometries.
+
+    Args:
+        kinds (int or numpy.ndarray): The kinds of the measures (see :data:`MEASURE_NONE`).
+        values (float or numpy.ndarray): The values of the measures, NaN if there is none.
+        min_lengths (float or numpy.ndarray): The thresholds to consider or not a line element.
+        min_areas (float or numpy.ndarray): The thresholds to consider or not a surface element.
+        areas_ratio (float): The ratio of the geometrical area and the area from the land registry of the
+            real estate, used to compensate the areas.
+
+    Returns:
+        bool or numpy.ndarray: True where the measure fits the limits.
+    """
+    return (kinds == MEASURE_POINTS) | \
+        ((kinds == MEASURE_LENGTH) & (values >= min_lengths)) | \
+        ((kinds == MEASURE_AREA) & (values / areas_ratio >= min_areas))
+
+
+class IntersectionMeasuresRecord(object):
+    """
+    Measures of the intersection of a geometry with the real estate limit which were computed in the
+    database. They are used to check the tolerances without transferring the geometry itself.
+
+    Args:
+        geom_type (str): The type of the measured geometry (Point, LineString or Polygon).
+        area (float): The area of the intersection.
+        length (float): The length of the intersection.
+        nr_of_points (int): The number of points of the intersection.
+    """
+    def __init__(self, geom_type, area, length, nr_of_points):
+        self.geom_type = geom_type
+        self.area = area
+        self.length = length
+        self.nr_of_points = nr_of_points
+
+    @classmethod
+    def from_measure(cls, geom_type, measure):
+        """
+        Creates the record from the single measure matching the dimension of the geometry type: the number
+        of points for points, the length for lines and the area for polygons.
+
+        Args:
+            geom_type (str): The type of the measured geometry (Point, LineString or Polygon).
+            measure (float): The measure of the intersection.
+
+        Returns:
+            IntersectionMeasuresRecord: The created record.
+        """
+        if geom_type in ['Point', 'MultiPoint']:
+            return cls(geom_type, None, None, int(measure))
+        elif geom_type in ['LineString', 'MultiLineString']:
+            return cls(geom_type, None, measure, None)
+        return cls(geom_type, measure, None, None)
+
+
+class GeometryTypes(object):
+    """
+    The configured geometry types resolved once. An instance is shared by the tolerance checks of all
+    geometries of an extract instead of reading the configuration for every geometry.
+
+    Args:
+        geometry_types (dict): The geometry types as configured in the section `geometry_types`.
+    """
+    def __init__(self, geometry_types):
+        self.point = geometry_types.get('point').get('types')
+        self.line = geometry_types.get('line').get('types')
+        self.polygon = geometry_types.get('polygon').get('types')
+        self.supported = self.point + self.line + self.polygon
+
+    @classmethod
+    def from_config(cls):
+        """
+        Creates the geometry types from the current configuration.
+
+        Returns:
+            GeometryTypes: The configured geometry types.
+        """
+        return cls(Config.get('geometry_types'))
+
+
+class GeometryGeneralization(object):
+    """
+    The generalization of the geometries of the public law restrictions for extracts requested with the
+    `GENERALIZE` parameter, as configured in the section `geometry_generalization`. The precision of the
+    generalized coordinates is applied by the renderers (see
+    :func:`pyramid_oereb.lib.renderer.coordinates.get_coordinate_encoder`).
+
+    Args:
+        clip (bool): Clip the geometries to the real estate.
+        simplify_tolerance (float or None): The tolerance used to simplify the geometries in the unit of
+            the coordinates. The geometries are not simplified if it is None.
+    """
+    def __init__(self, clip=True, simplify_tolerance=None):
+        self.clip = clip
+        self.simplify_tolerance = simplify_tolerance
+
+    @classmethod
+    def from_config(cls):
+        """
+        Creates the geometry generalization from the current configuration.
+
+        Returns:
+            GeometryGeneralization: The configured geometry generalization.
+        """
+        generalization = Config.get('geometry_generalization') or dict()
+        return cls(generalization.get('clip', True), generalization.get('simplify_tolerance'))
+
 
 class GeometryRecord(object):
     """
@@ -18,28 +142,33 @@ class GeometryRecord(object):
     Args:
         law_status (pyramid_oereb.lib.records.law_status.LawStatusRecord): The law status of this record.
         published_from (datetime.date): Date from/since when the PLR record is published.
-        geom (Point or LineString or Polygon):
+        geom (Point or LineString or Polygon or None):
             The geometry which must be of type POINT, LINESTRING or POLYGON, everything else
-             will raise an error.
+             will raise an error. It may only be None if measures are passed.
         geo_metadata (uri): The metadata.
         public_law_restriction (pyramid_oereb.lib.records.plr.PlrRecord): The public law
             restriction
         office (pyramid_oereb.lib.records.office.Office): The office
+        measures (IntersectionMeasuresRecord or None): The measures of the intersection with the real
+            estate computed in the database. If set, they are used instead of intersecting the geometry.
 
     Raises:
         AttributeError: Error when a wrong geometry type was passed.
     """
     def __init__(
             self, law_status, published_from, geom, geo_metadata=None, public_law_restriction=None,
-            office=None):
+            office=None, measures=None):
 
         self.law_status = law_status
         self.published_from = published_from
         self.geo_metadata = geo_metadata
-        if isinstance(geom, (Point, MultiPoint, LineString, Polygon)):
+        if isinstance(geom, (Point, MultiPoint, LineString, Polygon)) or (geom is None and measures):
             self.geom = geom
+        elif geom is None:
+            raise AttributeError(u'A geometry or its measures have to be passed')
         else:
             raise AttributeError(u'The passed geometry is not supported: {type}'.format(type=geom.type))
+        self.measures = measures
         self.public_law_restriction = public_law_restriction
         self.office = office
         self._units = None
@@ -48,6 +177,8 @@ class GeometryRecord(object):
         self._nr_of_points = None
         self._test_passed = False
         self.calculated = False
+        self.intersection = None
+        self.generalized_geom = None
 
     @property
     def published(self):
@@ -76,6 +207,24 @@ class GeometryRecord(object):
         else:
             return -1
 
+    @property
+    def geom_type(self):
+        """str: The type of the geometry, also available if only its measures were loaded."""
+        if self.geom is None:
+            return self.measures.geom_type
+        return self.geom.type
+
+    @property
+    def rendered_geom(self):
+        """
+        shapely.geometry.base.BaseGeometry: The geometry written to the extract, which is the generalized
+        geometry if the extract was requested with generalization.
+        """
+        generalized_geom = getattr(self, 'generalized_geom', None)
+        if generalized_geom is None:
+            return self.geom
+        return generalized_geom
+
     @property
     def dim(self):
         """int: The topological dimension."""
@@ -111,7 +260,8 @@ class GeometryRecord(object):
         else:
             return result
 
-    def calculate(self, real_estate, min_length, min_area, length_unit, area_unit):
+    def calculate(self, real_estate, min_length, min_area, length_unit, area_unit, geometry_types=None,
+                  keep_intersection=False):
         """
         Entry method for calculation. It checks if the geometry type of this instance is a geometry
         collection which has to be unpacked first in case of collection.
@@ -122,62 +272,167 @@ class GeometryRecord(object):
             min_area (float): The threshold to consider or not a surface element.
             length_unit (unicode): The thresholds unit for area calculation.
             area_unit (unicode): The thresholds unit for area calculation.
+            geometry_types (GeometryTypes or None): The configured geometry types. They are read from the
+                configuration if not passed.
+            keep_intersection (bool): Keep the intersection with the real estate in :attr:`intersection`
+                if the geometry fits the limits, so it can be reused by :meth:`generalize`.
 
         Returns:
             bool: True if intersection fits the limits.
         """
-        geometry_types = Config.get('geometry_types')
-        line_types = geometry_types.get('line').get('types')
-        polygon_types = geometry_types.get('polygon').get('types')
-        point_types = geometry_types.get('point').get('types')
+        if geometry_types is None:
+            geometry_types = GeometryTypes.from_config()
         if self.published:
-            intersection = self.geom.intersection(real_estate.limit)
-            # TODO upon update to Shapely 1.7, a check for result.is_emtpy will be needed (see PR#1037)
-            # differentiate between Points and MultiPoint
-            if not intersection.is_empty:
-                result = self._extract_collection(intersection)
-                if self.geom.type not in point_types + line_types + polygon_types:
-                    supported_types = ', '.join(point_types + line_types + polygon_types)
-                    raise AttributeError(
-                        u'The passed geometry is not supported: {type}. It should be one of: {types}'.format(
-                            type=self.geom.type, types=supported_types
-                        )
+            kind, value, result = self._measure(real_estate, geometry_types)
+            passed = bool(tolerance_passed(kind, value, min_length, min_area, real_estate.areas_ratio))
+            self._apply_measure(kind, value, passed, result, length_unit, area_unit, real_estate.areas_ratio,
+                                keep_intersection)
+        self.calculated = True
+        return self._test_passed
+
+    def generalize(self, real_estate, generalization):
+        """
+        Generalizes the geometry for the extract, see :attr:`rendered_geom`. The intersection kept by the
+        tolerance check is reused for clipping, it is only computed if the tolerance check used the measures
+        of the database. A clipped geometry split into several parts is not clipped, because each geometry
+        record is written as a single geometry of its original type.
+
+        Args:
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real estate record.
+            generalization (GeometryGeneralization): The generalization to be applied.
+        """
+        if self.geom is None:
+            return
+        geom = self.geom
+        if generalization.clip:
+            intersection = self.intersection
+            if intersection is None:
+                intersection = self._extract_collection(self._intersection(real_estate))
+            if intersection is not None and not intersection.is_empty and intersection.type == geom.type:
+                geom = intersection
+        if generalization.simplify_tolerance:
+            geom = geom.simplify(generalization.simplify_tolerance, preserve_topology=True)
+        self.generalized_geom = geom
+        # Only needed until the geometry is generalized
+        self.intersection = None
+
+    def _intersection(self, real_estate):
+        """
+        Intersects the geometry with the real estate limit. The prepared limit of the real estate is used to
+        skip the expensive overlay for geometries which are completely outside or inside of the real estate.
+
+        Args:
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real estate record.
+
+        Returns:
+            shapely.geometry.base.BaseGeometry or None: The intersection or None if the geometry is disjoint.
+        """
+        prepared_limit = real_estate.prepared_limit
+        if prepared_limit.disjoint(self.geom):
+            return None
+        if prepared_limit.contains(self.geom):
+            return self.geom
+        return self.geom.intersection(real_estate.limit)
+
+    def _measure(self, real_estate, geometry_types):
+        """
+        Measures the part of the geometry inside the real estate: the number of points for points, the
+        length for lines and the area for polygons. The measures computed in the database are used if
+        available. An intersection of a lower dimension (e.g. the touching line of two polygons) is not
+        measured, as it should not be used for the extract.
+
+        Args:
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real estate record.
+            geometry_types (GeometryTypes): The configured geometry types.
+
+        Returns:
+            tuple: The kind of the measure (:data:`MEASURE_NONE`, :data:`MEASURE_POINTS`,
+            :data:`MEASURE_LENGTH` or :data:`MEASURE_AREA`), its value (NaN if there is none) and the
+            intersection with the real estate (None if it was not computed).
+
+        Raises:
+            AttributeError: The type of the geometry is not supported.
+        """
+        if self.measures is not None:
+            return self._measure_from_measures(geometry_types)
+        intersection = self._intersection(real_estate)
+        # TODO upon update to Shapely 1.7, a check for result.is_emtpy will be needed (see PR#1037)
+        # differentiate between Points and MultiPoint
+        if intersection is not None and not intersection.is_empty:
+            result = self._extract_collection(intersection)
+            if self.geom.type not in geometry_types.supported:
+                raise AttributeError(
+                    u'The passed geometry is not supported: {type}. It should be one of: {types}'.format(
+                        type=self.geom.type, types=', '.join(geometry_types.supported)
                     )
-                elif self.geom.type in point_types:
-                    if result.type == point_types[1]:
-                        # If it is a multipoint make a list and count the number of elements in the list
-                        self._nr_of_points = len(list(result.geoms))
-                        self._test_passed = True
-                    elif result.type == point_types[0]:
-                        # If it is a single point the number of points is one
-                        self._nr_of_points = 1
-                        self._test_passed = True
-                elif self.geom.type in line_types and result.type in line_types:
-                    self._units = length_unit
-                    length_share = result.length
-                    if length_share >= min_length:
-                        self._length_share = length_share
-                        self._test_passed = True
-                elif self.geom.type in polygon_types and result.type in polygon_types:
-                    self._units = area_unit
-                    area_share = result.area
-                    compensated_area = area_share / real_estate.areas_ratio
-                    if compensated_area >= min_area:
-                        self._area_share = compensated_area
-                        self._test_passed = True
-                else:
-                    # This intersection result should not be used for the OEREB extract:
-                    # for example, if two polygons are touching each other, the intersection geometry will be
-                    # the point or linestring representing the touching part.
-                    log.debug(
-                        u'Intersection result changed geometry type. '
-                        u'Original geometry was {0} and result is {1}'.format(
-                            self.geom.type,
-                            result.type
-                        )
+                )
+            elif self.geom.type in geometry_types.point:
+                if result.type == geometry_types.point[1]:
+                    # If it is a multipoint make a list and count the number of elements in the list
+                    return MEASURE_POINTS, len(list(result.geoms)), result
+                elif result.type == geometry_types.point[0]:
+                    # If it is a single point the number of points is one
+                    return MEASURE_POINTS, 1, result
+            elif self.geom.type in geometry_types.line and result.type in geometry_types.line:
+                return MEASURE_LENGTH, result.length, result
+            elif self.geom.type in geometry_types.polygon and result.type in geometry_types.polygon:
+                return MEASURE_AREA, result.area, result
+            else:
+                # This intersection result should not be used for the OEREB extract:
+                # for example, if two polygons are touching each other, the intersection geometry will be
+                # the point or linestring representing the touching part.
+                log.debug(
+                    u'Intersection result changed geometry type. '
+                    u'Original geometry was {0} and result is {1}'.format(
+                        self.geom.type,
+                        result.type
                     )
+                )
+        return MEASURE_NONE, float('nan'), None
+
+    def _measure_from_measures(self, geometry_types):
+        """
+        Returns the measure computed in the database like :meth:`_measure`. An intersection of a lower
+        dimension has no measure in the database.
+        """
+        measures = self.measures
+        if measures.geom_type in geometry_types.point:
+            if measures.nr_of_points:
+                return MEASURE_POINTS, measures.nr_of_points, None
+        elif measures.geom_type in geometry_types.line:
+            if measures.length:
+                return MEASURE_LENGTH, measures.length, None
+        elif measures.geom_type in geometry_types.polygon:
+            if measures.area:
+                return MEASURE_AREA, measures.area, None
+        else:
+            raise AttributeError(
+                u'The passed geometry is not supported: {type}. It should be one of: {types}'.format(
+                    type=measures.geom_type, types=', '.join(geometry_types.supported)
+                )
+            )
+        return MEASURE_NONE, float('nan'), None
+
+    def _apply_measure(self, kind, value, passed, result, length_unit, area_unit, areas_ratio,
+                       keep_intersection):
+        """
+        Stores the measure returned by :meth:`_measure` and the result of its tolerance check.
+        """
+        if kind == MEASURE_LENGTH:
+            self._units = length_unit
+        elif kind == MEASURE_AREA:
+            self._units = area_unit
+        if passed:
+            if kind == MEASURE_POINTS:
+                self._nr_of_points = value
+            elif kind == MEASURE_LENGTH:
+                self._length_share = value
+            else:
+                self._area_share = value / areas_ratio
+            self._test_passed = True
+            if keep_intersection:
+                self.intersection = result
         self.calculated = True
-        return self._test_passed
 
     @property
     def area_share(self):
@@ -205,3 +460,70 @@ class GeometryRecord(object):
         if not self.calculated:
             log.warning(u'There was an access on property "nr_of_points" before calculation was done.')
         return self._nr_of_points
+
+
+class ToleranceCheckBatch(object):
+    """
+    Checks the tolerances of many geometries, e.g. all geometries of an extract, in one batch. The geometries
+    and their thresholds are gathered by :meth:`add`. :meth:`calculate` measures them using the prepared
+    limit of the real estate, checks all measures against the tolerances at once with numpy and scatters the
+    results back to the geometry records, as :meth:`GeometryRecord.calculate` does for a single geometry.
+
+    Args:
+        real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real estate record.
+        geometry_types (GeometryTypes or None): The configured geometry types. They are read from the
+            configuration if not passed.
+        keep_intersections (bool): Keep the intersections with the real estate of the geometries fitting the
+            limits, so they can be reused by :meth:`GeometryRecord.generalize`.
+    """
+    def __init__(self, real_estate, geometry_types=None, keep_intersections=False):
+        self.real_estate = real_estate
+        self.geometry_types = GeometryTypes.from_config() if geometry_types is None else geometry_types
+        self.keep_intersections = keep_intersections
+        self._geometries = list()
+        self._min_lengths = list()
+        self._min_areas = list()
+        self._units = list()
+
+    def add(self, geometry, min_length, min_area, length_unit, area_unit):
+        """
+        Adds a geometry to the batch.
+
+        Args:
+            geometry (GeometryRecord): The geometry record.
+            min_length (float): The threshold to consider or not a line element.
+            min_area (float): The threshold to consider or not a surface element.
+            length_unit (unicode): The thresholds unit for length calculation.
+            area_unit (unicode): The thresholds unit for area calculation.
+        """
+        if not geometry.published:
+            geometry.calculated = True
+            return
+        self._geometries.append(geometry)
+        self._min_lengths.append(min_length)
+        self._min_areas.append(min_area)
+        self._units.append((length_unit, area_unit))
+
+    def calculate(self):
+        """
+        Checks the tolerances of all added geometries.
+        """
+        if len(self._geometries) == 0:
+            return
+        # Gather the measures of the geometries
+        measures = [geometry._measure(self.real_estate, self.geometry_types) for geometry in self._geometries]
+        kinds, values, results = zip(*measures)
+        areas_ratio = self.real_estate.areas_ratio
+        # Check them at once
+        passed = tolerance_passed(
+            np.array(kinds),
+            np.array(values, dtype=float),
+            np.array(self._min_lengths, dtype=float),
+            np.array(self._min_areas, dtype=float),
+            areas_ratio
+        )
+        # Scatter the results back to the geometries
+        for geometry, kind, value, result, geometry_passed, (length_unit, area_unit) in zip(
+                self._geometries, kinds, values, results, passed.tolist(), self._units):
+            geometry._apply_measure(kind, value, geometry_passed, result, length_unit, area_unit, areas_ratio,
+                                    self.keep_intersections)
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import re
 
 from filetype import filetype
@@ -15,15 +16,25 @@ class ImageRecord(object):
 
     SVG_PATTERN = re.compile(r'<svg(.|\n)+<\/svg>')  # type: re
 
+    HEADER_SIZE = 8192  # type: int
+
     """
     The record to hold the binary information of a image.
 
     Args:
         content (binary): The binary information of this image as binary string.
+        extension (str or None): The file extension of the image, if it is already known. The content is
+            sniffed on first access if it is not passed.
+        mimetype (str or None): The mime type of the image, if it is already known. Has to be passed
+            together with the extension.
     """
-    def __init__(self, content):
+    def __init__(self, content, extension=None, mimetype=None):
 
         self.content = content
+        self._filetype = None
+        self._etag = None
+        if extension is not None and mimetype is not None:
+            self._filetype = (content, (extension, mimetype))
 
     def encode(self):
         """
@@ -93,6 +104,78 @@ class ImageRecord(object):
 
         return result
 
+    @staticmethod
+    def _sniff_content(content):
+        """
+        Checks the content of an image for a valid file type and returns extension and mime type. In
+        contrast to :meth:`_validate_filetype` only a view of the header is passed to filetype and the SVG
+        check searches the raw bytes, so the content is neither copied nor decoded.
+
+        Args:
+            content (bytes, bytearray or memoryview): The content of the image.
+
+        Returns:
+            tuple: The file's extension and mime type.
+
+        Raises:
+            TypeError: Raised if type is invalid or could not be recognized.
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        view = memoryview(content)
+        ft = filetype.guess(view[:ImageRecord.HEADER_SIZE].tobytes())
+        if ft is not None:
+            result = (ft.extension, ft.mime)
+        else:
+            if isinstance(content, memoryview):
+                content = content.tobytes()
+            start = content.find(b'<svg')
+            if start < 0 or content.find(b'</svg>', start + 5) < 0:
+                raise TypeError('Unrecognized file type')
+            result = ('svg', 'image/svg+xml')
+
+        if result[0] not in ImageRecord.VALID_FILE_TYPES:
+            raise TypeError('Invalid file type: {invalid}. Valid types are: {valid}.'.format(
+                invalid=result[0],
+                valid=ImageRecord.VALID_FILE_TYPES
+            ))
+
+        return result
+
+    @property
+    def filetype(self):
+        """
+        The extension and mime type of the image. The content is sniffed once and the result is kept as
+        long as the content of the record is not replaced.
+
+        Returns:
+            tuple: The file's extension and mime type.
+
+        Raises:
+            TypeError: Raised if type is invalid or could not be recognized.
+        """
+        # Records pickled by older versions have no memoized file type
+        cached = getattr(self, '_filetype', None)
+        if cached is None or cached[0] is not self.content:
+            cached = (self.content, ImageRecord._sniff_content(self.content))
+            self._filetype = cached
+        return cached[1]
+
+    @property
+    def etag(self):
+        """
+        The strong entity tag of the image used to revalidate it in HTTP caches. It is the hash of the
+        content and computed once as long as the content of the record is not replaced.
+
+        Returns:
+            str: The entity tag (without quotes).
+        """
+        cached = getattr(self, '_etag', None)
+        if cached is None or cached[0] is not self.content:
+            cached = (self.content, hashlib.sha1(self.content).hexdigest())
+            self._etag = cached
+        return cached[1]
+
     @staticmethod
     def get_extension(obj):
         """
@@ -126,19 +209,19 @@ class ImageRecord(object):
     @property
     def mimetype(self):
         """
-        Checks for valid file type and returns its extension.
+        Checks for valid file type and returns its mime type.
 
         Returns:
-            str: The file's extension.
+            str: The file's mime type.
         """
-        return ImageRecord.get_mimetype(bytearray(self.content))
+        return self.filetype[1]
 
     @property
     def extension(self):
         """
-        Checks for valid file type and returns its mime type.
+        Checks for valid file type and returns its extension.
 
         Returns:
-            str: The file's mime type.
+            str: The file's extension.
         """
-        return ImageRecord.get_extension(bytearray(self.content))
+        return self.filetype[0]
@@ -27,13 +27,14 @@ class LawStatusRecord(object):
     @classmethod
     def from_config(cls, code):
         """
-        Create a new law status record using the translations specified in the configuration.
+        Returns the law status record using the translations specified in the configuration. The record
+        is created once and shared by all records having this law status.
 
         Args:
             code (str or unicode): The code of the law status. It must be "inForce" or "runningModifications"
                 every other value will raise an error.
 
         Returns:
-            pyramid_oereb.lib.records.law_status.LawStatusRecord: The created law status record.
+            pyramid_oereb.lib.records.law_status.LawStatusRecord: The law status record.
         """
-        return LawStatusRecord(code, Config.get_law_status_translations(code))
+        return Config.get_law_status_record(code)
@@ -4,6 +4,8 @@ import logging
 import warnings
 from datetime import datetime
 
+from pyramid_oereb.lib.records.geometry import ToleranceCheckBatch
+
 
 log = logging.getLogger(__name__)
 
@@ -176,18 +178,49 @@ class PlrRecord(EmptyPlrRecord):
         """float or None: Returns the number of points of all related geometry records of this PLR."""
         return self._nr_of_points
 
-    def calculate(self, real_estate):
-        tested_geometries = []
-        inside = False
+    def calculate(self, real_estate, geometry_types=None, keep_intersections=False):
+        """
+        Checks the tolerances of all geometries of this PLR and sums up the shares of the remaining ones.
+
+        Args:
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real estate record.
+            geometry_types (pyramid_oereb.lib.records.geometry.GeometryTypes or None): The configured
+                geometry types shared by all checked geometries. They are read from the configuration if not
+                passed.
+            keep_intersections (bool): Keep the intersections of the geometries with the real estate for
+                their generalization.
+
+        Returns:
+            bool: True if at least one geometry fits the limits.
+        """
+        batch = ToleranceCheckBatch(real_estate, geometry_types, keep_intersections)
+        self.add_geometries(batch)
+        batch.calculate()
+        return self.apply_tolerance_check(real_estate)
+
+    def add_geometries(self, batch):
+        """
+        Adds the geometries of this PLR with its thresholds to a batch checking their tolerances.
+
+        Args:
+            batch (pyramid_oereb.lib.records.geometry.ToleranceCheckBatch): The batch.
+        """
         for geometry in self.geometries:
-            if geometry.calculate(
-                    real_estate,
-                    self.min_length, self.min_area,
-                    self.length_unit, self.area_unit
-            ):
-                tested_geometries.append(geometry)
-                inside = True
-        self.geometries = tested_geometries
+            batch.add(geometry, self.min_length, self.min_area, self.length_unit, self.area_unit)
+
+    def apply_tolerance_check(self, real_estate):
+        """
+        Removes the geometries which do not fit the limits after their tolerances were checked and sums up
+        the shares of the remaining ones.
+
+        Args:
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real estate record.
+
+        Returns:
+            bool: True if at least one geometry fits the limits.
+        """
+        self.geometries = [geometry for geometry in self.geometries if geometry._test_passed]
+        inside = len(self.geometries) > 0
 
         # Points
         nr_of_points = self._sum_points()
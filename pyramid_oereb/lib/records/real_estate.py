@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from shapely.prepared import prep
+
 from pyramid_oereb import Config
 from pyramid_oereb.lib.records.view_service import ViewServiceRecord
 from pyramid_oereb.lib.url import add_url_params
@@ -69,6 +71,23 @@ class RealEstateRecord(object):
         else:
             self.references = []
         self.areas_ratio = self.limit.area / self.land_registry_area
+        self._prepared_limit = None
+
+    @property
+    def prepared_limit(self):
+        """
+        shapely.prepared.PreparedGeometry: The prepared limit of the real estate. It is created once on first
+        access and used to speed up the repeated spatial predicates of the tolerance check.
+        """
+        if self._prepared_limit is None:
+            self._prepared_limit = prep(self.limit)
+        return self._prepared_limit
+
+    def __getstate__(self):
+        # The prepared limit can not be pickled, it is created again on first access
+        state = self.__dict__.copy()
+        state['_prepared_limit'] = None
+        return state
 
     def set_view_service(self, plan_for_land_register):
         """
@@ -90,13 +109,15 @@ class RealEstateRecord(object):
         """
         self.plan_for_land_register_main_page = plan_for_land_register_main_page
 
-    def set_highlight_url(self, sld_url):
+    def set_highlight_url(self, sld_url, download=True):
         """
         Set the highlight of the real estate.
 
         Args:
             sld_url (str): The URL which provides the sld to style and filter the highlight of the real
             estate.
+            download (bool): Switch whether the image of the highlight should be downloaded immediately.
+                Set it to False if the image is downloaded together with other images.
         """
         configured_params = Config.get_real_estate_config().get('visualisation').get('url_params')
         additional_url_params = {}
@@ -109,7 +130,8 @@ class RealEstateRecord(object):
             self.plan_for_land_register.layer_opacity,
             legend_at_web={}
         )
-        self.highlight.download_wms_content()
+        if download:
+            self.highlight.download_wms_content()
 
     def __str__(self):
         return '<%s -- number: %s identdn: %s egrid: %s type: %s' \
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 import warnings
 import logging
-import requests
 
 from pyramid.config import ConfigurationError
+from pyramid_oereb.lib.cache import get_image_cache
+from pyramid_oereb.lib.download import download
 from pyramid_oereb.lib.records.image import ImageRecord
 from pyramid_oereb.lib.url import add_url_params, parse_url
 from pyramid_oereb.lib.url import uri_validator
@@ -65,10 +66,13 @@ class ViewServiceRecord(object):
     Attributes:
         image (pyramid_oereb.lib.records.image.ImageRecord or None): Binary image content downloaded from WMS
             link.
+        data_version (object): The data version of the topic shown by this view service. It is used to
+            invalidate cached images of the topic (see :class:`pyramid_oereb.lib.cache.ImageCache`).
     """
 
     # Attributes defined while processing
     image = None    # map image resulting from calling the wms link - binary
+    data_version = None
 
     def __init__(self, reference_wms, layer_index, layer_opacity, legend_at_web=None, legends=None):
         """
@@ -247,7 +251,9 @@ class ViewServiceRecord(object):
 
     def download_wms_content(self):
         """
-        Simply downloads the image found behind the URL stored in the instance attribute "reference_wms".
+        Simply downloads the image found behind the URL stored in the instance attribute "reference_wms". If
+        an image cache is configured, the image is taken from the cache if possible and stored in it
+        otherwise.
 
         Raises:
             LookupError: Raised if the response is not code 200 or content-type
@@ -256,9 +262,15 @@ class ViewServiceRecord(object):
         """
         main_msg = "Image for WMS couldn't be retrieved."
         if uri_validator(self.reference_wms):
+            image_cache = get_image_cache()
+            if image_cache is not None:
+                content = image_cache.get(self.reference_wms, self.data_version)
+                if content is not None:
+                    self.image = ImageRecord(content)
+                    return
             log.debug("Downloading image, url: {url}".format(url=self.reference_wms))
             try:
-                response = requests.get(self.reference_wms, proxies=Config.get('proxies'))
+                response = download(self.reference_wms)
             except Exception as ex:
                 dedicated_msg = "An image could not be downloaded. URL was: {url}, error was " \
                                 "{response}".format(
@@ -271,6 +283,8 @@ class ViewServiceRecord(object):
             content_type = response.headers.get('content-type', '')
             if response.status_code == 200 and content_type.find('image') > -1:
                 self.image = ImageRecord(response.content)
+                if image_cache is not None:
+                    image_cache.set(self.reference_wms, response.content, self.data_version)
             else:
                 dedicated_msg = "The image could not be downloaded. URL was: {url}, Response was " \
                                 "{response}".format(
@@ -10,6 +10,8 @@ from pyramid.request import Request
 from pyramid.testing import DummyRequest
 
 from pyramid_oereb import Config
+from pyramid_oereb.lib.records.documents import LegalProvisionRecord
+from pyramid_oereb.lib.url import url_to_base64, urls_to_base64
 
 
 log = logging.getLogger(__name__)
@@ -25,6 +27,7 @@ class Base(object):
         """
         self._info_ = info
         self._language = str(Config.get('default_language')).lower()
+        self._base64_text_at_web = dict()
 
     @classmethod
     def get_symbol_ref(cls, request, record):
@@ -130,6 +133,47 @@ class Base(object):
                 'Text': values
             }
 
+    def prefetch_base64_text_at_web(self, extract):
+        """
+        Downloads the documents of all legal provisions of the extract concurrently before rendering, so
+        their *Base64TextAtWeb* has not to be downloaded one after another. The legal provisions are
+        looked up in the public law restrictions and references of the real estate including their
+        nested articles and references.
+
+        Args:
+            extract (pyramid_oereb.lib.records.extract.ExtractRecord): The extract to be rendered.
+        """
+        urls = list()
+        documents = list(extract.real_estate.references or [])
+        for plr in extract.real_estate.public_law_restrictions or []:
+            documents.extend(plr.documents or [])
+        visited = set()
+        while documents:
+            document = documents.pop()
+            if id(document) in visited:
+                continue
+            visited.add(id(document))
+            if isinstance(document, LegalProvisionRecord) and document.text_at_web:
+                urls.append(self.get_localized_text(document.text_at_web).get('Text'))
+            documents.extend(getattr(document, 'articles', None) or [])
+            documents.extend(getattr(document, 'references', None) or [])
+        self._base64_text_at_web = urls_to_base64(urls)
+
+    def get_base64_text_at_web(self, url):
+        """
+        Returns the document at the given url as base64 document. Documents prefetched by
+        :py:meth:`prefetch_base64_text_at_web` are not downloaded again.
+
+        Args:
+            url (str): The url of the document.
+
+        Returns:
+            base64 or None: The document as base64 string or None on empty urls.
+        """
+        if url in self._base64_text_at_web:
+            return self._base64_text_at_web[url]
+        return url_to_base64(url)
+
     def get_multilingual_text(self, values):
         """
         Returns the set language of a multilingual text element.
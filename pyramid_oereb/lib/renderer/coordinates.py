@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from shapely.geometry import mapping
+
+from pyramid_oereb.lib.config import Config
+
+
+class CoordinateEncoder(object):
+    """
+    Encodes the coordinates of geometries for the GML and JSON output. Whole coordinate sequences are
+    converted to arrays and formatted in one call instead of formatting each coordinate separately.
+
+    Args:
+        precision (int or None): The number of decimals of the coordinates. The coordinates are written with
+            full precision if it is None.
+    """
+
+    def __init__(self, precision=None):
+        self.precision = precision
+        self._format = None if precision is None else '%.{0}f'.format(precision)
+
+    @staticmethod
+    def to_array(coords):
+        """
+        Converts coordinates to an array of floats.
+
+        Args:
+            coords (shapely.coords.CoordinateSequence or list): The coordinates.
+
+        Returns:
+            numpy.ndarray: The coordinates as array with one row per coordinate.
+        """
+        return np.asarray(coords, dtype=float)
+
+    def pos_list(self, coords):
+        """
+        Formats coordinates as GML position list (all ordinates separated by spaces).
+
+        Args:
+            coords (shapely.coords.CoordinateSequence or list): The coordinates.
+
+        Returns:
+            str: The formatted coordinates.
+        """
+        values = self.to_array(coords).ravel().tolist()
+        if self._format is None:
+            return ' '.join(map(repr, values))
+        return ' '.join([self._format] * len(values)) % tuple(values)
+
+    def pos(self, point):
+        """
+        Formats a point as GML position.
+
+        Args:
+            point (shapely.geometry.Point): The point.
+
+        Returns:
+            str: The formatted coordinate.
+        """
+        return self.pos_list(point.coords)
+
+    def _tuples(self, coords):
+        array = np.round(self.to_array(coords), self.precision)
+        return tuple(map(tuple, array.tolist()))
+
+    def coordinates(self, geom):
+        """
+        Returns the coordinates of a geometry as nested tuples like the coordinates of its GeoJSON mapping.
+
+        Args:
+            geom (shapely.geometry.base.BaseGeometry): The geometry.
+
+        Returns:
+            tuple: The coordinates rounded to the precision.
+        """
+        if self.precision is None:
+            return mapping(geom)['coordinates']
+        if geom.type == 'Point':
+            return self._tuples(geom.coords)[0]
+        if geom.type in ('LineString', 'LinearRing'):
+            return self._tuples(geom.coords)
+        if geom.type == 'Polygon':
+            if geom.is_empty:
+                return tuple()
+            return tuple(self._tuples(ring.coords) for ring in [geom.exterior] + list(geom.interiors))
+        if geom.type in ('MultiPoint', 'MultiLineString'):
+            return tuple(self.coordinates(part) for part in geom.geoms)
+        if geom.type == 'MultiPolygon':
+            # Like its GeoJSON mapping
+            return [self.coordinates(part) for part in geom.geoms]
+        return mapping(geom)['coordinates']
+
+    def _array(self, coords):
+        array = self.to_array(coords)
+        if self.precision is None:
+            return array
+        return np.round(array, self.precision)
+
+    def arrays(self, geom):
+        """
+        Returns the coordinates of a geometry nested like the coordinates of its GeoJSON mapping, but with
+        each coordinate sequence as array. JSON backends supporting arrays write them straight from their
+        buffer, the others convert them to lists (see :mod:`pyramid_oereb.lib.renderer.json_backends`).
+
+        Args:
+            geom (shapely.geometry.base.BaseGeometry): The geometry.
+
+        Returns:
+            numpy.ndarray or list: The coordinates rounded to the precision.
+        """
+        if geom.type == 'Point':
+            return self._array(geom.coords)[0]
+        if geom.type in ('LineString', 'LinearRing'):
+            return self._array(geom.coords)
+        if geom.type == 'Polygon':
+            if geom.is_empty:
+                return list()
+            return [self._array(ring.coords) for ring in [geom.exterior] + list(geom.interiors)]
+        if geom.type in ('MultiPoint', 'MultiLineString', 'MultiPolygon'):
+            return [self.arrays(part) for part in geom.geoms]
+        return mapping(geom)['coordinates']
+
+
+_coordinate_encoders = dict()
+
+
+def get_coordinate_encoder(srid=None, generalize=False):
+    """
+    Returns the coordinate encoder using the precision configured in "coordinate_precision" for the SRID.
+
+    Args:
+        srid (int or None): The SRID of the coordinates. The configured "srid" is used if it is None.
+        generalize (bool): Use the precision configured in "geometry_generalization" if it is set, for
+            extracts requested with generalized geometries.
+
+    Returns:
+        CoordinateEncoder: The coordinate encoder.
+    """
+    if srid is None:
+        srid = Config.get('srid')
+    precision = (Config.get('coordinate_precision') or dict()).get(srid)
+    if generalize:
+        generalized_precision = (Config.get('geometry_generalization') or dict()).get('precision')
+        if generalized_precision is not None:
+            precision = generalized_precision
+    encoder = _coordinate_encoders.get(precision)
+    if encoder is None:
+        encoder = CoordinateEncoder(precision)
+        _coordinate_encoders[precision] = encoder
+    return encoder
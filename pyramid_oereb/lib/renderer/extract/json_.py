@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
+import copy
 import logging
-
-from json import dumps
+import uuid
 
 from pyramid.request import Request
 from pyramid.response import Response
@@ -11,10 +11,10 @@ from pyramid_oereb import Config, route_prefix
 from pyramid_oereb.lib.records.documents import DocumentRecord, LegalProvisionRecord,\
     ArticleRecord, LawRecord, HintRecord
 from pyramid_oereb.lib.sources.plr import PlrRecord
-from pyramid_oereb.lib.url import url_to_base64
-from shapely.geometry import mapping
 
 from pyramid_oereb.lib.renderer import Base
+from pyramid_oereb.lib.renderer.coordinates import get_coordinate_encoder
+from pyramid_oereb.lib.renderer.json_backends import get_json_backend
 from pyramid_oereb.views.webservice import Parameter
 
 log = logging.getLogger(__name__)
@@ -29,10 +29,14 @@ class Renderer(Base):
             info (pyramid.interfaces.IRendererInfo): Info object.
         """
         super(Renderer, self).__init__(info)
+        self._coordinate_arrays = False
+        self._restrictions_placeholder = None
 
     def __call__(self, value, system):
         """
-        Returns the JSON encoded extract, according to the specification.
+        Returns the JSON encoded extract, according to the specification. It is serialized by the configured
+        JSON backend. If "json_streaming" is enabled, the restrictions on landownership are serialized one
+        after another while the response is sent (see :meth:`_render_chunks`).
 
         Args:
             value (tuple): A tuple containing the generated extract record and the params
@@ -40,8 +44,14 @@ class Renderer(Base):
             system (dict): The available system properties.
 
         Returns:
-            str: The JSON encoded extract.
+            bytes or iterator of bytes: The JSON encoded extract, the iterator is used as app_iter of the
+            response.
         """
+        # The rendering may continue after this call, so each request is rendered by its own copy
+        renderer = copy.copy(self)
+        return renderer._call(value, system)
+
+    def _call(self, value, system):
         log.debug("__call__() start")
         self._request = self.get_request(system)
         assert isinstance(self._request, (Request, DummyRequest))
@@ -50,16 +60,69 @@ class Renderer(Base):
         if isinstance(response, Response) and response.content_type == response.default_content_type:
             response.content_type = 'application/json; charset=UTF-8'
 
-        extract_dict = self._render(value[0], value[1])
+        # The coordinates are only passed as arrays to the JSON backend, not to the subclasses using the
+        # rendered extract.
+        self._coordinate_arrays = True
+        json_backend = get_json_backend()
+        if Config.get('json_streaming', False):
+            content = self._render_chunks(value[0], value[1], json_backend)
+        else:
+            content = json_backend.dumps(self._render_response(value[0], value[1]))
+        log.debug("__call__() done.")
+        return content
+
+    def _render_response(self, extract, param):
         result = {
             u'GetExtractByIdResponse': {
-                u'extract': extract_dict
+                u'extract': self._render(extract, param)
             }
         }
         if self._params.flavour == 'embeddable':
-            result[u'GetExtractByIdResponse'][u'embeddable'] = self.format_embeddable(value[0].embeddable)
-        log.debug("__call__() done.")
-        return dumps(result)
+            result[u'GetExtractByIdResponse'][u'embeddable'] = self.format_embeddable(extract.embeddable)
+        return result
+
+    def _render_chunks(self, extract, param, json_backend):
+        """
+        Serializes the extract in chunks to keep the memory usage low for extracts containing many or large
+        geometries. The extract without the restrictions on landownership is serialized at once, each
+        restriction on landownership is formatted and serialized separately when the returned iterator
+        reaches it. Errors in the extract are raised here.
+
+        Args:
+            extract (pyramid_oereb.lib.records.extract.ExtractRecord): The extract record
+            param (pyramid_oereb.views.webservice.Parameter): The parameter instance holding information and
+                methods for handling request parameters.
+            json_backend (pyramid_oereb.lib.renderer.json_backends.JsonBackend): The backend used to
+                serialize the chunks.
+
+        Returns:
+            iterator of bytes: The JSON encoded extract.
+        """
+        self._restrictions_placeholder = uuid.uuid4().hex
+        try:
+            content = json_backend.dumps(self._render_response(extract, param))
+        finally:
+            placeholder = self._restrictions_placeholder
+            self._restrictions_placeholder = None
+        parts = content.split(u'"{0}"'.format(placeholder).encode('utf-8'))
+        if len(parts) == 1:
+            # No restrictions on landownership
+            return iter(parts)
+        return self._iter_chunks(
+            parts[0],
+            extract.real_estate.public_law_restrictions,
+            json_backend,
+            parts[1]
+        )
+
+    def _iter_chunks(self, head, restrictions, json_backend, tail):
+        yield head + b'['
+        separator = b''
+        for restriction in restrictions:
+            for plr_dict in self.format_plr([restriction]):
+                yield separator + json_backend.dumps(plr_dict)
+                separator = b','
+        yield b']' + tail
 
     def _render(self, extract, param):
         """
@@ -87,6 +150,9 @@ class Renderer(Base):
         else:
             self._language = Config.get('default_language')
 
+        if self._params.flavour == 'full':
+            self.prefetch_base64_text_at_web(extract)
+
         extract_dict = {
             'CreationDate': self.date_time(extract.creation_date),
             'isReduced': self._params.flavour in ['reduced', 'embeddable'],
@@ -221,8 +287,13 @@ class Renderer(Base):
 
         if isinstance(real_estate.public_law_restrictions, list) \
                 and len(real_estate.public_law_restrictions) > 0:
-            real_estate_dict['RestrictionOnLandownership'] = \
-                self.format_plr(real_estate.public_law_restrictions)
+            if self._restrictions_placeholder is None:
+                real_estate_dict['RestrictionOnLandownership'] = \
+                    self.format_plr(real_estate.public_law_restrictions)
+            else:
+                # Serialized separately, see _render_chunks()
+                self.check_legal_provisions(real_estate.public_law_restrictions)
+                real_estate_dict['RestrictionOnLandownership'] = self._restrictions_placeholder
 
         if isinstance(real_estate.references, list) and len(real_estate.references) > 0:
             reference_list = list()
@@ -250,17 +321,13 @@ class Renderer(Base):
 
         assert isinstance(self._params, Parameter)
 
+        self.check_legal_provisions(plrs)
         plr_list = list()
 
         for plr in plrs:
 
             if isinstance(plr, PlrRecord):
 
-                # PLR without legal provision is allowed in reduced extract only!
-                if self._params.flavour != 'reduced' and isinstance(plr.documents, list) and \
-                        len(plr.documents) == 0:
-                    raise ValueError('Restrictions on landownership without legal provision are only allowed '
-                                     'in reduced extracts!')
                 plr_dict = {
                     'Information': self.get_multilingual_text(plr.information),
                     'Theme': self.format_theme(plr.theme),
@@ -314,6 +381,25 @@ class Renderer(Base):
 
         return plr_list
 
+    def check_legal_provisions(self, plrs):
+        """
+        Checks the legal provisions of public law restrictions, which are allowed without legal provision
+        in reduced extracts only.
+
+        Args:
+            plrs (list of pyramid_oereb.lib.records.plr.PlrRecord): The public law restriction
+                records to be checked.
+
+        Raises:
+            ValueError: A public law restriction has no legal provision in a non-reduced extract.
+        """
+        if self._params.flavour == 'reduced':
+            return
+        for plr in plrs:
+            if isinstance(plr, PlrRecord) and isinstance(plr.documents, list) and len(plr.documents) == 0:
+                raise ValueError('Restrictions on landownership without legal provision are only allowed '
+                                 'in reduced extracts!')
+
     def format_law_status(self, law_status):
         """
         Args:
@@ -327,7 +413,7 @@ class Renderer(Base):
             'Text': self.get_localized_text(law_status.text)
         }
 
-    def format_document(self, document):
+    def format_document(self, document, base64_text_at_web=True):
         """
         Formats a document record for rendering according to the federal specification.
         If the render is requested with a *full* flavour, it will render the *textAtWeb*
@@ -336,6 +422,8 @@ class Renderer(Base):
         Args:
             document (pyramid_oereb.lib.records.documents.DocumentBaseRecord): The document
                 record to be formatted.
+            base64_text_at_web (bool): False to never render the *Base64TextAtWeb* field, e.g. if
+                the documents are joined to a printed extract.
 
         Returns:
             dict: The formatted dictionary for rendering.
@@ -355,8 +443,11 @@ class Renderer(Base):
                 'Title': self.get_multilingual_text(document.title),
                 'ResponsibleOffice': self.format_office(document.responsible_office)
             })
-            if self._params.flavour == 'full' and isinstance(document, LegalProvisionRecord):
-                base64_text_at_web = url_to_base64(multilingual_text_at_web[0].get('Text'))
+            if base64_text_at_web and self._params.flavour == 'full' and \
+                    isinstance(document, LegalProvisionRecord):
+                base64_text_at_web = self.get_base64_text_at_web(
+                    multilingual_text_at_web[0].get('Text')
+                )
                 if base64_text_at_web is not None:
                     document_dict['Base64TextAtWeb'] = base64_text_at_web
 
@@ -377,13 +468,13 @@ class Renderer(Base):
             if isinstance(document.articles, list) and len(document.articles) > 0:
                 article_list = list()
                 for article in document.articles:
-                    article_list.append(self.format_document(article))
+                    article_list.append(self.format_document(article, base64_text_at_web))
                 document_dict['Article'] = article_list
 
             if isinstance(document.references, list) and len(document.references) > 0:
                 reference_list = list()
                 for reference in document.references:
-                    reference_list.append(self.format_document(reference))
+                    reference_list.append(self.format_document(reference, base64_text_at_web))
                 document_dict['Reference'] = reference_list
 
             # Note: No output for File (binary) because speccifications are
@@ -414,20 +505,21 @@ class Renderer(Base):
         Returns:
             dict: The formatted dictionary for rendering.
         """
+        geom = geometry.rendered_geom
         geometry_types = Config.get('geometry_types')
-        if geometry.geom.type in geometry_types.get('point').get('types'):
+        if geom.type in geometry_types.get('point').get('types'):
             geometry_type = 'Point'
-        elif geometry.geom.type in geometry_types.get('line').get('types'):
+        elif geom.type in geometry_types.get('line').get('types'):
             geometry_type = 'Line'
-        elif geometry.geom.type in geometry_types.get('polygon').get('types'):
+        elif geom.type in geometry_types.get('polygon').get('types'):
             geometry_type = 'Surface'
         else:
             raise TypeError('The geometry type {gtype} is not configured in "geometry_types"'.format(
-                gtype=geometry.geom.type
+                gtype=geom.type
             ))
 
         geometry_dict = {
-            geometry_type: self.from_shapely(geometry.geom),
+            geometry_type: self.from_shapely(geom),
             'Lawstatus': self.format_law_status(geometry.law_status),
             'ResponsibleOffice': self.format_office(geometry.office)
         }
@@ -562,8 +654,7 @@ class Renderer(Base):
             legend_entry_dict['OtherTheme'] = legend_entry.other_theme
         return legend_entry_dict
 
-    @staticmethod
-    def from_shapely(geom):
+    def from_shapely(self, geom):
         """
         Formats shapely geometry for rendering according to the federal specification.
 
@@ -573,8 +664,15 @@ class Renderer(Base):
         Returns:
             dict: The formatted geometry.
         """
+        params = getattr(self, '_params', None)
+        generalize = isinstance(params, Parameter) and params.generalize
+        coordinate_encoder = get_coordinate_encoder(generalize=generalize)
+        if self._coordinate_arrays:
+            coordinates = coordinate_encoder.arrays(geom)
+        else:
+            coordinates = coordinate_encoder.coordinates(geom)
         geom_dict = {
-            'coordinates': mapping(geom)['coordinates'],
+            'coordinates': coordinates,
             'crs': 'EPSG:{srid}'.format(srid=Config.get('srid'))
             # isosqlmmwkb only used for curved geometries (not supported by shapely)
             # 'isosqlmmwkb': b64.encode(geom.wkb)
@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
+import copy
 import logging
+import uuid
 
 from pyramid.httpexceptions import HTTPInternalServerError
-from mako.lookup import TemplateLookup
 from pyramid.path import AssetResolver
 
 from pyramid.response import Response
 
+from pyramid_oereb import Config
+from pyramid_oereb.lib.records.plr import PlrRecord
 from pyramid_oereb.lib.renderer import Base
+from pyramid_oereb.lib.renderer.coordinates import get_coordinate_encoder
+from pyramid_oereb.lib.renderer.templates import get_template_lookup
 from mako import exceptions
 
 from pyramid_oereb.views.webservice import Parameter
@@ -32,7 +37,9 @@ class Renderer(Base):
 
     def __call__(self, value, system):
         """
-        Returns the XML encoded extract, according to the specification.
+        Returns the XML encoded extract, according to the specification. If "xml_streaming" is enabled, the
+        restrictions on landownership are rendered one after another while the response is sent (see
+        :meth:`_render_chunks`).
 
         Args:
             value (tuple): A tuple containing the generated extract record and the params
@@ -40,8 +47,14 @@ class Renderer(Base):
             system (dict): The available system properties.
 
         Returns:
-            str: The XML encoded extract.
+            bytes or iterator of bytes: The XML encoded extract, the iterator is used as app_iter of the
+            response.
         """
+        # The rendering may continue after this call, so each request is rendered by its own copy
+        renderer = copy.copy(self)
+        return renderer._call(value, system)
+
+    def _call(self, value, system):
         self._request = self.get_request(system)
         response = self.get_response(system)
         if isinstance(response, Response) and response.content_type == response.default_content_type:
@@ -58,7 +71,10 @@ class Renderer(Base):
 
         extract = value[0]
         try:
-            content = self._render(extract, self._params_)
+            if Config.get('xml_streaming', False):
+                content = self._render_chunks(extract, self._params_)
+            else:
+                content = self._render(extract, self._params_)
             return content
         except ValueError as e:
             log.error('The extract can not be rendered. ValueError is {0}'.format(e))
@@ -68,13 +84,103 @@ class Renderer(Base):
             return exceptions.html_error_template().render()
 
     def _render(self, extract, params):
-        templates = TemplateLookup(
-            directories=[self.template_dir],
-            output_encoding='utf-8',
-            input_encoding='utf-8'
+        self._check_legal_provisions(extract, params)
+        templates = get_template_lookup(self.template_dir)
+        if params.flavour == 'full':
+            self.prefetch_base64_text_at_web(extract)
+        return templates.get_template('extract.xml').render(
+            restrictions_placeholder=None,
+            **self._get_template_params(extract, params)
+        )
+
+    def _render_chunks(self, extract, params):
+        """
+        Renders the extract in chunks to keep the memory usage low for extracts containing many or large
+        geometries. The document without the restrictions on landownership is rendered at once, each
+        restriction on landownership is rendered separately when the returned iterator reaches it. Errors
+        in the extract are raised here, errors while rendering the restrictions abort the iteration. If the
+        templates do not render the placeholder of the restrictions on landownership, e.g. templates of a
+        project which include them directly, the whole document is returned as single chunk.
+
+        Args:
+            extract (pyramid_oereb.lib.records.extract.ExtractRecord): The extract to be rendered.
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the extract request.
+
+        Returns:
+            iterator of bytes: The XML encoded extract.
+        """
+        restrictions = self._check_legal_provisions(extract, params)
+        templates = get_template_lookup(self.template_dir)
+        if params.flavour == 'full':
+            self.prefetch_base64_text_at_web(extract)
+        template_params = self._get_template_params(extract, params)
+        placeholder = '<!-- {0} -->'.format(uuid.uuid4())
+        content = templates.get_template('extract.xml').render(
+            restrictions_placeholder=placeholder,
+            **template_params
         )
-        template = templates.get_template('extract.xml')
-        content = template.render(**{
+        parts = content.split(placeholder.encode('utf-8') + b'\n')
+        if len(parts) != 2:
+            log.debug('The restrictions on landownership are not rendered separately, the templates do not '
+                      'contain the placeholder')
+            return iter([content])
+        head, tail = parts
+        return self._iter_chunks(
+            head,
+            templates.get_template('public_law_restriction.xml'),
+            restrictions,
+            template_params,
+            tail
+        )
+
+    @staticmethod
+    def _check_legal_provisions(extract, params):
+        """
+        Checks the restrictions on landownership have legal provisions, which is mandatory except for
+        reduced extracts.
+
+        Args:
+            extract (pyramid_oereb.lib.records.extract.ExtractRecord): The extract to be rendered.
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the extract request.
+
+        Returns:
+            list of pyramid_oereb.lib.records.plr.PlrRecord: The restrictions on landownership to be
+            rendered.
+
+        Raises:
+            ValueError: A restriction on landownership has no legal provision.
+        """
+        restrictions = [
+            public_law_restriction for public_law_restriction in extract.real_estate.public_law_restrictions
+            if isinstance(public_law_restriction, PlrRecord)
+        ]
+        if params.flavour != 'reduced':
+            for public_law_restriction in restrictions:
+                if isinstance(public_law_restriction.documents, list) and \
+                        len(public_law_restriction.documents) == 0:
+                    raise ValueError('Restrictions on landownership without legal provision are only '
+                                     'allowed in reduced extracts!')
+        return restrictions
+
+    @staticmethod
+    def _iter_chunks(head, template, restrictions, template_params, tail):
+        yield head
+        for public_law_restriction in restrictions:
+            try:
+                # Indented as if it was included by real_estate.xml
+                chunk = b'    ' + template.render(
+                    public_law_restriction=public_law_restriction,
+                    **template_params
+                ) + b'\n'
+            except Exception:
+                # The response is already started, it can only be aborted
+                log.exception('The restriction on landownership can not be rendered, aborting the response')
+                raise
+            yield chunk
+        yield tail
+
+    def _get_template_params(self, extract, params):
+        return {
             'extract': extract,
             'params': params,
             'sort_by_localized_text': self.sort_by_localized_text,
@@ -83,9 +189,10 @@ class Renderer(Base):
             'request': self._request,
             'get_symbol_ref': self.get_symbol_ref,
             'get_gml_id': self._get_gml_id,
+            'coordinate_encoder': get_coordinate_encoder(generalize=params.generalize),
+            'get_base64_text_at_web': self.get_base64_text_at_web,
             'date_format': '%Y-%m-%dT%H:%M:%S'
-        })
-        return content
+        }
 
     def _get_gml_id(self):
         """
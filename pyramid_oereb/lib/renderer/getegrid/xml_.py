@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
-from mako.lookup import TemplateLookup
 from pyramid.path import AssetResolver
 
 from pyramid.response import Response
 
 from pyramid_oereb.lib.renderer import Base
+from pyramid_oereb.lib.renderer.templates import get_template_lookup
 from mako import exceptions
 
 
@@ -37,11 +37,7 @@ class Renderer(Base):
         if isinstance(response, Response) and response.content_type == response.default_content_type:
             response.content_type = 'application/xml'
 
-        templates = TemplateLookup(
-            directories=[self.template_dir],
-            output_encoding='utf-8',
-            input_encoding='utf-8'
-        )
+        templates = get_template_lookup(self.template_dir)
         template = templates.get_template('getegrid.xml')
         try:
             content = template.render(**{
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import threading
+
+import numpy as np
+from pyramid.config import ConfigurationError
+
+from pyramid_oereb.lib.config import Config
+
+
+log = logging.getLogger(__name__)
+
+
+def _default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError('Object of type {0} is not JSON serializable'.format(value.__class__.__name__))
+
+
+class JsonBackend(object):
+    """
+    JSON backend used to serialize the JSON responses. Besides the JSON types it serializes numpy arrays,
+    e.g. the coordinates of the geometries. It uses the json module of the standard library, subclasses
+    override :meth:`dumps` to use a faster module.
+    """
+
+    name = 'json'
+    """str: The name of the backend used in the configuration."""
+
+    module = 'json'
+    """str: The name of the module needed by the backend."""
+
+    @classmethod
+    def available(cls):
+        """
+        Returns:
+            bool: True if the module needed by the backend is installed.
+        """
+        try:
+            __import__(cls.module)
+        except ImportError:
+            return False
+        return True
+
+    def dumps(self, value):
+        """
+        Serializes a value to JSON.
+
+        Args:
+            value (dict or list): The value to be serialized.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON.
+        """
+        return json.dumps(value, default=_default).encode('utf-8')
+
+
+class OrjsonJsonBackend(JsonBackend):
+    """
+    Serializes using `orjson <https://github.com/ijl/orjson>`__, which writes numpy arrays straight from
+    their buffer.
+    """
+
+    name = 'orjson'
+    module = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._dumps = orjson.dumps
+        self._option = orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, value):
+        return self._dumps(value, default=_default, option=self._option)
+
+
+class RapidjsonJsonBackend(JsonBackend):
+    """
+    Serializes using `python-rapidjson <https://github.com/python-rapidjson/python-rapidjson>`__.
+    """
+
+    name = 'rapidjson'
+    module = 'rapidjson'
+
+    def __init__(self):
+        import rapidjson
+        self._dumps = rapidjson.dumps
+
+    def dumps(self, value):
+        return self._dumps(value, default=_default).encode('utf-8')
+
+
+JSON_BACKENDS = [OrjsonJsonBackend, RapidjsonJsonBackend, JsonBackend]
+"""list of type: The JSON backends in the order of preference."""
+
+_json_backends = dict()
+_json_backends_lock = threading.Lock()
+
+
+def create_json_backend(name=None):
+    """
+    Creates a JSON backend.
+
+    Args:
+        name (str or None): The name of the backend. The first installed backend of :attr:`JSON_BACKENDS` is
+            used if it is None.
+
+    Returns:
+        JsonBackend: The JSON backend.
+
+    Raises:
+        pyramid.config.ConfigurationError: The backend is unknown or its module is not installed.
+    """
+    for backend in JSON_BACKENDS:
+        if name is None and backend.available() or backend.name == name:
+            if not backend.available():
+                raise ConfigurationError('The package "{0}" is needed to use the JSON backend "{1}".'.format(
+                    backend.module, backend.name))
+            return backend()
+    raise ConfigurationError('Unknown JSON backend "{0}", use one of: {1}'.format(
+        name, ', '.join(backend.name for backend in JSON_BACKENDS)))
+
+
+def get_json_backend():
+    """
+    Returns the process wide JSON backend configured in "json_backend".
+
+    Returns:
+        JsonBackend: The JSON backend.
+    """
+    name = Config.get('json_backend')
+    json_backend = _json_backends.get(name)
+    if json_backend is None:
+        with _json_backends_lock:
+            json_backend = _json_backends.get(name)
+            if json_backend is None:
+                json_backend = create_json_backend(name)
+                log.debug('Using the JSON backend "{0}"'.format(json_backend.name))
+                _json_backends[name] = json_backend
+    return json_backend
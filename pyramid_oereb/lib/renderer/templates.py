@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+import logging
+import optparse
+import os
+import threading
+
+from mako.lookup import TemplateLookup
+from pyramid.path import AssetResolver
+
+from pyramid_oereb.lib.config import Config
+
+
+log = logging.getLogger(__name__)
+
+TEMPLATE_DIRECTORIES = [
+    'lib/renderer/capabilities/templates/xml',
+    'lib/renderer/extract/templates/xml',
+    'lib/renderer/getegrid/templates/xml',
+    'lib/renderer/versions/templates/xml',
+    'standard/templates'
+]
+"""list of str: The template directories of pyramid_oereb (relative to the package)."""
+
+TEMPLATE_EXTENSION = '.xml'
+"""str: The extension of the templates which are rendered using a template lookup."""
+
+_template_lookups = dict()
+_template_lookups_lock = threading.Lock()
+
+
+def _resolve(template_dir):
+    return os.path.normpath(AssetResolver('pyramid_oereb').resolve(template_dir).abspath())
+
+
+def _module_sub_directory(path):
+    package_path = _resolve('')
+    if os.path.commonpath([package_path, path]) == package_path:
+        return os.path.relpath(path, package_path)
+    # Template directories outside of the package, e.g. of a renderer subclass
+    return os.path.join('external', *os.path.splitdrive(path)[1].split(os.sep))
+
+
+def create_template_lookup(template_dir, module_directory=None):
+    """
+    Creates a template lookup for a template directory.
+
+    Args:
+        template_dir (str): The template directory, either absolute or relative to the package.
+        module_directory (str or None): The directory to write the compiled template modules to. The
+            modules of each template directory of the package are written to a sub directory of the same
+            relative path, the ones of other template directories to a sub directory of "external" with
+            their absolute path. They are only kept in memory if it is None.
+
+    Returns:
+        mako.lookup.TemplateLookup: The template lookup.
+    """
+    path = _resolve(template_dir)
+    if module_directory is not None:
+        module_directory = os.path.join(module_directory, _module_sub_directory(path))
+    return TemplateLookup(
+        directories=[path],
+        module_directory=module_directory,
+        output_encoding='utf-8',
+        input_encoding='utf-8',
+        # The templates are part of the package and do not change while the application is running
+        filesystem_checks=False
+    )
+
+
+def get_template_lookup(template_dir):
+    """
+    Returns the process wide template lookup of a template directory. The lookup keeps the compiled
+    templates, so each template is compiled (or loaded from the configured "template_module_directory")
+    only once per process. The lookups are kept per absolute path, so renderers using their own template
+    directory (e.g. subclasses setting `template_dir`) get their own lookup.
+
+    Args:
+        template_dir (str): The template directory, either absolute (like the `template_dir` of the
+            renderers) or relative to the package (like :attr:`TEMPLATE_DIRECTORIES`).
+
+    Returns:
+        mako.lookup.TemplateLookup: The template lookup.
+    """
+    path = _resolve(template_dir)
+    template_lookup = _template_lookups.get(path)
+    if template_lookup is None:
+        with _template_lookups_lock:
+            template_lookup = _template_lookups.get(path)
+            if template_lookup is None:
+                template_lookup = create_template_lookup(
+                    path,
+                    Config.get('template_module_directory')
+                )
+                _template_lookups[path] = template_lookup
+    return template_lookup
+
+
+def get_template_names(template_dir):
+    """
+    Returns the names of all templates of a template directory, including the ones in sub directories.
+
+    Args:
+        template_dir (str): The template directory, either absolute or relative to the package.
+
+    Returns:
+        list of str: The template names as used in the template lookup.
+    """
+    path = _resolve(template_dir)
+    names = list()
+    for directory, sub_directories, files in os.walk(path):
+        sub_directories.sort()
+        for name in sorted(files):
+            if name.endswith(TEMPLATE_EXTENSION):
+                relative = os.path.relpath(os.path.join(directory, name), path)
+                names.append('/'.join(relative.split(os.sep)))
+    return names
+
+
+def compile_templates(template_lookups):
+    """
+    Compiles all templates of the passed template lookups.
+
+    Args:
+        template_lookups (dict): The template lookups by their template directory.
+
+    Returns:
+        int: The number of compiled templates.
+    """
+    count = 0
+    for template_dir, template_lookup in template_lookups.items():
+        for name in get_template_names(template_dir):
+            template_lookup.get_template(name)
+            count += 1
+    return count
+
+
+def init_template_lookups():
+    """
+    Creates the process wide template lookups and compiles all templates in advance, so the first requests
+    do not have to. This is done by the includeme of the application.
+    """
+    count = compile_templates(dict(
+        (template_dir, get_template_lookup(template_dir)) for template_dir in TEMPLATE_DIRECTORIES
+    ))
+    log.debug('Compiled {0} templates'.format(count))
+
+
+def precompile_templates():
+    parser = optparse.OptionParser(
+        usage='usage: %prog [options]',
+        description='Compile all templates to python modules in advance, e.g. while building an image. Use '
+                    'the same directory as "template_module_directory" in the configuration.'
+    )
+    parser.add_option(
+        '-d', '--directory',
+        dest='directory',
+        metavar='DIRECTORY',
+        type='string',
+        help='The directory to write the compiled template modules to.'
+    )
+    options, args = parser.parse_args()
+    if not options.directory:
+        parser.error('No directory set.')
+    count = compile_templates(dict(
+        (template_dir, create_template_lookup(template_dir, options.directory))
+        for template_dir in TEMPLATE_DIRECTORIES
+    ))
+    print('Compiled {0} templates to {1}'.format(count, options.directory))
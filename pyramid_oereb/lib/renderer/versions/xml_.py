@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
-from mako.lookup import TemplateLookup
 from pyramid.path import AssetResolver
 
 from pyramid.response import Response
 
 from pyramid_oereb.lib.renderer import Base
+from pyramid_oereb.lib.renderer.templates import get_template_lookup
 from mako import exceptions
 
 
@@ -53,11 +53,7 @@ class Renderer(Base):
         Returns:
             str: The XML encoded versions data.
         """
-        templates = TemplateLookup(
-            directories=[self.template_dir],
-            output_encoding='utf-8',
-            input_encoding='utf-8'
-        )
+        templates = get_template_lookup(self.template_dir)
         template = templates.get_template('versions.xml')
         content = template.render(**{
             'data': value
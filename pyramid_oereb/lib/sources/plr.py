@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
+import copy
 import logging
+from collections import OrderedDict
+
+from sqlalchemy import union_all
 
 from pyramid_oereb.lib.records.documents import DocumentRecord, ArticleRecord
 from pyramid_oereb.lib.records.embeddable import DatasourceRecord
@@ -38,6 +42,7 @@ class PlrBaseSource(Base):
     _datasource_record_class = DatasourceRecord
 
     datasource = list()
+    _combined_result_ = None
 
     def __init__(self, **kwargs):
         """
@@ -70,6 +75,64 @@ class PlrBaseSource(Base):
         """
         return self._plr_info
 
+    def create_read_context(self):
+        """
+        Creates a lightweight copy of this source which can be used to process exactly one request. The copy
+        shares the static state of the source (configuration, availabilities, data sources, models) but owns
+        all the state which is changed while reading. This way one source instance can be created once per
+        process and be shared between concurrent requests.
+
+        .. note:: If you subclass this class and your implementation keeps additional state while reading,
+            you have to override this method and reset this state on the returned copy.
+
+        Returns:
+            PlrBaseSource: The request scoped copy of this source.
+        """
+        context = copy.copy(self)
+        context.records = list()
+        context._combined_result_ = None
+        return context
+
+    @property
+    def data_version(self):
+        """
+        The version of the data of this topic. It is part of the key of cached extracts (see
+        :class:`pyramid_oereb.lib.cache.ExtractCache`), so it has to change on every update of the topic
+        data. Sources which can not provide a version return None, which is the default. Cached extracts
+        using such a topic are only renewed after the configured time to live.
+
+        Returns:
+            object: A hashable and comparable representation of the data version or None.
+        """
+        return None
+
+    def get_combined_selects(self, real_estate, bbox):
+        """
+        Returns the selects used to read this topic together with all other topics sharing the same database
+        connection in one single query (see :func:`read_combined`). Every select has to return the columns
+        `topic`, `plr_id`, `type_code` and `view_service_id` as text. Sources which can not be read this way
+        return None, which is the default.
+
+        Args:
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real estate which is
+                used as filter to find all related public law restrictions.
+            bbox (shapely.geometry.base.BaseGeometry): The bounding box of the visible extent.
+
+        Returns:
+            list of sqlalchemy.sql.expression.Select or None: The selects for this topic.
+        """
+        return None
+
+    def set_combined_result(self, rows):
+        """
+        Stores the rows of the combined query belonging to this topic. The following call of
+        :meth:`read` uses them instead of querying the topic again.
+
+        Args:
+            rows (list): The rows of the combined query with the topic code of this source.
+        """
+        self._combined_result_ = rows
+
     def read(self, params, real_estate, bbox, position=None):
         """
         Every public law restriction source has to implement a read method. This method must accept the two
@@ -87,3 +150,36 @@ class PlrBaseSource(Base):
             position (int or None): relative position of the plr (within a list of plrs)
         """
         self.records = list()
+
+
+def read_combined(plr_sources, real_estate, bbox):
+    """
+    Queries all plr sources sharing the same database connection in one single `UNION ALL` query. The
+    found rows are passed to the sources, which only need to load the related public law restrictions
+    and legend entries afterwards. Sources which do not support the combined read are left untouched.
+
+    Args:
+        plr_sources (list of PlrBaseSource): The request scoped plr sources to read.
+        real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real estate which is
+            used as filter to find all related public law restrictions.
+        bbox (shapely.geometry.base.BaseGeometry): The bounding box of the visible extent.
+    """
+    groups = OrderedDict()
+    for plr_source in plr_sources:
+        selects = plr_source.get_combined_selects(real_estate, bbox)
+        if selects is not None:
+            groups.setdefault(plr_source._key_, list()).append((plr_source, selects))
+
+    for key, group in groups.items():
+        selects = [select for plr_source, topic_selects in group for select in topic_selects]
+        session = group[0][0]._adapter_.get_session(key)
+        try:
+            rows = session.execute(union_all(*selects)).fetchall()
+        finally:
+            session.close()
+        log.debug("read_combined() found {} rows for {} topics".format(len(rows), len(group)))
+        rows_by_topic = dict()
+        for row in rows:
+            rows_by_topic.setdefault(row.topic, list()).append(row)
+        for plr_source, topic_selects in group:
+            plr_source.set_combined_result(rows_by_topic.get(plr_source.info.get('code'), list()))
@@ -2,7 +2,8 @@
 
 import base64
 from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qs, urlparse
-from urllib.request import urlopen
+
+from pyramid_oereb.lib.download import download_document, download_documents
 
 
 def parse_url(url):
@@ -67,7 +68,8 @@ def uri_validator(url):
 
 def url_to_base64(url):
     """
-    Request the document at the given url and return it as a base64 document.
+    Request the document at the given url and return it as a base64 document. The document is downloaded
+    using the shared session and the configured document cache.
 
     Args:
         url (str): url to request and deliver as base64 document.
@@ -80,17 +82,35 @@ def url_to_base64(url):
         AttributeError: Raised if the URL itself isn't valid at all.
 
     """
-    response = None
     if url is None:
         return None
-    if uri_validator(url):
-        response = urlopen(url)
-        if response.getcode() != 200:
-            dedicated_msg = "The url could not be downloaded. URL was: {url}, Response was " \
-                            "{response}".format(url=url, response=response.read())
-            raise LookupError(dedicated_msg)
-    else:
+    _validate_document_url(url)
+    return base64.b64encode(download_document(url))
+
+
+def urls_to_base64(urls):
+    """
+    Requests the documents at the given urls concurrently and returns them as base64 documents. Each url is
+    requested only once.
+
+    Args:
+        urls (list of str): The urls to request and deliver as base64 documents. Empty urls are skipped.
+
+    Returns:
+        dict: The documents as base64 string by their url.
+
+    Raises:
+        LookupError: Raised if a response is not code 200.
+        AttributeError: Raised if an URL itself isn't valid at all.
+    """
+    urls = [url for url in urls if url is not None]
+    for url in urls:
+        _validate_document_url(url)
+    documents = download_documents(urls)
+    return dict((url, base64.b64encode(content)) for url, content in documents.items())
+
+
+def _validate_document_url(url):
+    if not uri_validator(url):
         dedicated_msg = "URL seems to be not valid. URL was: {url}".format(url=url)
         raise AttributeError(dedicated_msg)
-
-    return base64.b64encode(response.read())
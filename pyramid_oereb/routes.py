@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from pyramid_oereb import route_prefix
-from pyramid_oereb.views.webservice import PlrWebservice, Symbol, Logo, Municipality, Sld
+from pyramid_oereb.views.webservice import PlrWebservice, Symbol, Logo, Municipality, Sld, PrintJob
 from pyramid_oereb.contrib.stats.decorators import log_response
 
 
@@ -253,5 +253,13 @@ def includeme(config):  # pragma: no cover
         decorator=log_response
     )
 
+    # Services for asynchronous print jobs
+    config.add_route('{0}/print_job/status'.format(route_prefix), '/print_job/{job_id}/status')
+    config.add_view(PrintJob, attr='get_status', route_name='{0}/print_job/status'.format(route_prefix),
+                    request_method='GET', decorator=log_response)
+    config.add_route('{0}/print_job/report'.format(route_prefix), '/print_job/{job_id}/report')
+    config.add_view(PrintJob, attr='get_report', route_name='{0}/print_job/report'.format(route_prefix),
+                    request_method='GET', decorator=log_response)
+
     # Commit config
     config.commit()
@@ -3,21 +3,49 @@ import datetime
 import logging
 
 from mako import exceptions
-from mako.template import Template
 from pyramid.httpexceptions import HTTPNotFound
-from pyramid.path import AssetResolver, DottedNameResolver
+from pyramid.path import DottedNameResolver
 from pyramid.response import Response
 from sqlalchemy import cast, Text
+from webob.etag import ETagMatcher
 
 from pyramid_oereb import Config, database_adapter, route_prefix
-from pyramid_oereb.lib import b64
+from pyramid_oereb.lib import b64, processor
 from pyramid_oereb.lib.records.image import ImageRecord
 from pyramid_oereb.lib.records.office import OfficeRecord
+from pyramid_oereb.lib.renderer.templates import get_template_lookup
+from pyramid_oereb.standard.sources.plr import DatabaseSource
 
 
 log = logging.getLogger(__name__)
 
 
+def get_image_response(request, image):
+    """
+    Returns the response delivering an image. The response has a strong ETag and may be cached for the
+    configured "image_max_age" (seconds). If the client already has the image, indicated by a matching
+    If-None-Match header, the response has the status 304 and no body.
+
+    Args:
+        request (pyramid.request.Request): The current request instance.
+        image (pyramid_oereb.lib.records.image.ImageRecord): The image to deliver.
+
+    Returns:
+        pyramid.response.Response: The generated response object.
+    """
+    response = request.response
+    response.etag = image.etag
+    response.cache_control = 'public, max-age={0}'.format(Config.get('image_max_age', 3600))
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and image.etag in ETagMatcher.parse(if_none_match):
+        response.status_int = 304
+        return response
+    response.status_int = 200
+    response.body = image.content
+    response.content_type = image.mimetype
+    return response
+
+
 def get_logo(request):
     """
     Returns the requested logo.
@@ -32,11 +60,7 @@ def get_logo(request):
     logo_language = request.matchdict.get('language')
     if logo_key in Config.get('logo').keys():
         logo = Config.get_logo_config(language=logo_language).get(logo_key)
-        response = request.response
-        response.status_int = 200
-        response.body = logo.content
-        response.content_type = logo.mimetype
-        return response
+        return get_image_response(request, logo)
     raise HTTPNotFound('This logo does not exist.')
 
 
@@ -59,11 +83,7 @@ def get_municipality(request):
         if municipality:
             logo = getattr(municipality, 'logo', None)
             if logo:
-                response = request.response
-                response.status_int = 200
-                response.body = b64.decode(logo)
-                response.content_type = ImageRecord.get_mimetype(bytearray(response.body))
-                return response
+                return get_image_response(request, ImageRecord(b64.decode(logo)))
         raise HTTPNotFound()
     finally:
         session.close()
@@ -71,7 +91,10 @@ def get_municipality(request):
 
 def get_symbol(request):
     """
-    Returns the symbol for the requested theme and type code from database.
+    Returns the symbol for the requested theme and type code. It is taken from the symbol store of the
+    application scoped source of the topic (see
+    :meth:`pyramid_oereb.standard.sources.plr.DatabaseSource.get_symbol`) or, if there is none, read from the
+    database.
 
     Args:
         request (pyramid.request.Request): The request containing the codes as matchdict parameters.
@@ -93,6 +116,14 @@ def get_symbol(request):
     if plr is None:
         raise HTTPNotFound('No theme with code {}.'.format(theme_code))
 
+    if processor.processor_factory is not None:
+        for plr_source in processor.processor_factory.plr_sources:
+            if isinstance(plr_source, DatabaseSource) and plr_source.info.get('code') == plr.get('code'):
+                symbol = plr_source.get_symbol(view_service_id, type_code)
+                if symbol is None:
+                    raise HTTPNotFound()
+                return get_image_response(request, symbol)
+
     source_params = plr.get('source').get('params')
     session = database_adapter.get_session(source_params.get('db_connection'))
 
@@ -109,11 +140,7 @@ def get_symbol(request):
         if legend_entry:
             symbol = getattr(legend_entry, 'symbol', None)
             if symbol:
-                response = request.response
-                response.status_int = 200
-                response.body = b64.decode(symbol)
-                response.content_type = ImageRecord.get_mimetype(bytearray(response.body))
-                return response
+                return get_image_response(request, ImageRecord(b64.decode(symbol)))
         raise HTTPNotFound()
 
     finally:
@@ -194,11 +221,7 @@ def produce_sld_content(request):
         pyramid.response.Response: The
     """
     response = request.response
-    template = Template(
-        filename=AssetResolver('pyramid_oereb').resolve('standard/templates/sld.xml').abspath(),
-        input_encoding='utf-8',
-        output_encoding='utf-8'
-    )
+    template = get_template_lookup('standard/templates').get_template('sld.xml')
     layer = Config.get_real_estate_config().get('visualisation').get('layer')
     template_params = {}
     template_params.update(Config.get_real_estate_config().get('visualisation').get('style'))
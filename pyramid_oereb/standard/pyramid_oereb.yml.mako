@@ -119,10 +119,44 @@ pyramid_oereb:
     group_legal_provisions: false
     # Will make an estimation of the total length of the Table of Content (TOC) and control that the page
     # numbering in the output pdf is consistent with TOC numbering. If it is known that the TOC is very long and
-    # could run over more than one page, it is preferred to set this to true. The drawback is that it might need
-    # more time to generate the PDF. If set to false, it will assume that only one TOC page exists, and this can
-    # lead to wrong numbering in the TOC.
+    # could run over more than one page, it is preferred to set this to true. The estimation measures the
+    # wrapped texts with font metrics and does not need an additional print job. A wrong estimation is logged
+    # as warning. If set to false, it will assume that only one TOC page exists, and this can lead to wrong
+    # numbering in the TOC.
     compute_toc_pages: true
+    # Calibration of the TOC estimation per print template and language. The values override the layout
+    # pyramid_oereb.contrib.print_proxy.toc_pages.DEFAULT_LAYOUT (sizes in points).
+    # toc_layouts:
+    #   A4 portrait:
+    #     toc_item:
+    #       width: 430
+    #     languages:
+    #       fr:
+    #         general_information:
+    #           text:
+    #             width: 380
+    # Print the TOC as separate job with this template and insert it after the page "toc_insert_after_page"
+    # (default 1) of the extract. The main template has to hide its TOC if the attribute "Display_TOC" is
+    # false. Only the small TOC job is printed again if the estimated number of TOC pages was wrong.
+    # toc_template_name: A4 portrait TOC
+    # toc_insert_after_page: 1
+    # Print the extracts as background jobs using the report API of MapFish print, so the web server workers
+    # are not blocked while printing. With the parameter "async=true" a PDF request returns the state of its
+    # job immediately (status 202), which contains the URLs to poll its status and to download the PDF
+    # ("/print_job/{id}/status" and "/print_job/{id}/report"). Requests without the parameter wait for their
+    # job. The state and the result of the jobs are stored in "directory" (shared by all processes of a server)
+    # for "ttl" seconds. Each print backend processes "max_jobs_per_backend" jobs concurrently and queues up
+    # to "max_queued_jobs" further jobs, additional requests are rejected with status 503. "poll_interval"
+    # and "timeout" (seconds) control the polling of the print service, each single request to the print
+    # service fails after "request_timeout" seconds. Disabled by default.
+    # jobs:
+    #   directory: /var/cache/pyramid_oereb/print_jobs
+    #   ttl: 3600
+    #   max_jobs_per_backend: 2
+    #   max_queued_jobs: 20
+    #   poll_interval: 0.5
+    #   timeout: 300
+    #   request_timeout: 30
     # Specify any additional URL parameters that the print shall use for WMS calls
     wms_url_params:
       TRANSPARENT: 'true'
@@ -147,11 +181,59 @@ pyramid_oereb:
     db_connection: &main_db_connection
       ${sqlalchemy_url}
 
+  # The PLR sources read the availabilities, data sources and emptiness of their topic once and keep them in
+  # memory. They check the data version of the topic (the data integration table, which is updated on every
+  # import) at most once per interval (in seconds) and reload this state only if it changed. Set it to null to
+  # never check again after the start of the application.
+  data_version_check_interval: 60
+
+  # The logos, municipality logos and symbols are delivered with a strong ETag, so clients can revalidate them
+  # using the If-None-Match header. Clients and proxies may use them without revalidation for this time (in
+  # seconds).
+  image_max_age: 3600
+
+  # The templates of the XML responses are compiled to python modules once per process, when the application
+  # starts. Optionally the compiled modules are written to this directory, so other processes and restarted
+  # ones load them instead of compiling the templates again. Use the "precompile_templates" script to compile
+  # them in advance, e.g. while building an image.
+  # template_module_directory: /var/cache/pyramid_oereb/templates
+
+  # The JSON responses are serialized by the first installed package of orjson, rapidjson and the json module
+  # of the standard library. Set one of "orjson", "rapidjson" or "json" to use it instead.
+  # json_backend: orjson
+
+  # Serialize the restrictions on landownership of the JSON extracts one after another while the response is
+  # sent, instead of the whole extract at once. This keeps the memory usage low for extracts with large
+  # geometries, but the response has no Content-Length header.
+  json_streaming: false
+
+  # Render the restrictions on landownership of the XML extracts one after another while the response is sent,
+  # instead of the whole extract at once. This keeps the memory usage low for extracts with large geometries,
+  # but the response has no Content-Length header and errors while rendering a restriction on landownership
+  # abort the already started response instead of returning an error status.
+  xml_streaming: false
+
   # Define the SRID which your server is representing. Note: Only one projection system is possible in the
   # application. It does not provide any reprojection nor data in different projection systems. Take care in
   # your importing process!
   srid: 2056
 
+  # The number of decimals of the coordinates written to the XML and JSON extracts per SRID. The coordinates
+  # of SRIDs which are not listed are written with full precision, which is the default. Millimetres are
+  # sufficient for LV95 and LV03 and shorten the responses.
+  # coordinate_precision:
+  #   2056: 3
+  #   21781: 3
+
+  # Extracts with geometry can be requested with generalized geometries of the public law restrictions by adding
+  # the GENERALIZE parameter, e.g. for web viewers drawing the restrictions. The geometries are clipped to the
+  # real estate, simplified with the tolerance (in the unit of the coordinates) and their coordinates are
+  # written with the number of decimals set in precision.
+  geometry_generalization:
+    clip: true
+    simplify_tolerance: 0.1
+    precision: 2
+
   # definition of the available geometry types for different checks
   geometry_types:
     point:
@@ -174,6 +256,43 @@ pyramid_oereb:
   # Configuration option for full extract: apply SLD on land register WMS (defaults to true)
   full_extract_use_sld: true
 
+  # The WMS images of an extract (the maps of the parameter WITHIMAGES and the highlight of the full extract)
+  # are downloaded concurrently over one pooled HTTP session per process. Identical URLs are downloaded only
+  # once. "max_workers" is the number of parallel downloads of a process, "max_connections_per_host" limits
+  # the connections to one WMS server. Each download times out after "timeout" seconds and is retried
+  # "retries" times on connection errors and the status codes 502, 503 and 504.
+  image_download:
+    max_workers: 8
+    max_connections_per_host: 4
+    timeout: 30
+    retries: 2
+    # Cache the downloaded images. The key of an image is its normalized URL and, if
+    # "invalidate_on_data_change" is set, the data version of its topic. Identical images are stored only
+    # once. The least recently used images are evicted if the cache exceeds "max_size" (bytes). "ttl" is the
+    # maximum age of an image in seconds, "host_ttl" overrides it per WMS host. Available are:
+    # - pyramid_oereb.lib.cache.MemoryImageCache, in the memory of each process
+    # - pyramid_oereb.lib.cache.DiskImageCache (additional param: directory), shared by all processes of a
+    #   server
+    # Disabled by default.
+    # cache:
+    #   class: pyramid_oereb.lib.cache.MemoryImageCache
+    #   params:
+    #     max_size: 67108864
+    #     ttl: 3600
+    #     host_ttl:
+    #       wms.geo.admin.ch: 86400
+    #     invalidate_on_data_change: true
+
+  # The documents of the legal provisions embedded in the full extract ("Base64TextAtWeb") are downloaded
+  # concurrently using the "image_download" settings. Optionally they are cached in a directory shared by all
+  # processes of a server. A cached document is used without request for "ttl" seconds, afterwards it is
+  # revalidated using its ETag or Last-Modified header. The oldest documents are evicted if the cache exceeds
+  # "max_entries". Disabled by default.
+  # document_cache:
+  #   directory: /var/cache/pyramid_oereb/documents
+  #   max_entries: 1000
+  #   ttl: 3600
+
   # Configuration for OEREBlex
   oereblex:
     # OEREBlex host
@@ -413,6 +532,34 @@ pyramid_oereb:
     sort_within_themes_method: pyramid_oereb.standard.hook_methods.plr_sort_within_themes
     # Example of a specific sorting method:
     # sort_within_themes_method: pyramid_oereb.contrib.plr_sort_within_themes_by_type_code
+    # Query all topics sharing the same database connection ("db_connection") together in one single query
+    # instead of two to three queries per topic. Only the topics with related public law restrictions are
+    # queried again to load them and their legend entries.
+    combined_plr_read: False
+    # Read the PLR sources of one extract concurrently in a bounded thread pool. The extract then takes about
+    # as long as the slowest topic instead of the sum of all topics. "max_workers" is the size of the thread
+    # pool shared by all requests of a process, "max_workers_per_connection" limits the number of topics read
+    # at the same time over the same database connection and should be smaller than its connection pool.
+    # The records are always merged in the order of the configured themes. Disabled by default.
+    # concurrent_plr_read:
+    #   max_workers: 8
+    #   max_workers_per_connection: 4
+    # Cache the processed extracts to deliver repeatedly requested extracts without processing them again.
+    # The key of a cached extract contains all request parameters and the data versions of all topics, so a
+    # new import of a topic invalidates the cached extracts. Each extract delivered from the cache gets a new
+    # identifier and creation date. "ttl" is the maximum age of a cached extract in seconds. Available are:
+    # - pyramid_oereb.lib.cache.MemoryExtractCache (params: max_entries, ttl), least recently used cache in
+    #   the memory of each process
+    # - pyramid_oereb.lib.cache.DiskExtractCache (params: directory, max_entries, ttl), shared by all
+    #   processes of a server
+    # - pyramid_oereb.lib.cache.RedisExtractCache (params: url, ttl, prefix), shared by several servers,
+    #   needs the package "redis"
+    # Disabled by default.
+    # cache:
+    #   class: pyramid_oereb.lib.cache.MemoryExtractCache
+    #   params:
+    #     max_entries: 100
+    #     ttl: 300
 
   # All PLRs which are provided by this application. This is related to all application behaviour, especially
   # the extract creation process which loops over this list.
@@ -451,6 +598,14 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.land_use_plans
+          # The strategy to load the relations of the public law restrictions: "lazy" loads every
+          # relation on access, "selectin" loads them in one additional query per relation and "joined"
+          # loads everything in one single query.
+          loading_strategy: selectin
+          # Compute the length, area and number of points of the intersections with the real estate in
+          # the database instead of loading all the geometries. The geometries are only loaded if the
+          # extract is requested with geometries.
+          # server_side_measures: true
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -489,6 +644,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.motorways_project_planing_zones
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -527,6 +683,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.motorways_building_lines
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -565,6 +722,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.railways_building_lines
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -603,6 +761,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.railways_project_planning_zones
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -641,6 +800,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.airports_project_planning_zones
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -679,6 +839,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.airports_building_lines
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -717,6 +878,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.airports_security_zone_plans
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -756,6 +918,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.contaminated_sites
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -794,6 +957,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.contaminated_military_sites
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -832,6 +996,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.contaminated_civil_aviation_sites
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -870,6 +1035,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.contaminated_public_transport_sites
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -918,6 +1084,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.groundwater_protection_zones
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -956,6 +1123,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.groundwater_protection_sites
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -994,6 +1162,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.noise_sensitivity_levels
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -1032,6 +1201,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.forest_perimeters
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
@@ -1070,6 +1240,7 @@ pyramid_oereb:
         params:
           db_connection: *main_db_connection
           models: pyramid_oereb.standard.models.forest_distance_lines
+          loading_strategy: selectin
       hooks:
         get_symbol: pyramid_oereb.standard.hook_methods.get_symbol
         get_symbol_ref: pyramid_oereb.standard.hook_methods.get_symbol_ref
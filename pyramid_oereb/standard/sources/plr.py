@@ -1,16 +1,21 @@
 # -*- coding: utf-8 -*-
 import logging
+import time
 
 from geoalchemy2.shape import to_shape, from_shape
+from pyramid.config import ConfigurationError
 from pyramid.path import DottedNameResolver
 from shapely.geometry import Point, LineString, Polygon, MultiPoint, MultiLineString, MultiPolygon, \
     GeometryCollection
-from sqlalchemy import text, or_, and_
+from sqlalchemy import or_, and_, select, literal, literal_column, cast, null, func, case, bindparam, \
+    Boolean, LargeBinary, Text
+from sqlalchemy.orm import defer, joinedload
 
 from pyramid_oereb import Config
 from pyramid_oereb.lib import b64
 from pyramid_oereb.lib.records.availability import AvailabilityRecord
 from pyramid_oereb.lib.records.embeddable import DatasourceRecord
+from pyramid_oereb.lib.records.geometry import IntersectionMeasuresRecord
 from pyramid_oereb.lib.records.image import ImageRecord
 from pyramid_oereb.lib.records.law_status import LawStatusRecord
 from pyramid_oereb.lib.records.office import OfficeRecord
@@ -23,6 +28,9 @@ log = logging.getLogger(__name__)
 
 
 class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
+    _measured_geometries_ = None
+    _legend_symbols_ = None
+
     def __init__(self, **kwargs):
         """
         Keyword Arguments:
@@ -53,40 +61,193 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
         BaseDatabaseSource.__init__(self, **bds_kwargs)
         PlrBaseSource.__init__(self, **kwargs)
 
+        self._server_side_measures_ = kwargs.get('source').get('params').get('server_side_measures', False)
+        loading_strategy = kwargs.get('source').get('params').get('loading_strategy', 'lazy')
+        if loading_strategy == 'lazy':
+            self._plr_loader_options_ = []
+        elif loading_strategy in ['selectin', 'joined']:
+            loader_options = DottedNameResolver().maybe_resolve(
+                '{models_path}.public_law_restriction_loader_options'.format(models_path=models_path)
+            )
+            self._plr_loader_options_ = loader_options(
+                loading_strategy,
+                geometries=not self._server_side_measures_
+            )
+        else:
+            raise ConfigurationError(
+                'Unknown loading strategy "{strategy}" for topic {topic}. Possible values are "lazy", '
+                '"selectin" and "joined".'.format(strategy=loading_strategy, topic=kwargs.get('code'))
+            )
+
         self.legend_entry_model = DottedNameResolver().maybe_resolve(
             '{models_path}.LegendEntry'.format(models_path=models_path)
         )
-        availability_model = DottedNameResolver().maybe_resolve(
+        self._availability_model_ = DottedNameResolver().maybe_resolve(
             '{models_path}.Availability'.format(models_path=models_path)
         )
-        data_integration_model = DottedNameResolver().maybe_resolve(
+        self._data_integration_model_ = DottedNameResolver().maybe_resolve(
             '{models_path}.DataIntegration'.format(models_path=models_path)
         )
         self._theme_record = ThemeRecord(self._plr_info.get('code'), self._plr_info.get('text'))
 
+        # The state derived from the topic data is shared by reference with all read contexts and updated in
+        # place when the data version of the topic changes.
         self.availabilities = []
         self.datasource = []
+        self._data_state_ = {
+            'version': None,
+            'empty': False,
+            'checked': 0,
+            'symbols': None
+        }
 
         session = self._adapter_.get_session(self._key_)
-
         try:
+            self._load_data_state(session, self._read_data_version(session))
+        finally:
+            session.close()
 
-            availabilities_from_db = session.query(availability_model).all()
-            for availability in availabilities_from_db:
-                self.availabilities.append(
-                    AvailabilityRecord(availability.fosnr, available=availability.available)
-                )
+    def _read_data_version(self, session):
+        """
+        Reads the version of the topic data. It is made of the rows of the data integration table, which is
+        updated on every import of the topic (including the checksum written by the XTF importer).
+
+        Args:
+            session (sqlalchemy.orm.Session): The requested clean session instance ready for use
+
+        Returns:
+            tuple: The data version.
+        """
+        data_integration_model = self._data_integration_model_
+        return tuple(session.query(
+            data_integration_model.id,
+            data_integration_model.date,
+            data_integration_model.checksum
+        ).order_by(data_integration_model.id).all())
+
+    def _load_data_state(self, session, version):
+        """
+        Loads the availabilities, the data sources and the emptiness of the topic.
+
+        Args:
+            session (sqlalchemy.orm.Session): The requested clean session instance ready for use
+            version (tuple): The data version the state belongs to.
+        """
+        availabilities = []
+        for availability in session.query(self._availability_model_).all():
+            availabilities.append(
+                AvailabilityRecord(availability.fosnr, available=availability.available)
+            )
+
+        datasource = []
+        for source in session.query(self._data_integration_model_).all():
+            datasource.append(DatasourceRecord(
+                self._theme_record,
+                source.date,
+                OfficeRecord(source.office.name)
+            ))
+
+        self.availabilities[:] = availabilities
+        self.datasource[:] = datasource
+        self._data_state_['empty'] = session.query(self._model_.id).first() is None
+        self._data_state_['symbols'] = None
+        self._data_state_['version'] = version
+        self._data_state_['checked'] = time.time()
 
-            data_integration = session.query(data_integration_model).all()
-            for source in data_integration:
-                self.datasource.append(DatasourceRecord(
-                    self._theme_record,
-                    source.date,
-                    OfficeRecord(source.office.name)
+    def check_data_version(self):
+        """
+        Reloads the state derived from the topic data if its data version changed since the last check. The
+        data version is checked at most once per configured "data_version_check_interval" (seconds).
+        """
+        interval = Config.get('data_version_check_interval', 60)
+        if interval is None or time.time() - self._data_state_['checked'] < interval:
+            return
+        self._data_state_['checked'] = time.time()
+        session = self._adapter_.get_session(self._key_)
+        try:
+            version = self._read_data_version(session)
+            if version != self._data_state_['version']:
+                log.info('Data version of topic {} changed, reloading its state'.format(
+                    self._plr_info.get('code')
                 ))
+                self._load_data_state(session, version)
+        finally:
+            session.close()
+
+    @property
+    def data_version(self):
+        """
+        Returns:
+            tuple: The data version of the topic, i.e. the rows of its data integration table. It is checked
+            for changes before it is returned.
+        """
+        self.check_data_version()
+        return self._data_state_['version']
 
+    def get_symbol(self, view_service_id, type_code):
+        """
+        Returns the symbol of a legend entry from the symbol store of the topic. The store is kept in memory
+        and shared by all read contexts. It is loaded with all symbols of the topic on first use and again
+        after the data version of the topic changed.
+
+        Args:
+            view_service_id (str or int): The id of the view service of the legend entry.
+            type_code (str): The type code of the legend entry.
+
+        Returns:
+            pyramid_oereb.lib.records.image.ImageRecord or None: The symbol or None if there is no legend
+            entry with this view service and type code.
+        """
+        self.check_data_version()
+        symbols = self._data_state_['symbols']
+        if symbols is None:
+            version = self._data_state_['version']
+            symbols = self._read_symbols()
+            # Do not keep symbols which were read while the data version changed
+            if self._data_state_['version'] == version:
+                self._data_state_['symbols'] = symbols
+        return symbols.get((str(view_service_id), str(type_code)))
+
+    def _read_symbols(self):
+        """
+        Reads and decodes the symbols of all legend entries of the topic.
+
+        Returns:
+            dict: The symbols by view service id and type code (both as str).
+        """
+        model = self.legend_entry_model
+        session = self._adapter_.get_session(self._key_)
+        try:
+            rows = session.query(model.view_service_id, model.type_code, model.symbol).all()
         finally:
             session.close()
+        symbols = dict()
+        for view_service_id, type_code, symbol in rows:
+            key = (str(view_service_id), str(type_code))
+            if key not in symbols:
+                symbols[key] = ImageRecord(b64.decode(symbol))
+        log.debug('Read {} symbols of topic {}'.format(len(symbols), self._plr_info.get('code')))
+        return symbols
+
+    @property
+    def is_empty(self):
+        """
+        Returns:
+            bool: True if the topic contains no geometries at all.
+        """
+        return self._data_state_['empty']
+
+    def create_read_context(self):
+        """
+        Creates a request scoped copy of this source. The theme record is copied too, because its position
+        is set on each read.
+
+        Returns:
+            pyramid_oereb.standard.sources.plr.DatabaseSource: The request scoped copy of this source.
+        """
+        context = super(DatabaseSource, self).create_read_context()
+        context._theme_record = ThemeRecord(self._theme_record.code, self._theme_record.text)
+        return context
 
     def from_db_to_legend_entry_record(self, theme, legend_entries_from_db, public_law_restriction_from_db):
         legend_entry_records = []
@@ -94,7 +255,7 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
             # Filter legend by view service to deliver dedicated legend entries only
             if public_law_restriction_from_db.view_service_id == legend_entry_from_db.view_service_id:
                 legend_entry_records.append(self._legend_entry_record_class(
-                    ImageRecord(b64.decode(legend_entry_from_db.symbol)),
+                    self.from_db_to_symbol_record(legend_entry_from_db),
                     legend_entry_from_db.legend_text,
                     legend_entry_from_db.type_code,
                     legend_entry_from_db.type_code_list,
@@ -105,6 +266,27 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
                 ))
         return legend_entry_records
 
+    def from_db_to_symbol_record(self, legend_entry_from_db):
+        """
+        Decodes the symbol of a legend entry. While the records of the public law restrictions are created,
+        the symbol of each legend entry is decoded only once and the image record is shared by all legend
+        entry and public law restriction records using it, so its file type is sniffed only once too.
+
+        Args:
+            legend_entry_from_db (pyramid_oereb.standard.models.*.LegendEntry): The legend entry from the
+                database.
+
+        Returns:
+            pyramid_oereb.lib.records.image.ImageRecord: The symbol of the legend entry.
+        """
+        if self._legend_symbols_ is None:
+            return ImageRecord(b64.decode(legend_entry_from_db.symbol))
+        symbol = self._legend_symbols_.get(legend_entry_from_db.id)
+        if symbol is None:
+            symbol = ImageRecord(b64.decode(legend_entry_from_db.symbol))
+            self._legend_symbols_[legend_entry_from_db.id] = symbol
+        return symbol
+
     def from_db_to_view_service_record(self, view_service_from_db, legend_entry_records, theme):
         layer_index, layer_opacity = Config.get_layer_config(theme)
         view_service_record = self._view_service_record_class(
@@ -114,6 +296,8 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
             view_service_from_db.legend_at_web,
             legends=legend_entry_records
         )
+        # Cached images of the view service are invalidated by a new import of the topic
+        view_service_record.data_version = self._data_state_['version']
         return view_service_record
 
     def unwrap_multi_geometry_(self, law_status, published_from, multi_geom, geo_metadata, office):
@@ -321,7 +505,11 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
         )
 
         document_records = self.get_document_records(params, public_law_restriction_from_db)
-        geometry_records = self.from_db_to_geometry_records(public_law_restriction_from_db.geometries)
+        geometry_records = None
+        if self._measured_geometries_ is not None:
+            geometry_records = self._measured_geometries_.get(public_law_restriction_from_db.id)
+        if geometry_records is None:
+            geometry_records = self.from_db_to_geometry_records(public_law_restriction_from_db.geometries)
 
         basis_plr_records = []
         for join in public_law_restriction_from_db.basis:
@@ -381,67 +569,58 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
         """
         Decides the geometry collection cases of geometric filter operations when the database contains multi
         geometries but the passed geometry does not.
-        The multi geometry will be extracted to it's sub parts for operation.
+        The collection will be extracted to its point, line and polygon sub parts for operation. The passed
+        geometry is bound once as WKB parameter shared by the three extracts, so the statement does not
+        depend on the geometry itself.
 
         Args:
-            db_path (str): The point separated string of schema_name.table_name.column_name from
-                which we can construct a correct SQL statement.
+            db_path (str or sqlalchemy.sql.elements.ColumnElement): The geometry column or the point
+                separated string of schema_name.table_name.column_name from which we can construct a correct
+                SQL statement.
             real_estate_geometry (shapely.geometry.base.BaseGeometry): The shapely geometry
                 representation which is used for comparison.
 
         Returns:
             sqlalchemy.sql.elements.BooleanClauseList: The clause element.
-
-        Raises:
-            HTTPBadRequest
         """
-        srid = Config.get('srid')
-        sql_text_point = 'ST_Intersects(ST_CollectionExtract({0}, 1), ST_GeomFromText(\'{1}\', {2}))'.format(
-            db_path,
-            real_estate_geometry.wkt,
-            srid
-        )
-        sql_text_line = 'ST_Intersects(ST_CollectionExtract({0}, 2), ST_GeomFromText(\'{1}\', {2}))'.format(
-            db_path,
-            real_estate_geometry.wkt,
-            srid
+        if isinstance(db_path, str):
+            db_path = literal_column(db_path)
+        geometry = func.ST_GeomFromWKB(
+            bindparam('geometry', real_estate_geometry.wkb, type_=LargeBinary, unique=True),
+            Config.get('srid')
         )
-        sql_text_polygon = 'ST_Intersects(ST_CollectionExtract({0}, 3), ' \
-                           'ST_GeomFromText(\'{1}\', {2}))'.format(
-                                db_path,
-                                real_estate_geometry.wkt,
-                                srid
-                            )
-        clause_blocks = [
-            text(sql_text_point),
-            text(sql_text_line),
-            text(sql_text_polygon)
-        ]
-        return or_(*clause_blocks)
+        return or_(*[
+            func.ST_Intersects(func.ST_CollectionExtract(db_path, dimension), geometry, type_=Boolean)
+            for dimension in (1, 2, 3)
+        ])
 
-    def handle_collection(self, session, geometry_to_check):
+    def geometry_filter(self, geometry_to_check):
+        """
+        Creates the clause filtering the geometries of the topic which have spatial relation with the passed
+        geometry.
+
+        Args:
+            geometry_to_check (shapely.geometry.base.BaseGeometry): The geometry to check against.
+
+        Returns:
+            sqlalchemy.sql.elements.ClauseElement: The filter clause.
+        """
         geometry_types = Config.get('geometry_types')
         collection_types = geometry_types.get('collection').get('types')
         # Check for Geometry type, cause we can't handle geometry collections the same as specific geometries
         if self._plr_info.get('geometry_type') in [x.upper() for x in collection_types]:
 
             # The PLR is defined as a collection type. We need to do a special handling
-            query = session.query(self._model_).filter(
-                self.extract_geometry_collection_db(
-                    '{schema}.{table}.geom'.format(
-                        schema=self._model_.__table__.schema,
-                        table=self._model_.__table__.name
-                    ),
-                    geometry_to_check
-                )
-            )
+            return self.extract_geometry_collection_db(self._model_.geom, geometry_to_check)
 
         else:
             # The PLR is not problematic at all cause we do not have a collection type here
-            query = session.query(self._model_).filter(self._model_.geom.ST_Intersects(
+            return self._model_.geom.ST_Intersects(
                 from_shape(geometry_to_check, srid=Config.get('srid'))
-            ))
-        return query
+            )
+
+    def handle_collection(self, session, geometry_to_check):
+        return session.query(self._model_).filter(self.geometry_filter(geometry_to_check))
 
     def collect_related_geometries_by_real_estate(self, session, real_estate):
         """
@@ -487,6 +666,214 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
             or_(*distinct_type_code_view_service_tuples)
         ).all()
 
+    @property
+    def plr_model(self):
+        """
+        Returns:
+            sqlalchemy.ext.declarative.DeclarativeMeta: The public law restriction model of the topic.
+        """
+        return self._model_.public_law_restriction.property.mapper.class_
+
+    def collect_public_law_restrictions_by_ids(self, session, plr_ids):
+        """
+        Loads the public law restrictions with the passed ids in one query. Their relations are loaded
+        using the configured loading strategy of the topic.
+
+        Args:
+            session (sqlalchemy.orm.Session): The requested clean session instance ready for use
+            plr_ids (list): The ids of the public law restrictions.
+
+        Returns:
+            list: The public law restrictions ordered by their id.
+        """
+        plr_model = self.plr_model
+        return session.query(plr_model).options(*self._plr_loader_options_).filter(
+            plr_model.id.in_(plr_ids)
+        ).order_by(plr_model.id).all()
+
+    def collect_measured_geometry_records(self, session, plr_ids, real_estate, with_geometry):
+        """
+        Creates the geometry records of the passed public law restrictions with the measures of their
+        intersection with the real estate computed in the database. Every geometry is split into its single
+        parts like it is done in :meth:`create_geometry_records_`. The geometries are only transferred if
+        they are requested for the extract.
+
+        Args:
+            session (sqlalchemy.orm.Session): The requested clean session instance ready for use
+            plr_ids (list): The ids of the public law restrictions.
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real
+                estate in its record representation.
+            with_geometry (bool): Switch to load the geometries too.
+
+        Returns:
+            dict: The geometry records by the id of their public law restriction.
+        """
+        geometry_model = self._model_
+        parts = session.query(
+            geometry_model.id.label('geometry_id'),
+            func.ST_Dump(geometry_model.geom).label('dump')
+        ).filter(geometry_model.public_law_restriction_id.in_(plr_ids)).subquery()
+        part = parts.c.dump.geom
+        intersection = func.ST_Intersection(part, from_shape(real_estate.limit, srid=Config.get('srid')))
+        # Only the measure matching the dimension of the part is needed, so the intersection is computed once
+        measure = case(
+            [
+                (func.ST_Dimension(part) == 0, func.ST_NPoints(intersection)),
+                (func.ST_Dimension(part) == 1, func.ST_Length(intersection))
+            ],
+            else_=func.ST_Area(intersection)
+        )
+        columns = [
+            geometry_model,
+            func.ST_GeometryType(part).label('part_type'),
+            measure.label('measure')
+        ]
+        if with_geometry:
+            columns.append(part.label('part'))
+        query = session.query(*columns).join(
+            parts,
+            parts.c.geometry_id == geometry_model.id
+        ).options(
+            defer(geometry_model.geom),
+            joinedload(geometry_model.responsible_office)
+        ).order_by(geometry_model.id, parts.c.dump.path)
+
+        geometry_records = dict()
+        for row in query.all():
+            geometry_from_db = row[0]
+            law_status = LawStatusRecord.from_config(
+                Config.get_law_status(
+                    self._plr_info.get('code'),
+                    self._plr_info.get('law_status'),
+                    geometry_from_db.law_status
+                )
+            )
+            # PostGIS returns the types prefixed like ST_Polygon
+            measures = IntersectionMeasuresRecord.from_measure(row.part_type[3:], row.measure)
+            geometry_records.setdefault(geometry_from_db.public_law_restriction_id, list()).append(
+                self._geometry_record_class(
+                    law_status,
+                    geometry_from_db.published_from,
+                    to_shape(row.part) if with_geometry else None,
+                    geometry_from_db.geo_metadata,
+                    office=self.from_db_to_office_record(geometry_from_db.responsible_office),
+                    measures=measures
+                )
+            )
+        return geometry_records
+
+    def create_plr_records(self, session, params, real_estate, plr_ids, legend_entries_from_db):
+        """
+        Creates the records of the public law restrictions with the passed ids.
+
+        Args:
+            session (sqlalchemy.orm.Session): The requested clean session instance ready for use
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the extract request.
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real
+                estate in its record representation.
+            plr_ids (list): The ids of the public law restrictions.
+            legend_entries_from_db (list): The legend entries of the visible extent.
+
+        Returns:
+            list of pyramid_oereb.lib.records.plr.PlrRecord: The created records.
+        """
+        public_law_restrictions = self.collect_public_law_restrictions_by_ids(session, plr_ids)
+        self._legend_symbols_ = dict()
+        if self._server_side_measures_:
+            self._measured_geometries_ = self.collect_measured_geometry_records(
+                session, plr_ids, real_estate, params.with_geometry
+            )
+        try:
+            return [
+                self.from_db_to_plr_record(params, public_law_restriction, legend_entries_from_db)
+                for public_law_restriction in public_law_restrictions
+            ]
+        finally:
+            self._measured_geometries_ = None
+            self._legend_symbols_ = None
+
+    def get_combined_selects(self, real_estate, bbox):
+        """
+        Returns two selects for the combined read of all topics sharing the database connection. The first
+        one returns the ids of the public law restrictions related to the real estate, the second one the
+        distinct type codes and view services of the public law restrictions in the visible extent.
+
+        Args:
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real
+                estate in its record representation.
+            bbox (shapely.geometry.base.BaseGeometry): The bbox to search the records.
+
+        Returns:
+            list of sqlalchemy.sql.expression.Select or None: The selects or None if the topic is not
+            available for the real estate.
+        """
+        if not self._is_available(real_estate):
+            return None
+        topic = literal(self._theme_record.code, Text).label('topic')
+        related = select([
+            topic,
+            cast(self._model_.public_law_restriction_id, Text).label('plr_id'),
+            cast(null(), Text).label('type_code'),
+            cast(null(), Text).label('view_service_id')
+        ]).where(self.geometry_filter(real_estate.limit)).distinct()
+        plr_model = self.plr_model
+        visible = select([
+            topic,
+            cast(null(), Text).label('plr_id'),
+            cast(plr_model.type_code, Text).label('type_code'),
+            cast(plr_model.view_service_id, Text).label('view_service_id')
+        ]).select_from(
+            self._model_.__table__.join(
+                plr_model.__table__,
+                plr_model.id == self._model_.public_law_restriction_id
+            )
+        ).where(self.geometry_filter(bbox)).distinct()
+        return [related, visible]
+
+    @staticmethod
+    def _from_text(column, value):
+        if value is None:
+            return None
+        return column.type.python_type(value)
+
+    def collect_records_by_combined_result(self, session, params, real_estate):
+        """
+        Creates the public law restriction records from the rows found by the combined read. Only the
+        related public law restrictions and legend entries are queried, each with one single query.
+
+        Args:
+            session (sqlalchemy.orm.Session): The requested clean session instance ready for use
+            params (pyramid_oereb.views.webservice.Parameter): The parameters of the extract request.
+            real_estate (pyramid_oereb.lib.records.real_estate.RealEstateRecord): The real
+                estate in its record representation.
+
+        Returns:
+            list of pyramid_oereb.lib.records.plr.EmptyPlrRecord: The records of the topic.
+        """
+        plr_model = self.plr_model
+        plr_ids = list()
+        legend_keys = list()
+        for row in self._combined_result_:
+            if row.plr_id is not None:
+                plr_ids.append(self._from_text(plr_model.id, row.plr_id))
+            else:
+                legend_key = (
+                    row.type_code,
+                    self._from_text(self.legend_entry_model.view_service_id, row.view_service_id)
+                )
+                if legend_key not in legend_keys:
+                    legend_keys.append(legend_key)
+        if len(plr_ids) == 0:
+            return [EmptyPlrRecord(self._theme_record)]
+
+        legend_entries_from_db = session.query(self.legend_entry_model).filter(or_(*[
+            and_(
+                self.legend_entry_model.type_code == type_code,
+                self.legend_entry_model.view_service_id == view_service_id
+            ) for type_code, view_service_id in legend_keys
+        ])).all()
+        return self.create_plr_records(session, params, real_estate, plr_ids, legend_entries_from_db)
+
     def read(self, params, real_estate, bbox, position=None):
         """
         The read point which creates a extract, depending on a passed real estate.
@@ -501,11 +888,16 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
         log.debug("read() start; position of theme in theme list: {}".format(position))
         self._theme_record.position = position
 
+        self.check_data_version()
+
         # Check if the plr is marked as available
         if self._is_available(real_estate):
             session = self._adapter_.get_session(self._key_)
             try:
-                if session.query(self._model_).count() == 0:
+                if self._combined_result_ is not None:
+                    # The topic was already queried together with the other topics of the connection
+                    self.records = self.collect_records_by_combined_result(session, params, real_estate)
+                elif self.is_empty:
                     # We can stop here already because there are no items in the database
                     self.records = [EmptyPlrRecord(self._theme_record)]
                 else:
@@ -522,16 +914,15 @@ class DatabaseSource(BaseDatabaseSource, PlrBaseSource):
                     else:
                         # We found spatially related elements. This means we need to extract the actual plr
                         # information related to the found geometries.
-                        self.records = []
                         legend_entries_from_db = self.collect_legend_entries_by_bbox(session, bbox)
-                        for geometry_result in geometry_results:
-                            self.records.append(
-                                self.from_db_to_plr_record(
-                                    params,
-                                    geometry_result.public_law_restriction,
-                                    legend_entries_from_db
-                                )
-                            )
+                        plr_ids = [geometry.public_law_restriction_id for geometry in geometry_results]
+                        self.records = self.create_plr_records(
+                            session,
+                            params,
+                            real_estate,
+                            plr_ids,
+                            legend_entries_from_db
+                        )
                         log.debug("read() processed {} geometry_results into {} plr".format(
                             len(geometry_results), len(self.records))
                         )
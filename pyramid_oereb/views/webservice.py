@@ -6,12 +6,14 @@ from pyramid.httpexceptions import HTTPBadRequest, HTTPNoContent, HTTPNotFound,
 from pyramid.path import DottedNameResolver
 from shapely.geometry import Point
 from pyramid.renderers import render_to_response
-from pyramid.response import Response
+from pyramid.response import Response, FileResponse
 
 from pyramid_oereb import route_prefix
 from pyramid_oereb import Config
 from pyreproj import Reprojector
 
+from pyramid_oereb.lib.cache import get_extract_cache
+from pyramid_oereb.lib.print_jobs import get_print_job_queue, JOB_ERROR, JOB_ID_PATTERN
 from pyramid_oereb.lib.processor import create_processor
 from pyramid_oereb.lib.readers.address import AddressReader
 from timeit import default_timer as timer
@@ -240,26 +242,8 @@ class PlrWebservice(object):
         log.debug("get_extract_by_id() start")
         try:
             params = self.__validate_extract_params__()
-            processor = create_processor()
-            # read the real estate from configured source by the passed parameters
-            real_estate_reader = processor.real_estate_reader
-            if params.egrid:
-                real_estate_records = real_estate_reader.read(params, egrid=params.egrid)
-            elif params.identdn and params.number:
-                real_estate_records = real_estate_reader.read(
-                    params,
-                    nb_ident=params.identdn,
-                    number=params.number
-                )
-            else:
-                raise HTTPBadRequest("Missing required argument")
-            # check if result is strictly one (we queried with primary keys)
-            if len(real_estate_records) == 1:
-                extract = processor.process(
-                    real_estate_records[0],
-                    params,
-                    self._request.route_url('{0}/sld'.format(route_prefix))
-                )
+            extract = self.__get_extract__(params)
+            if extract is not None:
                 if params.format == 'json':
                     log.debug("get_extract_by_id() calling json")
                     response = render_to_response(
@@ -307,6 +291,48 @@ class PlrWebservice(object):
                 response.extras = OerebStats(service='GetExtractById')
         return response
 
+    def __get_extract__(self, params):
+        """
+        Processes the extract for the validated parameters. If an extract cache is configured, the extract is
+        taken from the cache if possible and stored in it otherwise.
+
+        Args:
+            params (pyramid_oereb.views.webservice.Parameter): The validated parameters.
+
+        Returns:
+            pyramid_oereb.lib.records.extract.ExtractRecord or None: The extract or None if no real estate
+            was found.
+        """
+        processor = create_processor()
+        sld_url = self._request.route_url('{0}/sld'.format(route_prefix))
+        extract_cache = get_extract_cache()
+        if extract_cache is not None:
+            cache_key = extract_cache.create_key(params, sld_url, processor.plr_sources)
+            extract = extract_cache.get(cache_key)
+            log.debug("get_extract_by_id() extract cache stats: {}".format(extract_cache.stats))
+            if extract is not None:
+                extract.renew()
+                return extract
+        # read the real estate from configured source by the passed parameters
+        real_estate_reader = processor.real_estate_reader
+        if params.egrid:
+            real_estate_records = real_estate_reader.read(params, egrid=params.egrid)
+        elif params.identdn and params.number:
+            real_estate_records = real_estate_reader.read(
+                params,
+                nb_ident=params.identdn,
+                number=params.number
+            )
+        else:
+            raise HTTPBadRequest("Missing required argument")
+        # check if result is strictly one (we queried with primary keys)
+        if len(real_estate_records) != 1:
+            return None
+        extract = processor.process(real_estate_records[0], params, sld_url)
+        if extract_cache is not None:
+            extract_cache.set(cache_key, extract)
+        return extract
+
     def __validate_extract_params__(self):
         """
         Validates the input parameters for get_extract_by_id.
@@ -347,11 +373,17 @@ class PlrWebservice(object):
         # With images?
         with_images = self._params.get('WITHIMAGES') is not None
 
+        # With generalized geometries?
+        generalize = self._params.get('GENERALIZE') is not None
+        if generalize and not user_requested_geometry:
+            raise HTTPBadRequest('Generalization is only available for extracts with geometry.')
+
         params = Parameter(
             extract_format,
             flavour=extract_flavour,
             with_geometry=with_geometry,
-            images=with_images
+            images=with_images,
+            generalize=generalize
         )
 
         # Get id
@@ -528,7 +560,7 @@ class PlrWebservice(object):
 
 class Parameter(object):
     def __init__(self, response_format, flavour=None, with_geometry=False, images=False, identdn=None,
-                 number=None, egrid=None, language=None, topics=None):
+                 number=None, egrid=None, language=None, topics=None, generalize=False):
         """
         Creates a new parameter instance.
 
@@ -542,6 +574,7 @@ class Parameter(object):
             egrid (str): The EGRID as real estate identifier.
             language (str): The requested language.
             topics (list of str): The list of requested topics.
+            generalize (bool): Extract with/without generalized geometries.
         """
         self.__flavour__ = flavour
         self.__format__ = response_format
@@ -552,6 +585,7 @@ class Parameter(object):
         self.__egrid__ = egrid
         self.__language__ = language
         self.__topics__ = topics
+        self.__generalize__ = generalize
 
     def set_identdn(self, identdn):
         """
@@ -670,6 +704,14 @@ class Parameter(object):
         """
         return self.__topics__
 
+    @property
+    def generalize(self):
+        """
+        Returns:
+            bool: Extract requested with generalized geometries.
+        """
+        return self.__generalize__
+
     def skip_topic(self, theme_code):
         """
         Check if the topic should be skipped in extract.
@@ -690,10 +732,10 @@ class Parameter(object):
 
     def __str__(self):
         return '<%s -- flavour: %s format: %s geometry: %s images: %s identdn: %s' \
-                    ' number: %s egrid: %s language: %s topics: %s>' % (
+                    ' number: %s egrid: %s language: %s topics: %s generalize: %s>' % (
                         self.__class__.__name__,
                         self.flavour, self.format, self.with_geometry, self.images, self.identdn,
-                        self.number, self.egrid, self.language, self.topics)
+                        self.number, self.egrid, self.language, self.topics, self.generalize)
 
 
 class Logo(object):
@@ -825,3 +867,77 @@ class Sld(object):
                 raise HTTPInternalServerError()
         log.error(u'method in path "{path}" not found'.format(path=method_path))
         raise HTTPNotFound()
+
+
+class PrintJob(object):
+    """
+    Webservice to deliver the state and the result of asynchronous print jobs.
+
+    Args:
+        request (pyramid.request.Request or pyramid.testing.DummyRequest): The pyramid request instance.
+    """
+    def __init__(self, request):
+        self._request_ = request
+
+    @staticmethod
+    def format_state(request, state):
+        """
+        Formats the state of a print job for the response.
+
+        Args:
+            request (pyramid.request.Request): The current request.
+            state (dict): The state of the print job.
+
+        Returns:
+            dict: The formatted state including the URLs of the status and the result.
+        """
+        return {
+            'id': state['id'],
+            'status': state['status'],
+            'done': state['status'] in ['finished', 'error'],
+            'error': JOB_ERROR if state['error'] is not None else None,
+            'status_url': request.route_url('{0}/print_job/status'.format(route_prefix), job_id=state['id']),
+            'download_url': request.route_url('{0}/print_job/report'.format(route_prefix), job_id=state['id'])
+        }
+
+    def _get_state(self):
+        print_job_queue = get_print_job_queue()
+        job_id = self._request_.matchdict.get('job_id')
+        if print_job_queue is None or not JOB_ID_PATTERN.match(job_id):
+            raise HTTPNotFound()
+        state = print_job_queue.store.get(job_id)
+        if state is None:
+            raise HTTPNotFound()
+        return print_job_queue, state
+
+    def get_status(self):
+        """
+        Returns the state of the print job.
+
+        Returns:
+            pyramid.response.Response: The JSON encoded state.
+        """
+        print_job_queue, state = self._get_state()
+        return render_to_response('json', self.format_state(self._request_, state), request=self._request_)
+
+    def get_report(self):
+        """
+        Returns the printed extract of a finished print job. For unfinished jobs the state is returned with
+        the status 202.
+
+        Returns:
+            pyramid.response.Response: The printed extract.
+        """
+        print_job_queue, state = self._get_state()
+        if state['status'] == 'error':
+            raise HTTPInternalServerError(JOB_ERROR)
+        if state['status'] != 'finished':
+            response = render_to_response('json', self.format_state(self._request_, state),
+                                          request=self._request_)
+            response.status_code = 202
+            return response
+        return FileResponse(
+            print_job_queue.store.result_path(state['id']),
+            request=self._request_,
+            content_type='application/pdf'
+        )
@@ -56,6 +56,7 @@ setup(
             'drop_standard_tables = pyramid_oereb.standard.drop_tables:drop_standard_tables',
             'create_legend_entries = pyramid_oereb.standard.load_legend_entries:run',
             'import_federal_topic = pyramid_oereb.standard.import_federal_topic:run',
+            'precompile_templates = pyramid_oereb.lib.renderer.templates:precompile_templates',
             'create_stats_tables = pyramid_oereb.contrib.stats.scripts.create_stats_tables:create_stats_tables'  # noqa: E501
         ]
     }
@@ -1,11 +1,21 @@
 # -*- coding: utf-8 -*-
+import io
 import os
 import json
 import codecs
+import tempfile
+
+import pytest
+import requests
+import requests_mock
+from PyPDF2 import PdfFileReader, PdfFileWriter
+
+from pyramid_oereb.lib.config import Config
 from pyramid_oereb.contrib.print_proxy.mapfish_print import Renderer
 from tests.renderer import DummyRenderInfo
 from pyramid_oereb.contrib.print_proxy.sub_themes.sorting import AlphabeticSort, ListSort
-from pyramid_oereb.contrib.print_proxy.toc_pages import TocPages
+from pyramid_oereb.contrib.print_proxy.toc_pages import TocPages, count_lines, text_width, get_layout, \
+    DEFAULT_LAYOUT
 
 
 def coordinates():
@@ -49,6 +59,134 @@ def test_toc_pages():
     assert TocPages(extract()).getNbPages() == 1
 
 
+def test_toc_pages_long():
+    long_extract = extract()
+    long_extract['ConcernedTheme'] = long_extract['ConcernedTheme'] * 10
+    assert TocPages(long_extract).getNbPages() == 2
+
+
+def test_count_lines():
+    assert count_lines('', 100, 10) == 1
+    assert count_lines('Test', 100, 10) == 1
+    # 'Test Test' is 41.68 points wide at 10 points
+    assert count_lines('Test Test', 41, 10) == 2
+    assert count_lines('Test Test', 42, 10) == 1
+    assert count_lines('Test\nTest', 100, 10) == 2
+    assert count_lines('TestTestTest', 30, 10) == 2
+    assert text_width(u'\xe9', 10) == text_width('e', 10)
+
+
+def test_toc_layouts():
+    Config._config['print']['toc_layouts'] = {
+        'A4 portrait': {
+            'toc_item': {'line_height': 30},
+            'languages': {
+                'fr': {'toc_item': {'width': 200}}
+            }
+        }
+    }
+    get_layout.cache_clear()
+    try:
+        assert get_layout('A4 portrait', 'de')['toc_item'] == \
+            {'width': 430, 'font_size': 10, 'line_height': 30}
+        assert get_layout('A4 portrait', 'fr')['toc_item'] == \
+            {'width': 200, 'font_size': 10, 'line_height': 30}
+        assert get_layout('other', 'fr') == DEFAULT_LAYOUT
+    finally:
+        del Config._config['print']['toc_layouts']
+        get_layout.cache_clear()
+
+
+def create_pdf(nb_pages):
+    writer = PdfFileWriter()
+    for i in range(nb_pages):
+        writer.addBlankPage(100 + i, 100)
+    with io.BytesIO() as pdf:
+        writer.write(pdf)
+        return pdf.getvalue()
+
+
+def test_insert_pdf():
+    merged = PdfFileReader(io.BytesIO(Renderer.insert_pdf(create_pdf(3), create_pdf(2), 1)))
+    assert [page.mediaBox.getWidth() for page in merged.pages] == [100, 100, 101, 101, 102]
+
+
+def test_print_toc():
+    spec = {'layout': 'A4 portrait', 'attributes': {'nbTocPages': 1}}
+    printed_specs = []
+
+    def print_pdf(print_spec):
+        printed_specs.append(json.loads(json.dumps(print_spec)))
+        with requests_mock.mock() as m:
+            m.get('http://print/toc.pdf', content=create_pdf(2))
+            return requests.get('http://print/toc.pdf')
+
+    toc = Renderer.print_toc(print_pdf, spec, 'TOC')
+    assert [printed_spec['layout'] for printed_spec in printed_specs] == ['TOC', 'TOC']
+    assert [printed_spec['attributes']['nbTocPages'] for printed_spec in printed_specs] == [1, 2]
+    assert PdfFileReader(io.BytesIO(toc)).getNumPages() == 2
+    assert spec == {'layout': 'A4 portrait', 'attributes': {'nbTocPages': 2}}
+
+
+def test_print_report():
+    with requests_mock.mock() as m:
+        m.post('http://print/oereb/report.pdf', json={
+            'ref': 'abc',
+            'statusURL': '/oereb/status/abc.json',
+            'downloadURL': '/oereb/report/abc'
+        })
+        m.get('http://print/oereb/status/abc.json', [
+            {'json': {'done': False, 'status': 'running'}},
+            {'json': {'done': True, 'status': 'finished', 'downloadURL': '/oereb/report/abc'}}
+        ])
+        m.get('http://print/oereb/report/abc', content=b'%PDF')
+        result = Renderer.print_report('http://print/oereb', {'Referer': 'http://oereb'},
+                                       {'layout': 'A4 portrait'}, poll_interval=0, request_timeout=5)
+        assert result.content == b'%PDF'
+        assert json.loads(m.request_history[0].text) == {'layout': 'A4 portrait'}
+        assert [request.headers['Referer'] for request in m.request_history] == ['http://oereb'] * 4
+        assert [request.timeout for request in m.request_history] == [5] * 4
+
+
+def test_print_report_error():
+    with requests_mock.mock() as m:
+        m.post('http://print/oereb/report.pdf', json={
+            'ref': 'abc',
+            'statusURL': '/oereb/status/abc.json',
+            'downloadURL': '/oereb/report/abc'
+        })
+        m.get('http://print/oereb/status/abc.json', json={'done': True, 'status': 'error', 'error': 'failed'})
+        with pytest.raises(LookupError):
+            Renderer.print_report('http://print/oereb', {}, {'layout': 'A4 portrait'})
+
+
+def test_print_report_status_error():
+    with requests_mock.mock() as m:
+        m.post('http://print/oereb/report.pdf', json={
+            'ref': 'abc',
+            'statusURL': '/oereb/status/abc.json',
+            'downloadURL': '/oereb/report/abc'
+        })
+        m.get('http://print/oereb/status/abc.json', status_code=502, text='Bad Gateway')
+        with pytest.raises(LookupError):
+            Renderer.print_report('http://print/oereb', {}, {'layout': 'A4 portrait'})
+
+
+def test_print_report_timeout():
+    with requests_mock.mock() as m:
+        m.post('http://print/oereb/report.pdf', json={
+            'ref': 'abc',
+            'statusURL': '/oereb/status/abc.json',
+            'downloadURL': '/oereb/report/abc'
+        })
+        m.get('http://print/oereb/status/abc.json', json={'done': False, 'status': 'running'})
+        m.delete('http://print/oereb/cancel/abc', exc=requests.exceptions.ConnectTimeout)
+        with pytest.raises(LookupError):
+            Renderer.print_report('http://print/oereb', {}, {'layout': 'A4 portrait'}, poll_interval=0,
+                                  timeout=0)
+        assert m.request_history[-1].method == 'DELETE'
+
+
 def geometry():
     return {
         'type': 'MultiPolygon',
@@ -124,7 +262,8 @@ def test_legend():
     renderer = Renderer(DummyRenderInfo())
     pdf_to_join = set()
     printable_extract = extract()
-    renderer.convert_to_printable_extract(printable_extract, geometry(), pdf_to_join)
+    with pytest.deprecated_call():
+        renderer.convert_to_printable_extract(printable_extract, geometry(), pdf_to_join)
     first_plr = printable_extract.get('RealEstate_RestrictionOnLandownership')[0]
     assert isinstance(first_plr, dict)
 
@@ -133,7 +272,8 @@ def test_mapfish_print_entire_extract():
     renderer = Renderer(DummyRenderInfo())
     pdf_to_join = set()
     printable_extract = extract()
-    renderer.convert_to_printable_extract(printable_extract, geometry(), pdf_to_join)
+    with pytest.deprecated_call():
+        renderer.convert_to_printable_extract(printable_extract, geometry(), pdf_to_join)
     # Uncomment to print the result
     # f = open('/tmp/printable_extract.json', 'w')
     # f.write(json.dumps(printable_extract))
@@ -693,3 +833,15 @@ def test_archive_pdf():
     extract = {'RealEstate_EGRID': 'CH113928077734'}
     path_and_filename = renderer.archive_pdf_file('/tmp', bytes(), extract)
     assert os.path.isfile(path_and_filename)
+
+
+def test_archive_pdf_file_object():
+    renderer = Renderer(DummyRenderInfo())
+    extract = {'RealEstate_EGRID': 'CH113928077735'}
+    with tempfile.TemporaryFile() as pdf:
+        pdf.write(b'%PDF')
+        pdf.seek(0)
+        path_and_filename = renderer.archive_pdf_file('/tmp', pdf, extract)
+        assert pdf.read() == b'%PDF'
+    with open(path_and_filename, 'rb') as archive:
+        assert archive.read().endswith(b'%PDF')
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+import datetime
+import json
+
+import pytest
+from shapely.geometry import MultiPolygon, Point, Polygon, mapping
+
+from pyramid_oereb.contrib.print_proxy.mapfish_print import Renderer
+from pyramid_oereb.contrib.print_proxy.print_model import PrintModelBuilder, LegendCache, legend_cache, \
+    parse_wms_url
+from pyramid_oereb.lib.adapter import FileAdapter
+from pyramid_oereb.lib.records.documents import DocumentRecord, LegalProvisionRecord
+from pyramid_oereb.lib.records.embeddable import EmbeddableRecord, DatasourceRecord
+from pyramid_oereb.lib.records.exclusion_of_liability import ExclusionOfLiabilityRecord
+from pyramid_oereb.lib.records.extract import ExtractRecord
+from pyramid_oereb.lib.records.geometry import GeometryRecord
+from pyramid_oereb.lib.records.glossary import GlossaryRecord
+from pyramid_oereb.lib.records.image import ImageRecord
+from pyramid_oereb.lib.records.law_status import LawStatusRecord
+from pyramid_oereb.lib.records.office import OfficeRecord
+from pyramid_oereb.lib.records.plr import PlrRecord
+from pyramid_oereb.lib.records.real_estate import RealEstateRecord
+from pyramid_oereb.lib.records.theme import ThemeRecord
+from pyramid_oereb.lib.records.view_service import ViewServiceRecord, LegendEntryRecord
+from pyramid_oereb.views.webservice import Parameter
+from tests import pyramid_oereb_test_config
+from tests.mockrequest import MockRequest
+from tests.renderer import DummyRenderInfo
+
+WMS_URL = 'https://wms.geo.admin.ch/?SERVICE=WMS&REQUEST=GetMap&VERSION=1.1.1&STYLES=default' \
+          '&SRS=EPSG:2056&BBOX=2475000,1065000,2850000,1300000&WIDTH=493&HEIGHT=280&FORMAT=image/png' \
+          '&LAYERS={0}'
+
+
+def law_status():
+    return LawStatusRecord(u'inForce', {u'de': u'In Kraft'})
+
+
+def symbol():
+    return ImageRecord(FileAdapter().read('tests/resources/python.svg'))
+
+
+def create_extract():
+    office = OfficeRecord({u'de': u'AGI'}, uid=u'CHE-123.456.789', postal_code=4410, city=u'Liestal')
+    law = DocumentRecord('Law', law_status(), datetime.date(2016, 1, 1), {u'de': u'Raumplanungsgesetz'},
+                         office, {u'de': u'http://my.law.ch'}, official_number=u'SR 700')
+    hint = DocumentRecord('Hint', law_status(), datetime.date(2016, 1, 1), {u'de': u'Hinweis'}, office,
+                          {u'de': u'http://my.hint.ch'})
+    legal_provision = LegalProvisionRecord(law_status(), datetime.date(2016, 1, 1), {u'de': u'Zonenplan'},
+                                           office, {u'de': u'http://my.legal-provision.ch'},
+                                           abbreviation={u'de': u'ZP'}, references=[law, hint])
+    plrs = list()
+    for theme_code, type_codes in [
+        (u'LandUsePlans', [u'Wohnzone', u'Gewerbezone', u'Wohnzone']),
+        (u'ContaminatedSites', [u'Belastet'])
+    ]:
+        theme = ThemeRecord(theme_code, {u'de': theme_code, u'fr': theme_code.lower()})
+        legends = [
+            LegendEntryRecord(symbol(), {u'de': u'Legende {0}'.format(type_code)}, type_code, u'TypeCodeList',
+                              theme, view_service_id=1)
+            for type_code in [u'Zone B', u'Zone A'] + type_codes
+        ]
+        for i, type_code in enumerate(type_codes):
+            view_service = ViewServiceRecord(WMS_URL.format(theme_code), 1, 0.75,
+                                             {u'de': u'http://my.legend.ch'}, legends)
+            plr = PlrRecord(theme, {u'de': u'Information {0}'.format(type_code)}, law_status(),
+                            datetime.date(2016, 1, 1), office, symbol(), view_service,
+                            [GeometryRecord(law_status(), datetime.date(2016, 1, 1), Point(0.5, 0.2),
+                                            office=office)],
+                            type_code=type_code, type_code_list=u'TypeCodeList',
+                            documents=[legal_provision], view_service_id=1)
+            plr._area_share = 100 + i
+            plr.part_in_percent = 10.123 + i
+            plrs.append(plr)
+
+    real_estate = RealEstateRecord(u'RealEstate', u'BL', u'Liestal', 2829, 11395,
+                                   MultiPolygon([Polygon([(0, 0), (1, 1), (1, 0)])]),
+                                   u'http://www.geocat.ch', u'1000', u'BL0200002829', u'CH775979211712',
+                                   public_law_restrictions=plrs, references=[law])
+    real_estate.set_view_service(ViewServiceRecord(WMS_URL.format('ch.swisstopo-vd.amtliche-vermessung'),
+                                                   1, 0.6, None, None))
+    real_estate.set_main_page_view_service(ViewServiceRecord(WMS_URL.format('ch.swisstopo.pixelkarte'),
+                                                             1, 0.5, None, None))
+    date = datetime.datetime(2020, 5, 4, 10, 20, 30)
+    theme = ThemeRecord(u'LandUsePlans', {u'de': u'Nutzungsplanung'})
+    return ExtractRecord(
+        real_estate, symbol(), symbol(), symbol(), symbol(), office, {u'de': u'Grundlagedaten'},
+        EmbeddableRecord(date, office, office, date, [DatasourceRecord(theme, date, office)]),
+        exclusions_of_liability=[ExclusionOfLiabilityRecord({u'de': u'Haftung'}, {u'de': u'Inhalt'})],
+        glossaries=[GlossaryRecord({u'de': u'ZP'}, {u'de': u'Zonenplan'}),
+                    GlossaryRecord({u'de': u'AV'}, {u'de': u'Amtliche Vermessung'})],
+        concerned_theme=[theme],
+        not_concerned_theme=[ThemeRecord(u'ContaminatedSites', {u'de': u'Belastete Standorte'})],
+        theme_without_data=[],
+        general_information={u'de': u'Allgemeine Informationen'}
+    )
+
+
+@pytest.mark.parametrize('language', [u'de', u'fr'])
+def test_build_equals_converted_json(language):
+    params = Parameter('pdf', 'reduced', True, False, 'BL0200002829', '1000', 'CH775979211712', language)
+    with pyramid_oereb_test_config():
+        extract = create_extract()
+        feature_geometry = mapping(extract.real_estate.limit)
+        renderer = Renderer(DummyRenderInfo())
+        renderer._request = MockRequest()
+        renderer._fallback_language = u'de'
+        pdf_to_join = set()
+        with pytest.deprecated_call():
+            expected = renderer.convert_to_printable_extract(
+                renderer._render(extract, params), feature_geometry, pdf_to_join
+            )
+        built_pdf_to_join = set()
+        legend_cache.clear()
+        for _ in range(2):
+            built = PrintModelBuilder(renderer, params).build(extract, feature_geometry, built_pdf_to_join)
+            assert json.dumps(built, sort_keys=True) == json.dumps(expected, sort_keys=True)
+    assert built_pdf_to_join == pdf_to_join == {'http://my.legal-provision.ch'}
+    restrictions = built['RealEstate_RestrictionOnLandownership']
+    assert [restriction['Theme_Code'] for restriction in restrictions] == \
+        ['LandUsePlans', 'ContaminatedSites']
+    assert [law['Title'] for law in restrictions[0]['Laws']] == [u'Raumplanungsgesetz']
+    assert [legend['AreaShare'] for legend in restrictions[0]['Legend']] == [u'202 m²', u'101 m²']
+
+
+def test_build_full_without_legal_provision():
+    params = Parameter('pdf', 'full', False, False, 'BL0200002829', '1000', 'CH775979211712', 'de')
+    with pyramid_oereb_test_config():
+        extract = create_extract()
+        extract.real_estate.public_law_restrictions[0].documents = []
+        renderer = Renderer(DummyRenderInfo())
+        renderer._request = MockRequest()
+        with pytest.raises(ValueError):
+            PrintModelBuilder(renderer, params).build(extract, mapping(extract.real_estate.limit), set())
+
+
+def test_parse_wms_url():
+    base_url, params = parse_wms_url(WMS_URL.format('a,b'))
+    assert base_url == 'https://wms.geo.admin.ch/'
+    assert dict(params)['LAYERS'] == ('a,b',)
+    assert parse_wms_url(WMS_URL.format('a,b')) is parse_wms_url(WMS_URL.format('a,b'))
+
+
+def test_legend_cache():
+    cache = LegendCache(max_entries=2)
+    cache.set('a', [1])
+    cache.set('b', [2])
+    assert cache.get('a') == [1]
+    cache.set('c', [3])
+    assert cache.get('b') is None
+    assert cache.get('a') == [1]
+    assert cache.get('c') == [3]
@@ -87,3 +87,14 @@ def test_init():
     assert isinstance(record.plr_cadastre_authority, OfficeRecord)
     assert isinstance(record.base_data, dict)
     assert isinstance(record.embeddable, EmbeddableRecord)
+
+
+def test_renew():
+    extract = create_dummy_extract()
+    identifier = extract.extract_identifier
+    creation_date = extract.creation_date
+    extract.qr_code = 'QR'
+    extract.renew()
+    assert extract.extract_identifier != identifier
+    assert extract.creation_date >= creation_date
+    assert extract.qr_code is None
@@ -10,7 +10,9 @@ import shapely.wkt
 
 import pytest
 
-from pyramid_oereb.lib.records.geometry import GeometryRecord
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.records.geometry import GeometryRecord, GeometryTypes, IntersectionMeasuresRecord, \
+    GeometryGeneralization, ToleranceCheckBatch
 from pyramid_oereb.lib.records.law_status import LawStatusRecord
 from pyramid_oereb.lib.records.real_estate import RealEstateRecord
 
@@ -257,6 +259,216 @@ def test_calculate(geometry, real_estate_geometry, length_limit, area_limit, len
     assert geometry_record._nr_of_points == nr_of_points
 
 
+def test_init_measures():
+    measures = IntersectionMeasuresRecord.from_measure('Polygon', 12.5)
+    record = GeometryRecord("runningModifications", datetime.date(1985, 8, 29), None, 'test',
+                            measures=measures)
+    assert record.geom is None
+    assert record.geom_type == 'Polygon'
+    assert measures.area == 12.5
+    assert measures.length is None
+    assert measures.nr_of_points is None
+    with pytest.raises(AttributeError):
+        GeometryRecord("runningModifications", datetime.date(1985, 8, 29), None, 'test')
+
+
+@pytest.mark.parametrize('geometry', [
+    Point(2, 2),
+    Point(20, 20),
+    LineString([(0, 0), (2, 2)]),
+    LineString([(-1, 0), (0, 0)]),
+    LineString([(2, -1), (2, 1.5)]),
+    Polygon([(0, 0), (0, 2), (2, 2), (2, 0)]),
+    Polygon([(-1, -1), (-1, 0), (0, 0), (0, -1)]),
+    Polygon([(-2, -2), (-2, 1.5), (2, 1.5), (2, -2)])
+])
+def test_calculate_measures(geometry):
+    law_status_record = LawStatusRecord("runningModifications", {u'de': u'BlaBla'})
+    real_estate_geometry = Polygon([(0, 0), (0, 10), (10, 10), (10, 0)])
+    real_estate = RealEstateRecord('Liegenschaft', 'BL', 'Aesch BL', 2761, 100, real_estate_geometry)
+
+    # Measures like computed by the database
+    intersection = geometry.intersection(real_estate_geometry)
+    if geometry.type == 'Point':
+        measure = 0 if intersection.is_empty else 1
+    elif geometry.type == 'LineString':
+        measure = intersection.length
+    else:
+        measure = intersection.area
+
+    expected = GeometryRecord(law_status_record, datetime.date(1985, 8, 29), geometry, 'test')
+    measured = GeometryRecord(law_status_record, datetime.date(1985, 8, 29), None, 'test',
+                              measures=IntersectionMeasuresRecord.from_measure(geometry.type, measure))
+    assert measured.calculate(real_estate, 1.0, 1.0, 'm', 'm2') == \
+        expected.calculate(real_estate, 1.0, 1.0, 'm', 'm2')
+    assert measured.length_share == expected.length_share
+    assert measured.area_share == expected.area_share
+    assert measured.nr_of_points == expected.nr_of_points
+
+
+def test_tolerance_check_batch():
+    law_status_record = LawStatusRecord("runningModifications", {u'de': u'BlaBla'})
+    real_estate = RealEstateRecord('Liegenschaft', 'BL', 'Aesch BL', 2761, 50,
+                                   Polygon([(0, 0), (0, 10), (10, 10), (10, 0)]))
+    geometries = [
+        Point(1, 1),
+        Point(20, 20),
+        MultiPoint([(1, 1), (2, 2), (20, 20)]),
+        LineString([(-1, 1), (1, 1)]),
+        LineString([(-1, 1), (0.5, 1)]),
+        Polygon([(8, 8), (8, 12), (12, 12), (12, 8)]),
+        Polygon([(-1, -1), (-1, 0), (0, 0), (0, -1)]),
+        Polygon([(9.9, 9.9), (9.9, 12), (12, 12), (12, 9.9)]),
+        Polygon([(20, 20), (20, 21), (21, 21), (21, 20)])
+    ]
+
+    def create_records(published_from=datetime.date(1985, 8, 29)):
+        records = [GeometryRecord(law_status_record, published_from, geometry) for geometry in geometries]
+        records.append(GeometryRecord(law_status_record, published_from, None,
+                                      measures=IntersectionMeasuresRecord('Polygon', 4.0, None, None)))
+        return records
+
+    expected = create_records()
+    for record in expected:
+        record.calculate(real_estate, 1.0, 1.0, 'm', 'm2', keep_intersection=True)
+
+    batched = create_records()
+    batch = ToleranceCheckBatch(real_estate, keep_intersections=True)
+    for record in batched:
+        batch.add(record, 1.0, 1.0, 'm', 'm2')
+    unpublished = GeometryRecord(law_status_record, datetime.date.today() + datetime.timedelta(days=1),
+                                 Point(1, 1))
+    batch.add(unpublished, 1.0, 1.0, 'm', 'm2')
+    batch.calculate()
+
+    assert [record._test_passed for record in batched] == \
+        [True, False, True, True, False, True, False, False, False, True]
+    for record, expected_record in zip(batched, expected):
+        assert record.calculated
+        assert record._test_passed == expected_record._test_passed
+        assert record._units == expected_record._units
+        assert record.nr_of_points == expected_record.nr_of_points
+        assert record.length_share == expected_record.length_share
+        assert record.area_share == expected_record.area_share
+        assert record.intersection == expected_record.intersection
+    assert batched[2].nr_of_points == 2
+    assert batched[5].area_share == 2.0
+    assert unpublished.calculated
+    assert not unpublished._test_passed
+
+
+def test_tolerance_check_batch_unsupported():
+    law_status_record = LawStatusRecord("runningModifications", {u'de': u'BlaBla'})
+    real_estate = RealEstateRecord('Liegenschaft', 'BL', 'Aesch BL', 2761, 100,
+                                   Polygon([(0, 0), (0, 10), (10, 10), (10, 0)]))
+    batch = ToleranceCheckBatch(real_estate, GeometryTypes({
+        'point': {'types': ['Point', 'MultiPoint']},
+        'line': {'types': []},
+        'polygon': {'types': []}
+    }))
+    batch.add(GeometryRecord(law_status_record, datetime.date(1985, 8, 29), LineString([(-1, 1), (1, 1)])),
+              1.0, 1.0, 'm', 'm2')
+    with pytest.raises(AttributeError):
+        batch.calculate()
+
+
+def test_geometry_types():
+    geometry_types = GeometryTypes.from_config()
+    configured = Config.get('geometry_types')
+    assert geometry_types.point == configured.get('point').get('types')
+    assert geometry_types.line == configured.get('line').get('types')
+    assert geometry_types.polygon == configured.get('polygon').get('types')
+    assert geometry_types.supported == geometry_types.point + geometry_types.line + geometry_types.polygon
+
+
+def test_calculate_shared_geometry_types():
+    law_status_record = LawStatusRecord("runningModifications", {u'de': u'BlaBla'})
+    real_estate = RealEstateRecord('Liegenschaft', 'BL', 'Aesch BL', 2761, 100,
+                                   Polygon([(0, 0), (0, 10), (10, 10), (10, 0)]))
+    geometry_types = GeometryTypes.from_config()
+    point = GeometryRecord(law_status_record, datetime.date(1985, 8, 29), Point(1, 1))
+    line = GeometryRecord(law_status_record, datetime.date(1985, 8, 29), LineString([(-1, 1), (1, 1)]))
+    assert point.calculate(real_estate, 1.0, 1.0, 'm', 'm2', geometry_types)
+    assert line.calculate(real_estate, 1.0, 1.0, 'm', 'm2', geometry_types)
+    assert point.nr_of_points == 1
+    assert line.length_share == 1.0
+    unsupported = GeometryTypes({
+        'point': {'types': ['Point', 'MultiPoint']},
+        'line': {'types': []},
+        'polygon': {'types': []}
+    })
+    with pytest.raises(AttributeError):
+        line.calculate(real_estate, 1.0, 1.0, 'm', 'm2', unsupported)
+
+
+def test_geometry_generalization():
+    generalization = Config.get('geometry_generalization')
+    try:
+        Config._config['geometry_generalization'] = {'clip': False, 'simplify_tolerance': 0.5}
+        generalization_from_config = GeometryGeneralization.from_config()
+        assert generalization_from_config.clip is False
+        assert generalization_from_config.simplify_tolerance == 0.5
+        Config._config['geometry_generalization'] = None
+        generalization_from_config = GeometryGeneralization.from_config()
+        assert generalization_from_config.clip is True
+        assert generalization_from_config.simplify_tolerance is None
+    finally:
+        Config._config['geometry_generalization'] = generalization
+
+
+def test_generalize():
+    law_status_record = LawStatusRecord("runningModifications", {u'de': u'BlaBla'})
+    real_estate = RealEstateRecord('Liegenschaft', 'BL', 'Aesch BL', 2761, 100,
+                                   Polygon([(0, 0), (0, 10), (10, 10), (10, 0)]))
+    polygon = Polygon([(5, 5), (5, 15), (10.01, 15), (15, 15), (15, 5)])
+    record = GeometryRecord(law_status_record, datetime.date(1985, 8, 29), polygon)
+    assert record.calculate(real_estate, 1.0, 1.0, 'm', 'm2', keep_intersection=True)
+    intersection = record.intersection
+    assert intersection.area == 25.0
+    record.generalize(real_estate, GeometryGeneralization())
+    assert record.rendered_geom is intersection
+    assert record.intersection is None
+    assert record.geom is polygon
+    record.generalize(real_estate, GeometryGeneralization(clip=False, simplify_tolerance=0.1))
+    assert len(record.rendered_geom.exterior.coords) == 5
+    assert record.rendered_geom.area == polygon.area
+
+
+def test_generalize_not_clipped():
+    law_status_record = LawStatusRecord("runningModifications", {u'de': u'BlaBla'})
+    real_estate = RealEstateRecord('Liegenschaft', 'BL', 'Aesch BL', 2761, 100,
+                                   Polygon([(0, 0), (0, 10), (10, 10), (10, 0)]))
+    line = LineString([(1, 1), (20, 1), (20, 2), (1, 2)])
+    record = GeometryRecord(law_status_record, datetime.date(1985, 8, 29), line)
+    assert record.rendered_geom is line
+    record.generalize(real_estate, GeometryGeneralization())
+    # The clipped line consists of two parts
+    assert record.rendered_geom is line
+    measured = GeometryRecord(law_status_record, datetime.date(1985, 8, 29), LineString([(1, 1), (20, 1)]),
+                              measures=IntersectionMeasuresRecord.from_measure('LineString', 9.0))
+    assert measured.calculate(real_estate, 1.0, 1.0, 'm', 'm2', keep_intersection=True)
+    measured.generalize(real_estate, GeometryGeneralization())
+    assert measured.rendered_geom.length == 9.0
+
+
+@pytest.mark.parametrize('geometry,expected', [
+    (Polygon([(1, 1), (1, 3), (3, 3), (3, 1)]), 4.0),
+    (Polygon([(11, 11), (11, 13), (13, 13), (13, 11)]), None),
+    (LineString([(1, 1), (1, 4)]), 3.0),
+    (LineString([(11, 11), (11, 14)]), None)
+])
+def test_calculate_prepared(geometry, expected):
+    law_status_record = LawStatusRecord("runningModifications", {u'de': u'BlaBla'})
+    real_estate = RealEstateRecord('Liegenschaft', 'BL', 'Aesch BL', 2761, 100,
+                                   Polygon([(0, 0), (0, 10), (10, 10), (10, 0)]))
+    record = GeometryRecord(law_status_record, datetime.date(1985, 8, 29), geometry, 'test')
+    assert record.calculate(real_estate, 1.0, 1.0, 'm', 'm2') is (expected is not None)
+    if geometry.type == 'Polygon':
+        assert record.area_share == expected
+    else:
+        assert record.length_share == expected
+
+
 @pytest.mark.parametrize(
     "geometry,test", [
         (
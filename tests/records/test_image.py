@@ -45,3 +45,50 @@ def test_validate_filetype_invalid():
     with pytest.raises(TypeError) as e:
         ImageRecord._validate_filetype('tests/resources/invalid.jpg')
     assert '{0}'.format(e.value).startswith('Invalid file type')
+
+
+@pytest.mark.parametrize('path,expected', [
+    ('tests/resources/logo_canton.png', ('png', 'image/png')),
+    ('tests/resources/python.svg', ('svg', 'image/svg+xml'))
+])
+def test_sniff_content(path, expected):
+    content = FileAdapter().read(path)
+    assert ImageRecord._sniff_content(content) == expected
+    assert ImageRecord._sniff_content(memoryview(content)) == expected
+
+
+@pytest.mark.parametrize('path,message', [
+    ('tests/resources/test_config.yml', 'Unrecognized file type'),
+    ('tests/resources/invalid.jpg', 'Invalid file type')
+])
+def test_sniff_content_invalid(path, message):
+    with pytest.raises(TypeError) as e:
+        ImageRecord._sniff_content(FileAdapter().read(path))
+    assert '{0}'.format(e.value).startswith(message)
+
+
+def test_filetype_memoized(monkeypatch):
+    image_record = ImageRecord(FileAdapter().read('tests/resources/logo_canton.png'))
+    assert image_record.extension == 'png'
+    monkeypatch.setattr(ImageRecord, '_sniff_content', None)
+    assert image_record.mimetype == 'image/png'
+    assert image_record.extension == 'png'
+
+
+def test_filetype_content_replaced():
+    image_record = ImageRecord(FileAdapter().read('tests/resources/logo_canton.png'))
+    assert image_record.extension == 'png'
+    image_record.content = FileAdapter().read('tests/resources/python.svg')
+    assert image_record.filetype == ('svg', 'image/svg+xml')
+
+
+def test_filetype_known(monkeypatch):
+    monkeypatch.setattr(ImageRecord, '_sniff_content', None)
+    image_record = ImageRecord(b'1', extension='png', mimetype='image/png')
+    assert image_record.filetype == ('png', 'image/png')
+
+
+def test_etag():
+    image_record = ImageRecord(FileAdapter().read('tests/resources/logo_canton.png'))
+    assert image_record.etag == ImageRecord(FileAdapter().read('tests/resources/logo_canton.png')).etag
+    assert image_record.etag != ImageRecord(FileAdapter().read('tests/resources/python.svg')).etag
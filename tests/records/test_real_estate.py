@@ -26,3 +26,12 @@ def test_init():
     assert record.egrid is None
     assert record.subunit_of_land_register is None
     assert record.areas_ratio == 0.01
+
+
+def test_prepared_limit():
+    record = RealEstateRecord('test_type', 'BL', 'Nusshof', 1, 100,
+                              loads('POLYGON((0 0, 0 1, 1 1, 1 0, 0 0))'))
+    prepared_limit = record.prepared_limit
+    assert prepared_limit is record.prepared_limit
+    assert prepared_limit.contains(loads('POINT(0.5 0.5)'))
+    assert prepared_limit.disjoint(loads('POINT(2 2)'))
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+import base64
 import datetime
+import requests_mock
 
 from pyramid.httpexceptions import HTTPServerError
 from pyramid.response import Response
@@ -9,13 +11,17 @@ from pyramid.testing import DummyRequest
 
 from pyramid_oereb.lib.adapter import FileAdapter
 from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.records.documents import LegalProvisionRecord, DocumentRecord
 from pyramid_oereb.lib.records.image import ImageRecord
+from pyramid_oereb.lib.records.law_status import LawStatusRecord
+from pyramid_oereb.lib.records.office import OfficeRecord
 from pyramid_oereb.lib.records.theme import ThemeRecord
 from pyramid_oereb.lib.records.view_service import LegendEntryRecord
 from pyramid_oereb.lib.renderer import Base
 from pyramid_oereb.lib.renderer.extract.json_ import Renderer
 from tests import pyramid_oereb_test_config
 from tests.mockrequest import MockRequest
+from tests.records.test_extract import create_dummy_extract
 from tests.renderer import DummyRenderInfo
 
 
@@ -181,3 +187,30 @@ def test_get_symbol_ref(theme_code):
                 record.view_service_id,
                 record.type_code
             )
+
+
+def test_prefetch_base64_text_at_web():
+    law_status = LawStatusRecord.from_config(u'inForce')
+    office = OfficeRecord({'de': 'AGI'})
+
+    def legal_provision(url, references=None):
+        return LegalProvisionRecord(law_status, datetime.date.today(), {'de': 'Test'}, office,
+                                    {'de': url}, references=references)
+
+    extract = create_dummy_extract()
+    extract.real_estate.references = [
+        legal_provision('http://my.document.ch/a'),
+        DocumentRecord('Law', law_status, datetime.date.today(), {'de': 'Test'}, office,
+                       {'de': 'http://my.document.ch/law'},
+                       references=[legal_provision('http://my.document.ch/b')])
+    ]
+    renderer = Base(DummyRenderInfo())
+    renderer._language = 'de'
+    with requests_mock.mock() as m:
+        m.get('http://my.document.ch/a', content=b'a')
+        m.get('http://my.document.ch/b', content=b'b')
+        renderer.prefetch_base64_text_at_web(extract)
+        assert m.call_count == 2
+        assert renderer.get_base64_text_at_web('http://my.document.ch/a') == base64.b64encode(b'a')
+        assert renderer.get_base64_text_at_web('http://my.document.ch/b') == base64.b64encode(b'b')
+        assert m.call_count == 2
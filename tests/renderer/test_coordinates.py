@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+from shapely.geometry import LineString, MultiPolygon, Point, Polygon, mapping
+
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.renderer.coordinates import CoordinateEncoder, get_coordinate_encoder
+
+
+@pytest.fixture
+def polygon():
+    return Polygon(
+        [(2600000.12345, 1200000.98765), (2600010.5, 1200000.0), (2600010.0, 1200010.0)],
+        [[(2600002.0, 1200002.0), (2600003.0, 1200002.0), (2600003.0, 1200003.0)]]
+    )
+
+
+def test_pos_list():
+    line = LineString([(2600000.12345, 1200000.98765), (2600010.5, 1200000.0)])
+    assert CoordinateEncoder(3).pos_list(line.coords) == \
+        '2600000.123 1200000.988 2600010.500 1200000.000'
+    assert CoordinateEncoder().pos_list(line.coords) == '2600000.12345 1200000.98765 2600010.5 1200000.0'
+    assert CoordinateEncoder(3).pos_list([]) == ''
+
+
+def test_pos():
+    assert CoordinateEncoder(1).pos(Point(2600000.12, 1200000.98)) == '2600000.1 1200001.0'
+    assert CoordinateEncoder().pos(Point(1, 2)) == '1.0 2.0'
+
+
+@pytest.mark.parametrize('geom', [
+    Point(0.1234, 1.5678),
+    LineString([(0.1234, 1.5678), (2.0, 3.0)]),
+    MultiPolygon([Polygon([(0, 0), (1, 1), (1, 0)]), Polygon([(2, 2), (3.3333, 3), (3, 2)])])
+])
+def test_coordinates_structure(geom):
+    assert CoordinateEncoder().coordinates(geom) == mapping(geom)['coordinates']
+    rounded = CoordinateEncoder(2).coordinates(geom)
+    assert type(rounded) is type(mapping(geom)['coordinates'])
+    assert len(rounded) == len(mapping(geom)['coordinates'])
+
+
+def test_coordinates_rounded(polygon):
+    assert CoordinateEncoder(2).coordinates(polygon) == (
+        ((2600000.12, 1200000.99), (2600010.5, 1200000.0), (2600010.0, 1200010.0), (2600000.12, 1200000.99)),
+        ((2600002.0, 1200002.0), (2600003.0, 1200002.0), (2600003.0, 1200003.0), (2600002.0, 1200002.0))
+    )
+    assert CoordinateEncoder(2).coordinates(Polygon()) == ()
+
+
+@pytest.mark.parametrize('geom', [
+    Point(0.1234, 1.5678),
+    LineString([(0.1234, 1.5678), (2.0, 3.0)]),
+    Polygon([(0, 0), (1, 1), (1, 0)], [[(0.5, 0.2), (0.6, 0.2), (0.6, 0.3)]]),
+    MultiPolygon([Polygon([(0, 0), (1, 1), (1, 0)]), Polygon([(2, 2), (3.3333, 3), (3, 2)])]),
+    Polygon()
+])
+def test_arrays(geom):
+    assert json.loads(json.dumps(CoordinateEncoder().arrays(geom), default=lambda a: a.tolist())) == \
+        json.loads(json.dumps(mapping(geom)['coordinates']))
+    assert json.loads(json.dumps(CoordinateEncoder(2).arrays(geom), default=lambda a: a.tolist())) == \
+        json.loads(json.dumps(CoordinateEncoder(2).coordinates(geom)))
+
+
+def test_get_coordinate_encoder():
+    precision = Config.get('coordinate_precision')
+    try:
+        Config._config['coordinate_precision'] = {2056: 3}
+        assert get_coordinate_encoder().precision == 3
+        assert get_coordinate_encoder() is get_coordinate_encoder(2056)
+        assert get_coordinate_encoder(4326).precision is None
+        Config._config['coordinate_precision'] = None
+        assert get_coordinate_encoder().precision is None
+    finally:
+        Config._config['coordinate_precision'] = precision
+
+
+def test_get_coordinate_encoder_generalize():
+    precision = Config.get('coordinate_precision')
+    generalization = Config.get('geometry_generalization')
+    try:
+        Config._config['coordinate_precision'] = {2056: 3}
+        Config._config['geometry_generalization'] = {'precision': 1}
+        assert get_coordinate_encoder(2056, generalize=True).precision == 1
+        assert get_coordinate_encoder(2056).precision == 3
+        Config._config['geometry_generalization'] = None
+        assert get_coordinate_encoder(2056, generalize=True).precision == 3
+    finally:
+        Config._config['coordinate_precision'] = precision
+        Config._config['geometry_generalization'] = generalization
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import datetime
+import json
 
 import pytest
 from shapely.geometry import MultiPolygon, Polygon, Point, LineString
@@ -24,6 +25,7 @@ from pyramid_oereb.lib.records.theme import ThemeRecord
 from pyramid_oereb.lib.records.view_service import ViewServiceRecord, LegendEntryRecord
 from pyramid_oereb.lib.renderer import Base
 from pyramid_oereb.lib.renderer.extract.json_ import Renderer
+from pyramid_oereb.lib.renderer.json_backends import JSON_BACKENDS
 from tests import pyramid_oereb_test_config
 from tests.mockrequest import MockRequest
 from tests.renderer import DummyRenderInfo
@@ -399,6 +401,24 @@ def test_format_document(params, document, result_dict):
     assert result == result_dict
 
 
+def test_format_document_without_base64_text_at_web():
+    renderer = Renderer(DummyRenderInfo())
+    renderer._language = u'de'
+    renderer._params = Parameter('json', 'full', False, False, 'BL0200002829', '1000', 'CH775979211712',
+                                 'de')
+    document = LegalProvisionRecord(law_status(), datetime.date.today(), {'de': 'Test Rechtsvorschrift'},
+                                    OfficeRecord({'de': 'AGI'}), {'de': 'http://meine.rechtsvorschrift.ch'},
+                                    references=[
+                                        LegalProvisionRecord(law_status(), datetime.date.today(),
+                                                             {'de': 'Test Referenz'},
+                                                             OfficeRecord({'de': 'AGI'}),
+                                                             {'de': 'http://meine.referenz.ch'})
+                                    ])
+    result = renderer.format_document(document, base64_text_at_web=False)
+    assert 'Base64TextAtWeb' not in result
+    assert 'Base64TextAtWeb' not in result['Reference'][0]
+
+
 @pytest.mark.parametrize('geometry,result_dict', [
     (GeometryRecord(
         law_status(),
@@ -616,3 +636,82 @@ def test_embeddable(params):
         'dataOwnerNameCadastralSurveying': u'This is only a dummy',
         'transferFromSourceCadastralSurveying': av_update_date.strftime('%d-%m-%YT%H:%M:%S')
     }
+
+
+def create_extract(plrs):
+    view_service = ViewServiceRecord(u'http://geowms.bl.ch', 1, 1.0, {'de': u'http://geowms.bl.ch'}, None)
+    real_estate = RealEstateRecord(u'RealEstate', u'BL', u'Liestal', 2829, 11395,
+                                   MultiPolygon([Polygon([(0, 0), (1, 1), (1, 0)])]),
+                                   u'http://www.geocat.ch', u'1000', u'BL0200002829', u'CH775979211712',
+                                   public_law_restrictions=plrs)
+    real_estate.set_view_service(view_service)
+    real_estate.set_main_page_view_service(view_service)
+    office = OfficeRecord({'de': u'AGI'})
+    date = datetime.datetime.now()
+    logo = ImageRecord(FileAdapter().read('tests/resources/logo_canton.png'))
+    return ExtractRecord(real_estate, logo, logo, logo, logo, office, {'de': u'Grundlagedaten'},
+                         EmbeddableRecord(date, office, office, date, []))
+
+
+def create_plr(information, documents):
+    theme = ThemeRecord(u'ContaminatedSites', {u'de': u'Test theme'})
+    office = OfficeRecord({'de': 'Test Office'})
+    return PlrRecord(
+        theme,
+        {'de': information},
+        law_status(),
+        datetime.date.today(),
+        office,
+        ImageRecord(FileAdapter().read('tests/resources/python.svg')),
+        ViewServiceRecord('http://geowms.bl.ch', 1, 1.0, {'de': u'http://geowms.bl.ch'}, None),
+        [GeometryRecord(law_status(), datetime.date.today(),
+                        Polygon([(0.12345, 0.5), (1, 1), (1, 0)]), office=office)],
+        type_code='CodeA',
+        documents=documents,
+        view_service_id=1
+    )
+
+
+@pytest.mark.parametrize('json_backend', [
+    backend() if backend.available() else pytest.param(None, marks=pytest.mark.skip(backend.module))
+    for backend in JSON_BACKENDS
+])
+def test_render_chunks(json_backend):
+    parameter = Parameter('json', 'embeddable', True, True, 'BL0200002829', '1000', 'CH775979211712', 'de')
+    with pyramid_oereb_test_config():
+        document = DocumentRecord('Law', law_status(), datetime.date.today(), {u'de': u'Test Dokument'},
+                                  OfficeRecord({u'de': u'BUD'}), {'de': 'http://mein.dokument.ch'})
+        extract = create_extract([create_plr(u'A', [document]), create_plr(u'B', [document])])
+        renderer = Renderer(DummyRenderInfo())
+        renderer._request = MockRequest()
+        renderer._coordinate_arrays = True
+        chunks = list(renderer._render_chunks(extract, parameter, json_backend))
+        assert len(chunks) == 4
+        streamed = json.loads(b''.join(chunks).decode('utf-8'))
+        assert json.loads(json_backend.dumps(renderer._render_response(extract, parameter))) == streamed
+        renderer._coordinate_arrays = False
+        assert json.loads(json.dumps(renderer._render_response(extract, parameter))) == streamed
+    restrictions = streamed['GetExtractByIdResponse']['extract']['RealEstate']['RestrictionOnLandownership']
+    assert [restriction['Information'][0]['Text'] for restriction in restrictions] == [u'A', u'B']
+    assert 'embeddable' in streamed['GetExtractByIdResponse']
+
+
+def test_render_chunks_without_restrictions():
+    parameter = Parameter('json', 'reduced', True, True, 'BL0200002829', '1000', 'CH775979211712', 'de')
+    with pyramid_oereb_test_config():
+        renderer = Renderer(DummyRenderInfo())
+        renderer._request = MockRequest()
+        chunks = list(renderer._render_chunks(create_extract([]), parameter, JSON_BACKENDS[-1]()))
+    assert len(chunks) == 1
+    assert 'RestrictionOnLandownership' not in \
+        json.loads(chunks[0].decode('utf-8'))['GetExtractByIdResponse']['extract']['RealEstate']
+
+
+def test_render_chunks_full_without_legal_provision():
+    parameter = Parameter('json', 'full', True, True, 'BL0200002829', '1000', 'CH775979211712', 'de')
+    with pyramid_oereb_test_config():
+        renderer = Renderer(DummyRenderInfo())
+        renderer._request = MockRequest()
+        with pytest.raises(ValueError):
+            renderer._render_chunks(create_extract([create_plr(u'A', [])]), parameter, JSON_BACKENDS[-1]())
+        assert renderer._restrictions_placeholder is None
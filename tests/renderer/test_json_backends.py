@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import json
+
+import numpy as np
+import pytest
+from pyramid.config import ConfigurationError
+
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.renderer.json_backends import JSON_BACKENDS, JsonBackend, \
+    create_json_backend, get_json_backend
+
+
+@pytest.mark.parametrize('backend', JSON_BACKENDS)
+def test_dumps(backend):
+    if not backend.available():
+        pytest.skip('{0} is not installed'.format(backend.module))
+    value = {
+        u'Text': u'Grundstück',
+        u'coordinates': [np.array([[2600000.123, 1200000.5], [1.0, 2.0]]), np.array([0.5, 0.25])],
+        u'Number': np.int64(3),
+        u'Values': (1, None, True)
+    }
+    result = backend().dumps(value)
+    assert isinstance(result, bytes)
+    assert json.loads(result.decode('utf-8')) == {
+        u'Text': u'Grundstück',
+        u'coordinates': [[[2600000.123, 1200000.5], [1.0, 2.0]], [0.5, 0.25]],
+        u'Number': 3,
+        u'Values': [1, None, True]
+    }
+
+
+def test_dumps_unknown_type():
+    with pytest.raises(TypeError):
+        JsonBackend().dumps({u'Value': object()})
+
+
+def test_create_json_backend():
+    assert create_json_backend('json').name == 'json'
+    assert create_json_backend().name == [backend for backend in JSON_BACKENDS if backend.available()][0].name
+    with pytest.raises(ConfigurationError):
+        create_json_backend('simplejson')
+
+
+def test_get_json_backend():
+    json_backend = Config.get('json_backend')
+    try:
+        Config._config['json_backend'] = 'json'
+        assert type(get_json_backend()) is JsonBackend
+        assert get_json_backend() is get_json_backend()
+    finally:
+        Config._config['json_backend'] = json_backend
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import os
+
+from pyramid_oereb.lib.renderer.templates import TEMPLATE_DIRECTORIES, compile_templates, \
+    create_template_lookup, get_template_lookup, get_template_names, init_template_lookups
+from pyramid_oereb.lib.renderer.versions.xml_ import Renderer as VersionsRenderer
+from tests.renderer import DummyRenderInfo
+
+
+def test_get_template_lookup():
+    template_lookup = get_template_lookup('lib/renderer/extract/templates/xml')
+    assert template_lookup is get_template_lookup('lib/renderer/extract/templates/xml')
+    assert template_lookup is not get_template_lookup('lib/renderer/versions/templates/xml')
+    template = template_lookup.get_template('extract.xml')
+    assert template is template_lookup.get_template('extract.xml')
+
+
+def test_get_template_lookup_absolute(tmpdir):
+    template_lookup = get_template_lookup('lib/renderer/versions/templates/xml')
+    assert get_template_lookup(VersionsRenderer(DummyRenderInfo()).template_dir) is template_lookup
+    tmpdir.join('versions.xml').write('custom')
+    custom_lookup = get_template_lookup(str(tmpdir))
+    assert custom_lookup is not template_lookup
+    assert custom_lookup.get_template('versions.xml').render() == b'custom'
+
+
+def test_create_template_lookup_external(tmpdir):
+    templates = tmpdir.mkdir('templates')
+    templates.join('custom.xml').write('custom')
+    modules = tmpdir.join('modules')
+    template_lookup = create_template_lookup(str(templates), str(modules))
+    assert template_lookup.get_template('custom.xml').render() == b'custom'
+    assert os.path.isfile(str(modules.join('external', *str(templates).split(os.sep)).join('custom.xml.py')))
+
+
+def test_get_template_names():
+    names = get_template_names('lib/renderer/extract/templates/xml')
+    assert 'extract.xml' in names
+    assert 'geometry/point.xml' in names
+    assert get_template_names('standard/templates') == ['sld.xml']
+
+
+def test_compile_templates(tmpdir):
+    template_lookups = dict(
+        (template_dir, create_template_lookup(template_dir, str(tmpdir)))
+        for template_dir in TEMPLATE_DIRECTORIES
+    )
+    count = compile_templates(template_lookups)
+    assert count == sum(len(get_template_names(template_dir)) for template_dir in TEMPLATE_DIRECTORIES)
+    module = tmpdir.join('lib', 'renderer', 'extract', 'templates', 'xml', 'geometry', 'point.xml.py')
+    assert os.path.isfile(str(module))
+
+
+def test_init_template_lookups():
+    init_template_lookups()
+    template_lookup = get_template_lookup('lib/renderer/extract/templates/xml')
+    assert template_lookup.has_template('public_law_restriction.xml')
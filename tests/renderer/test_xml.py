@@ -1,8 +1,21 @@
 # -*- coding: utf-8 -*-
-
+import datetime
+import shutil
 from io import BytesIO
 
 from lxml import etree
+from pyramid.testing import DummyRequest
+from shapely.geometry import Point
+
+from pyramid_oereb.lib.adapter import FileAdapter
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.records.geometry import GeometryRecord
+from pyramid_oereb.lib.records.image import ImageRecord
+from pyramid_oereb.lib.records.law_status import LawStatusRecord
+from pyramid_oereb.lib.records.office import OfficeRecord
+from pyramid_oereb.lib.records.plr import PlrRecord
+from pyramid_oereb.lib.records.theme import ThemeRecord
+from pyramid_oereb.lib.records.view_service import ViewServiceRecord
 from pyramid_oereb.lib.renderer.extract.xml_ import Renderer
 from pyramid_oereb.lib.renderer.versions.xml_ import Renderer as VersionsRenderer
 from pyramid_oereb.views.webservice import Parameter
@@ -68,3 +81,106 @@ def test_extract_against_schema(parameter, test_extract):
     buffer = BytesIO(rendered)
     doc = etree.parse(buffer)
     xmlschema.assertValid(doc)
+
+
+def create_restriction(information):
+    law_status = LawStatusRecord(u'inForce', {u'de': u'In Kraft'})
+    office = OfficeRecord({u'de': u'AGI'})
+    return PlrRecord(
+        ThemeRecord(u'ContaminatedSites', {u'de': u'Belastete Standorte'}),
+        {u'de': information},
+        law_status,
+        datetime.date(2016, 1, 1),
+        office,
+        ImageRecord(FileAdapter().read('tests/resources/symbol.png')),
+        ViewServiceRecord(u'http://geowms.bl.ch', 1, 1.0, {u'de': u'http://geowms.bl.ch'}, None),
+        [GeometryRecord(law_status, datetime.date(2016, 1, 1), Point(0.5, 0.2), office=office)],
+        type_code=u'CodeA',
+        view_service_id=1
+    )
+
+
+def create_renderer():
+    renderer = Renderer(DummyRenderInfo())
+    renderer._language = u'de'
+    renderer._request = MockRequest()
+    renderer._request.route_url = lambda url, **kwargs: "http://example.com/current/view"
+    return renderer
+
+
+def test_extract_chunks():
+    extract = get_default_extract()
+    extract.real_estate.public_law_restrictions = [create_restriction(u'A'), create_restriction(u'B')]
+    parameter = Parameter('xml', 'reduced', True, False, 'BL0200002829', '1000', 'CH775979211712', 'de')
+    chunks = list(create_renderer()._render_chunks(extract, parameter))
+    assert len(chunks) == 4
+    assert chunks[1].strip().startswith(b'<data:RestrictionOnLandownership>')
+    assert chunks[2].strip().endswith(b'</data:RestrictionOnLandownership>')
+    doc = etree.parse(BytesIO(b''.join(chunks)))
+    restrictions = doc.findall('.//{http://schemas.geo.admin.ch/V_D/OeREB/1.0/ExtractData}'
+                               'RestrictionOnLandownership')
+    assert len(restrictions) == 2
+    gml_ids = doc.xpath('//@gml:id', namespaces={'gml': 'http://www.opengis.net/gml/3.2'})
+    assert len(gml_ids) == len(set(gml_ids))
+
+
+def test_extract_full_without_legal_provision():
+    extract = get_default_extract()
+    extract.real_estate.public_law_restrictions = [create_restriction(u'A')]
+    parameter = Parameter('xml', 'full', True, False, 'BL0200002829', '1000', 'CH775979211712', 'de')
+    with pytest.raises(ValueError):
+        create_renderer()._render_chunks(extract, parameter)
+    with pytest.raises(ValueError):
+        create_renderer()._render(extract, parameter)
+
+
+def find_restrictions(content):
+    doc = etree.parse(BytesIO(content))
+    return doc.findall('.//{http://schemas.geo.admin.ch/V_D/OeREB/1.0/ExtractData}'
+                       'RestrictionOnLandownership/{http://schemas.geo.admin.ch/V_D/OeREB/1.0/ExtractData}'
+                       'Information/{http://schemas.geo.admin.ch/V_D/OeREB/1.0/ExtractData}'
+                       'LocalisedText/{http://schemas.geo.admin.ch/V_D/OeREB/1.0/ExtractData}Text')
+
+
+def test_extract_whole():
+    extract = get_default_extract()
+    extract.real_estate.public_law_restrictions = [create_restriction(u'A'), create_restriction(u'B')]
+    parameter = Parameter('xml', 'reduced', True, False, 'BL0200002829', '1000', 'CH775979211712', 'de')
+    content = create_renderer()._render(extract, parameter)
+    assert isinstance(content, bytes)
+    assert [text.text for text in find_restrictions(content)] == [u'A', u'B']
+
+
+def test_extract_chunks_without_placeholder(tmpdir):
+    # Templates of a project including the restrictions on landownership directly
+    template_dir = str(tmpdir.join('xml'))
+    shutil.copytree(Renderer(None).template_dir, template_dir)
+    real_estate_template = tmpdir.join('xml', 'real_estate.xml')
+    real_estate_template.write(
+        real_estate_template.read().replace('%if restrictions_placeholder:', '%if False:')
+    )
+    extract = get_default_extract()
+    extract.real_estate.public_law_restrictions = [create_restriction(u'A'), create_restriction(u'B')]
+    parameter = Parameter('xml', 'reduced', True, False, 'BL0200002829', '1000', 'CH775979211712', 'de')
+    renderer = create_renderer()
+    renderer.template_dir = template_dir
+    chunks = list(renderer._render_chunks(extract, parameter))
+    assert len(chunks) == 1
+    assert [text.text for text in find_restrictions(chunks[0])] == [u'A', u'B']
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_call_streaming(streaming):
+    extract = get_default_extract()
+    extract.real_estate.public_law_restrictions = [create_restriction(u'A')]
+    parameter = Parameter('xml', 'reduced', True, False, 'BL0200002829', '1000', 'CH775979211712', 'de')
+    request = DummyRequest()
+    request.route_url = lambda url, **kwargs: "http://example.com/current/view"
+    xml_streaming = Config.get('xml_streaming')
+    try:
+        Config._config['xml_streaming'] = streaming
+        content = Renderer(DummyRenderInfo())((extract, parameter), {'request': request})
+    finally:
+        Config._config['xml_streaming'] = xml_streaming
+    assert isinstance(content, bytes) is not streaming
+    assert [text.text for text in find_restrictions(b''.join(content) if streaming else content)] == [u'A']
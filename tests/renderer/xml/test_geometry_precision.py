@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from pyramid_oereb.lib.renderer.coordinates import CoordinateEncoder
+from tests import params
+from tests.renderer.xml import xml_templates
+from shapely.geometry import LineString, Point, Polygon
+
+
+def render(template_name, **kwargs):
+    template = xml_templates().get_template(template_name)
+    content = template.render(**dict(kwargs, **{
+        'default_language': 'de',
+        'get_gml_id': lambda: 'gml1',
+        'coordinate_encoder': CoordinateEncoder(3)
+    })).decode('utf-8')
+    return [line.strip() for line in content.split('\n') if line.strip()]
+
+
+@pytest.mark.parametrize('parameters', params)  # noqa
+def test_point_precision(parameters):
+    content = render('geometry/point.xml', params=parameters, point=Point(2600000.12345, 1200000.5))
+    assert content == ['<gml:pos>2600000.123 1200000.500</gml:pos>']
+
+
+@pytest.mark.parametrize('parameters', params)  # noqa
+def test_line_precision(parameters):
+    line = LineString([(0.00049, 0.0005), (1.23456, 1)])
+    content = render('geometry/line.xml', params=parameters, line=line)
+    assert content[2] == '0.000 0.001 1.235 1.000'
+
+
+@pytest.mark.parametrize('parameters', params)  # noqa
+def test_polygon_precision(parameters):
+    polygon = Polygon([(0, 0), (1.11111, 1), (1, 0)], [[(0.5, 0.2), (0.66666, 0.2), (0.6, 0.3)]])
+    content = render('geometry/polygon.xml', params=parameters, polygon=polygon)
+    assert '0.000 0.000 1.111 1.000 1.000 0.000 0.000 0.000' in content
+    assert '0.500 0.200 0.667 0.200 0.600 0.300 0.500 0.200' in content
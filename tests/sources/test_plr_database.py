@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import copy
+from contextlib import contextmanager
+
+import pytest
+from pyramid.config import ConfigurationError
+from shapely.geometry import Polygon
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from pyramid_oereb.lib.adapter import FileAdapter
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.processor import create_processor
+from pyramid_oereb.standard.models.land_use_plans import Geometry as LandUsePlansGeometry
+from pyramid_oereb.standard.sources.plr import DatabaseSource
+from pyramid_oereb.views.webservice import PlrWebservice
+from tests.mockrequest import MockRequest
+
+
+def create_source(code, loading_strategy):
+    plr = copy.deepcopy([plr for plr in Config.get('plrs') if plr.get('code') == code][0])
+    plr['source']['params']['loading_strategy'] = loading_strategy
+    return DatabaseSource(**plr)
+
+
+@contextmanager
+def count_statements(source):
+    statements = list()
+    engine = source._adapter_.get_connections().get(source._key_).get('engine')
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def read_topic(code, loading_strategy):
+    request = MockRequest()
+    request.matchdict.update({
+        'flavour': 'full',
+        'format': 'json',
+        'param1': 'TEST'
+    })
+    params = PlrWebservice(request).__validate_extract_params__()
+    processor = create_processor()
+    real_estate = processor.real_estate_reader.read(params, egrid=u'TEST')[0]
+    source = create_source(code, loading_strategy)
+    with count_statements(source) as statements:
+        source.read(params, real_estate, real_estate.limit.envelope)
+    return source.records, statements
+
+
+def test_unknown_loading_strategy():
+    with pytest.raises(ConfigurationError):
+        create_source('MotorwaysBuildingLines', 'eager')
+
+
+@pytest.mark.parametrize('loading_strategy,max_statements', [
+    # geometries of real estate, geometries of bbox, plr of each of the 3 geometries in bbox, legend
+    # entries, plrs and one query for each of the 8 related collections
+    ('selectin', 15),
+    # geometries of real estate, geometries of bbox, plr of each of the 3 geometries in bbox, legend
+    # entries, plrs with all relations
+    ('joined', 7)
+])
+def test_read_statement_count(loading_strategy, max_statements):
+    lazy_records, lazy_statements = read_topic('MotorwaysBuildingLines', 'lazy')
+    records, statements = read_topic('MotorwaysBuildingLines', loading_strategy)
+    assert len(statements) <= max_statements
+    assert len(statements) < len(lazy_statements)
+    assert [record.information for record in records] == [record.information for record in lazy_records]
+    assert [len(record.documents) for record in records] == [len(record.documents) for record in lazy_records]
+
+
+@pytest.mark.parametrize('code,empty', [
+    ('MotorwaysBuildingLines', False),
+    ('RailwaysBuildingLines', True)
+])
+def test_is_empty(code, empty):
+    source = create_source(code, 'lazy')
+    assert source.is_empty == empty
+    records, statements = read_topic(code, 'lazy')
+    assert not any('count(' in statement.lower() for statement in statements)
+
+
+def test_check_data_version():
+    source = create_source('MotorwaysBuildingLines', 'lazy')
+    context = source.create_read_context()
+    version = source._data_state_['version']
+    availabilities = source.availabilities
+    datasource = source.datasource
+    assert len(version) == len(datasource)
+
+    # Not checked again within the interval
+    source._data_state_['version'] = ('outdated',)
+    source._data_state_['empty'] = True
+    source.check_data_version()
+    assert source._data_state_['version'] == ('outdated',)
+
+    # Reloaded in place after the interval if the version changed
+    source._data_state_['checked'] = 0
+    source.check_data_version()
+    assert source._data_state_['version'] == version
+    assert not context.is_empty
+    assert source.availabilities is availabilities
+    assert source.datasource is datasource
+    assert context.datasource is datasource
+
+
+def test_get_symbol():
+    source = create_source('ContaminatedSites', 'lazy')
+    symbol = source.create_read_context().get_symbol('1', 'CodeA')
+    assert symbol.content == FileAdapter().read('tests/resources/symbol.png')
+
+    # Taken from the store without querying the database
+    with count_statements(source) as statements:
+        assert source.get_symbol(1, 'CodeA') is symbol
+        assert source.get_symbol('1', 'missing') is None
+    assert statements == []
+
+    # Read again after the data version changed
+    source._data_state_['version'] = ('outdated',)
+    source._data_state_['checked'] = 0
+    assert source.get_symbol('1', 'CodeA') is not symbol
+
+
+def test_extract_geometry_collection_db():
+    geometry = Polygon([(0, 0), (0, 1), (1, 1), (1, 0)])
+    clause = DatabaseSource.extract_geometry_collection_db(LandUsePlansGeometry.geom, geometry)
+    compiled = clause.compile(dialect=postgresql.dialect())
+    assert geometry.wkt not in str(compiled)
+    # The bind parameters are named after the function, so only the calls are counted
+    assert str(compiled).count('ST_GeomFromWKB(') == 3
+    for dimension in (1, 2, 3):
+        assert dimension in compiled.params.values()
+    assert [value for value in compiled.params.values() if isinstance(value, bytes)] == [geometry.wkb]
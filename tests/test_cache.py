@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import time
+
+import pytest
+from shapely.geometry import Polygon
+
+from pyramid_oereb.lib.cache import MemoryExtractCache, DiskExtractCache, ExtractCache, \
+    init_extract_cache, get_extract_cache, ImageCache, MemoryImageCache, DiskImageCache, init_image_cache, \
+    DocumentCache, init_document_cache, get_document_cache
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.records.real_estate import RealEstateRecord
+from pyramid_oereb.lib.sources.plr import PlrBaseSource
+from pyramid_oereb.views.webservice import Parameter
+from tests.records.test_extract import create_dummy_extract
+
+
+class VersionedSource(PlrBaseSource):
+
+    def __init__(self, version, **kwargs):
+        super(VersionedSource, self).__init__(**kwargs)
+        self.version = version
+
+    @property
+    def data_version(self):
+        return self.version
+
+
+def test_create_key():
+    params = Parameter('json', flavour='reduced', egrid='TEST', topics=['B', 'A'])
+    sources = [VersionedSource(1, code='A'), VersionedSource(1, code='B')]
+    key = ExtractCache.create_key(params, 'http://sld', sources)
+    assert key == ExtractCache.create_key(
+        Parameter('json', flavour='reduced', egrid='TEST', topics=['A', 'B']), 'http://sld', sources
+    )
+    assert key != ExtractCache.create_key(
+        Parameter('xml', flavour='reduced', egrid='TEST', topics=['A', 'B']), 'http://sld', sources
+    )
+    assert key != ExtractCache.create_key(
+        Parameter('json', flavour='reduced', egrid='TEST', topics=['A', 'B'], language='fr'), 'http://sld',
+        sources
+    )
+    assert key != ExtractCache.create_key(
+        Parameter('json', flavour='reduced', egrid='TEST', topics=['A', 'B'], generalize=True), 'http://sld',
+        sources
+    )
+    sources[1].version = 2
+    assert key != ExtractCache.create_key(params, 'http://sld', sources)
+
+
+def test_memory_cache():
+    cache = MemoryExtractCache(max_entries=2)
+    extract = create_dummy_extract()
+    assert cache.get('a') is None
+    cache.set('a', extract)
+    cached = cache.get('a')
+    assert cached is not extract
+    assert cached.extract_identifier == extract.extract_identifier
+    assert cache.get('a') is not cached
+    cache.set('b', extract)
+    cache.get('a')
+    cache.set('c', extract)
+    # b is the least recently used extract
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert cache.stats == {
+        'hits': 5,
+        'misses': 2,
+        'stores': 3,
+        'evictions': 1
+    }
+
+
+def test_memory_cache_ttl():
+    cache = MemoryExtractCache(ttl=1)
+    cache.set('a', create_dummy_extract())
+    assert cache.get('a') is not None
+    cache._entries['a'] = (time.time() - 2, cache._entries['a'][1])
+    assert cache.get('a') is None
+
+
+def test_memory_cache_invalid_entry():
+    cache = MemoryExtractCache()
+    cache.set('a', create_dummy_extract())
+    cache._entries['a'] = (time.time(), cache._entries['a'][1][:-10])
+    assert cache.get('a') is None
+    assert 'a' not in cache._entries
+    assert cache.stats['misses'] == 1
+    assert cache.stats['hits'] == 0
+
+
+def test_disk_cache_invalid_entry(tmpdir):
+    cache = DiskExtractCache(str(tmpdir.join('extracts')))
+    cache.set('a', create_dummy_extract())
+    with open(cache._path('a'), 'wb') as f:
+        f.write(b'not an extract')
+    assert cache.get('a') is None
+    assert not os.path.exists(cache._path('a'))
+    assert cache.stats['misses'] == 1
+
+
+def test_disk_cache(tmpdir):
+    directory = str(tmpdir.join('extracts'))
+    cache = DiskExtractCache(directory, max_entries=2, ttl=60)
+    extract = create_dummy_extract()
+    cache.set('a', extract)
+    assert cache.get('a').extract_identifier == extract.extract_identifier
+    cache.set('b', extract)
+    os.utime(cache._path('a'), (time.time() - 30, time.time() - 30))
+    cache.set('c', extract)
+    assert cache.get('a') is None
+    assert len(os.listdir(directory)) == 2
+    os.utime(cache._path('b'), (time.time() - 120, time.time() - 120))
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+    assert cache.stats['evictions'] == 1
+
+
+def test_cached_real_estate():
+    cache = MemoryExtractCache()
+    extract = create_dummy_extract()
+    extract.real_estate = RealEstateRecord('test', 'BL', 'Laufen', 2770, 100,
+                                           Polygon([(0, 0), (0, 10), (10, 10), (10, 0)]))
+    assert extract.real_estate.prepared_limit is not None
+    cache.set('a', extract)
+    cached = cache.get('a')
+    assert cached.real_estate.limit.equals(extract.real_estate.limit)
+    assert cached.real_estate.prepared_limit.contains(Polygon([(1, 1), (1, 2), (2, 2)]))
+
+
+@pytest.mark.parametrize('cache_config,cache_class', [
+    (None, None),
+    ({
+        'class': 'pyramid_oereb.lib.cache.MemoryExtractCache',
+        'params': {
+            'max_entries': 10,
+            'ttl': 60
+        }
+    }, MemoryExtractCache)
+])
+def test_init_extract_cache(cache_config, cache_class):
+    if cache_config:
+        Config._config['extract']['cache'] = cache_config
+    try:
+        extract_cache = init_extract_cache()
+    finally:
+        Config._config['extract'].pop('cache', None)
+        init_extract_cache()
+    if cache_class is None:
+        assert extract_cache is None
+    else:
+        assert isinstance(extract_cache, cache_class)
+        assert extract_cache.max_entries == 10
+        assert extract_cache.ttl == 60
+    assert get_extract_cache() is None
+
+
+def test_normalize_url():
+    assert ImageCache.normalize_url('HTTPS://WMS.Example.com/wms?layers=a&SERVICE=WMS&bbox=1,2,3,4') == \
+        ImageCache.normalize_url('https://wms.example.com/wms?BBOX=1,2,3,4&service=WMS&LAYERS=a')
+    assert ImageCache.normalize_url('https://wms.example.com/wms?LAYERS=a') != \
+        ImageCache.normalize_url('https://wms.example.com/wms?LAYERS=b')
+
+
+def test_image_cache_key():
+    cache = MemoryImageCache()
+    url = 'https://wms.example.com/wms?LAYERS=a'
+    assert cache.create_key(url) == cache.create_key(url, None)
+    assert cache.create_key(url, ((1, 'abc'),)) != cache.create_key(url, ((2, 'def'),))
+    cache = MemoryImageCache(invalidate_on_data_change=False)
+    assert cache.create_key(url, ((1, 'abc'),)) == cache.create_key(url, ((2, 'def'),))
+
+
+def test_memory_image_cache():
+    cache = MemoryImageCache(max_size=10)
+    cache.set('http://wms.example.com/wms?LAYERS=a', b'12345')
+    cache.set('http://wms.example.com/wms?LAYERS=b', b'12345')
+    # Identical images are stored only once
+    assert cache._size == 5
+    cache.set('http://wms.example.com/wms?LAYERS=c', b'abcde')
+    assert cache.get('http://wms.example.com/wms?layers=a') == b'12345'
+    cache.set('http://wms.example.com/wms?LAYERS=d', b'vwxyz')
+    # b and c are the least recently used images, the content of b is still used by a
+    assert cache.get('http://wms.example.com/wms?LAYERS=b') is None
+    assert cache.get('http://wms.example.com/wms?LAYERS=c') is None
+    assert cache.get('http://wms.example.com/wms?LAYERS=a') == b'12345'
+    assert cache.get('http://wms.example.com/wms?LAYERS=d') == b'vwxyz'
+    assert cache._size == 10
+    assert cache.stats['evictions'] == 2
+    assert cache.get('http://wms.example.com/wms?LAYERS=a', ((1, 'abc'),)) is None
+
+
+def test_image_cache_host_ttl():
+    cache = MemoryImageCache(ttl=60, host_ttl={'static.example.com': 3600})
+    assert cache.get_ttl('http://wms.example.com/wms') == 60
+    assert cache.get_ttl('http://static.example.com/wms') == 3600
+    for url in ['http://wms.example.com/wms', 'http://static.example.com/wms']:
+        cache.set(url, b'image')
+        key = cache.create_key(url)
+        cache._entries[key] = (time.time() - 120, cache._entries[key][1])
+    assert cache.get('http://wms.example.com/wms') is None
+    assert cache.get('http://static.example.com/wms') == b'image'
+
+
+def test_disk_image_cache(tmpdir):
+    directory = str(tmpdir.join('images'))
+    cache = DiskImageCache(directory, max_size=10, ttl=60)
+    cache.set('http://wms.example.com/wms?LAYERS=a', b'12345')
+    cache.set('http://wms.example.com/wms?LAYERS=b', b'12345')
+    assert len([name for name in os.listdir(directory) if name.endswith('.image')]) == 1
+    content_path = cache._path(cache.create_key('http://wms.example.com/wms?LAYERS=a'), 'url')
+    os.utime(cache._path(open(content_path).read(), 'image'), (time.time() - 30, time.time() - 30))
+    cache.set('http://wms.example.com/wms?LAYERS=c', b'abcde')
+    cache.set('http://wms.example.com/wms?LAYERS=d', b'vwxyz')
+    assert cache.get('http://wms.example.com/wms?LAYERS=a') is None
+    assert cache.get('http://wms.example.com/wms?LAYERS=b') is None
+    assert cache.get('http://wms.example.com/wms?LAYERS=c') == b'abcde'
+    assert cache.get('http://wms.example.com/wms?LAYERS=d') == b'vwxyz'
+    assert not os.path.exists(content_path)
+
+
+def test_init_image_cache():
+    Config._config['image_download'] = {
+        'cache': {
+            'class': 'pyramid_oereb.lib.cache.MemoryImageCache',
+            'params': {
+                'max_size': 1024,
+                'host_ttl': {
+                    'wms.example.com': 60
+                }
+            }
+        }
+    }
+    try:
+        image_cache = init_image_cache()
+    finally:
+        del Config._config['image_download']
+        init_image_cache()
+    assert isinstance(image_cache, MemoryImageCache)
+    assert image_cache.max_size == 1024
+    assert image_cache.get_ttl('http://wms.example.com/wms') == 60
+
+
+def test_document_cache(tmpdir):
+    directory = str(tmpdir.join('documents'))
+    cache = DocumentCache(directory, max_entries=2, ttl=60)
+    assert cache.lookup('http://my.document.ch/a') == (None, False)
+    cache.set('http://my.document.ch/a', b'a', etag='"1"', last_modified='Wed, 21 Oct 2015 07:28:00 GMT',
+              content_type='application/pdf')
+    entry, fresh = cache.lookup('http://my.document.ch/a')
+    assert fresh
+    assert entry.content == b'a'
+    assert entry.etag == '"1"'
+    assert entry.content_type == 'application/pdf'
+    assert entry.last_modified == 'Wed, 21 Oct 2015 07:28:00 GMT'
+    cache.set('http://my.document.ch/b', b'b')
+    os.utime(cache._path('http://my.document.ch/a', 'meta'), (time.time() - 30, time.time() - 30))
+    cache.set('http://my.document.ch/c', b'c')
+    assert cache.lookup('http://my.document.ch/a') == (None, False)
+    assert sorted(os.listdir(directory)) == sorted([
+        os.path.basename(cache._path('http://my.document.ch/{}'.format(name), extension))
+        for name in ['b', 'c'] for extension in ['document', 'meta']
+    ])
+    cache.ttl = 0
+    entry, fresh = cache.lookup('http://my.document.ch/b')
+    assert entry.content == b'b'
+    assert not fresh
+    cache.ttl = 60
+    cache.revalidated('http://my.document.ch/b', entry)
+    assert cache.lookup('http://my.document.ch/b')[1]
+    assert cache.stats == {
+        'hits': 2,
+        'misses': 2,
+        'stores': 4,
+        'evictions': 1,
+        'revalidations': 1
+    }
+
+
+def test_init_document_cache(tmpdir):
+    Config._config['document_cache'] = {
+        'directory': str(tmpdir.join('documents')),
+        'ttl': 60
+    }
+    try:
+        document_cache = init_document_cache()
+    finally:
+        del Config._config['document_cache']
+        init_document_cache()
+    assert isinstance(document_cache, DocumentCache)
+    assert document_cache.ttl == 60
+    assert get_document_cache() is None
+
+
+def test_document_cache_set_file(tmpdir):
+    cache = DocumentCache(str(tmpdir.join('documents')))
+    handle, path = tempfile.mkstemp(dir=cache.get_download_directory(), suffix='.tmp')
+    with os.fdopen(handle, 'wb') as f:
+        f.write(b'a')
+    entry = cache.set_file('http://my.document.ch/a', path, content_type='application/pdf')
+    assert not os.path.exists(path)
+    assert entry.path == cache._path('http://my.document.ch/a')
+    assert entry.content == b'a'
+    assert cache.lookup('http://my.document.ch/a') == (entry, True)
@@ -6,6 +6,7 @@ from pyramid.config import ConfigurationError
 from pyramid_oereb.lib.adapter import FileAdapter
 from pyramid_oereb.lib.config import Config
 from pyramid_oereb.lib.records.image import ImageRecord
+from pyramid_oereb.lib.records.law_status import LawStatusRecord
 from pyramid_oereb.lib.records.office import OfficeRecord
 
 
@@ -174,3 +175,28 @@ def test_get_real_estate_type_by_mapping():
 
     mapping = Config.get_real_estate_type_by_mapping('Bergwerk')
     assert mapping == 'Mineral_rights'
+
+
+@pytest.mark.run(order=-1)
+def test_snapshot():
+    Config._config = None
+    Config.init('./pyramid_oereb/standard/pyramid_oereb.yml', 'pyramid_oereb')
+    snapshot = Config.get_snapshot()
+    assert Config.get_snapshot() is snapshot
+    assert [theme.code for theme in Config.get_themes()] == [plr['code'] for plr in Config.get('plrs')]
+    theme = Config.get_theme('LandUsePlans')
+    assert theme is Config.get_theme('LandUsePlans')
+    assert theme.position == 1
+    assert Config.get_theme('Invalid') is None
+    assert Config.get_law_status_record('inForce') is LawStatusRecord.from_config('inForce')
+    assert Config.get_law_status_record('inForce').text == Config.get_law_status_translations('inForce')
+    with pytest.raises(AttributeError):
+        Config.get_law_status_record('invalid')
+    logos = Config.get_logo_config(language='fr')
+    assert logos['oereb'] is Config.get_logo_config(language='fr')['oereb']
+    assert logos['canton'] is not Config.get_logo_config(language='it')['canton']
+    with pytest.raises(TypeError):
+        snapshot.themes_by_code['Invalid'] = theme
+    Config._config = None
+    Config.init('./pyramid_oereb/standard/pyramid_oereb.yml', 'pyramid_oereb')
+    assert Config.get_snapshot() is not snapshot
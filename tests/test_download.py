@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+import requests_mock
+
+from pyramid_oereb.lib import cache
+from pyramid_oereb.lib.cache import MemoryImageCache, DocumentCache
+from pyramid_oereb.lib.download import download_wms_images, get_session, download_document, \
+    download_documents, download_document_files
+from pyramid_oereb.lib.records.image import ImageRecord
+from pyramid_oereb.lib.records.view_service import ViewServiceRecord
+
+
+def test_get_session():
+    session = get_session()
+    assert session is get_session()
+    adapter = session.get_adapter('https://wms.geo.admin.ch')
+    assert adapter._pool_block
+    assert adapter.max_retries.total == 2
+
+
+def test_download_wms_images():
+    view_services = [
+        ViewServiceRecord('http://my.wms.com/wms?LAYERS=a', 1, 1.0, {}),
+        ViewServiceRecord('http://my.wms.com/wms?LAYERS=b', 1, 1.0, {}),
+        ViewServiceRecord('http://my.wms.com/wms?LAYERS=a', 1, 1.0, {})
+    ]
+    with requests_mock.mock() as m:
+        m.get('http://my.wms.com/wms?LAYERS=a', content=b'a', headers={'content-type': 'image/png'})
+        m.get('http://my.wms.com/wms?LAYERS=b', content=b'b', headers={'content-type': 'image/png'})
+        download_wms_images(view_services)
+        assert m.call_count == 2
+    for view_service in view_services:
+        assert isinstance(view_service.image, ImageRecord)
+    assert view_services[0].image.content == b'a'
+    assert view_services[1].image.content == b'b'
+    assert view_services[2].image.content == b'a'
+
+
+def test_download_wms_images_error():
+    view_services = [
+        ViewServiceRecord('http://my.wms.com/wms?LAYERS=a', 1, 1.0, {}),
+        ViewServiceRecord('http://my.wms.com/wms?LAYERS=b', 1, 1.0, {})
+    ]
+    with requests_mock.mock() as m:
+        m.get('http://my.wms.com/wms?LAYERS=a', content=b'a', headers={'content-type': 'image/png'})
+        m.get('http://my.wms.com/wms?LAYERS=b', content=b'error', status_code=500)
+        with pytest.raises(LookupError):
+            download_wms_images(view_services)
+
+
+def test_download_wms_images_invalid_url():
+    with pytest.raises(AttributeError):
+        download_wms_images([ViewServiceRecord('invalid', 1, 1.0, {})])
+
+
+def test_download_wms_images_empty():
+    download_wms_images([])
+
+
+def test_download_wms_images_cached():
+    cache.image_cache = MemoryImageCache()
+    try:
+        for i in range(2):
+            view_service = ViewServiceRecord('http://my.wms.com/wms?LAYERS=a', 1, 1.0, {})
+            view_service.data_version = ((1, 'abc'),)
+            with requests_mock.mock() as m:
+                m.get('http://my.wms.com/wms?LAYERS=a', content=b'a', headers={'content-type': 'image/png'})
+                download_wms_images([view_service])
+                assert m.call_count == (1 if i == 0 else 0)
+            assert view_service.image.content == b'a'
+        assert cache.image_cache.stats['hits'] == 1
+    finally:
+        cache.image_cache = None
+
+
+def test_download_documents():
+    with requests_mock.mock() as m:
+        m.get('http://my.document.ch/a', content=b'a')
+        m.get('http://my.document.ch/b', content=b'b')
+        assert download_documents([
+            'http://my.document.ch/a',
+            'http://my.document.ch/b',
+            'http://my.document.ch/a'
+        ]) == {
+            'http://my.document.ch/a': b'a',
+            'http://my.document.ch/b': b'b'
+        }
+        assert m.call_count == 2
+
+
+def test_download_documents_error():
+    with requests_mock.mock() as m:
+        m.get('http://my.document.ch/a', content=b'a')
+        m.get('http://my.document.ch/b', content=b'error', status_code=404)
+        with pytest.raises(LookupError):
+            download_documents(['http://my.document.ch/a', 'http://my.document.ch/b'])
+
+
+def test_download_document_cached(tmpdir):
+    url = 'http://my.document.ch/a'
+    cache.document_cache = DocumentCache(str(tmpdir.join('documents')), ttl=60)
+    try:
+        with requests_mock.mock() as m:
+            m.get(url, content=b'a', headers={'ETag': '"1"'})
+            assert download_document(url) == b'a'
+            assert download_document(url) == b'a'
+            assert m.call_count == 1
+            # Expired documents are revalidated
+            cache.document_cache.ttl = 0
+            m.get(url, status_code=304)
+            assert download_document(url) == b'a'
+            assert m.call_count == 2
+            assert m.last_request.headers['If-None-Match'] == '"1"'
+            m.get(url, content=b'b', headers={'ETag': '"2"'})
+            assert download_document(url) == b'b'
+        assert cache.document_cache.stats['revalidations'] == 1
+    finally:
+        cache.document_cache = None
+
+
+def test_download_document_files(tmpdir):
+    directory = str(tmpdir)
+    with requests_mock.mock() as m:
+        m.get('http://my.document.ch/a', content=b'a', headers={'Content-Type': 'application/pdf'})
+        m.get('http://my.document.ch/b', content=b'b', headers={'Content-Type': 'text/html'})
+        m.get('http://my.document.ch/c', content=b'error', status_code=404)
+        files = download_document_files([
+            'http://my.document.ch/a',
+            'http://my.document.ch/b',
+            'http://my.document.ch/c'
+        ], directory, ignore_errors=True)
+        with pytest.raises(LookupError):
+            download_document_files(['http://my.document.ch/c'], directory)
+    assert sorted(files.keys()) == ['http://my.document.ch/a', 'http://my.document.ch/b']
+    path, content_type = files['http://my.document.ch/a']
+    assert os.path.dirname(path) == directory
+    assert open(path, 'rb').read() == b'a'
+    assert content_type == 'application/pdf'
+    assert files['http://my.document.ch/b'][1] == 'text/html'
+    assert len(os.listdir(directory)) == 2
+
+
+def test_download_document_files_cached(tmpdir):
+    url = 'http://my.document.ch/a'
+    cache.document_cache = DocumentCache(str(tmpdir.join('documents')))
+    try:
+        for i in range(2):
+            directory = str(tmpdir.join(str(i)))
+            os.makedirs(directory)
+            with requests_mock.mock() as m:
+                m.get(url, content=b'a', headers={'Content-Type': 'application/pdf'})
+                path, content_type = download_document_files([url], directory)[url]
+                assert m.call_count == (1 if i == 0 else 0)
+            assert os.path.dirname(path) == directory
+            assert open(path, 'rb').read() == b'a'
+            assert content_type == 'application/pdf'
+        assert cache.document_cache.lookup(url)[1]
+    finally:
+        cache.document_cache = None
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+
+import pytest
+
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.print_jobs import PrintJobStore, PrintJobQueue, PrintJobQueueFull, \
+    init_print_job_queue, get_print_job_queue
+
+
+def test_store(tmpdir):
+    store = PrintJobStore(str(tmpdir.join('jobs')), ttl=60)
+    job_id = store.create()
+    assert store.get(job_id)['status'] == 'pending'
+    store.update(job_id, 'error', error='failed')
+    assert store.get(job_id)['error'] == 'failed'
+    with open(store.result_path(job_id), 'wb') as f:
+        f.write(b'%PDF')
+    assert store.get('0' * 32) is None
+    assert store.get('../secret') is None
+    with pytest.raises(ValueError):
+        store.result_path('../secret')
+    store.cleanup()
+    assert store.get(job_id) is not None
+    json_path = os.path.join(store.directory, '{0}.json'.format(job_id))
+    os.utime(json_path, (time.time() - 120, time.time() - 120))
+    store.cleanup()
+    assert store.get(job_id) is None
+    assert os.listdir(store.directory) == []
+
+
+def test_queue(tmpdir):
+    queue = PrintJobQueue(PrintJobStore(str(tmpdir.join('jobs'))))
+
+    def print_job(path):
+        with open(path, 'wb') as f:
+            f.write(b'%PDF')
+
+    def failing_print_job(path):
+        raise LookupError('Print service unavailable')
+
+    job_id = queue.submit('http://print', print_job)
+    assert queue.wait(job_id)['status'] == 'finished'
+    with open(queue.store.result_path(job_id), 'rb') as f:
+        assert f.read() == b'%PDF'
+    failed_job_id = queue.submit('http://print', failing_print_job)
+    state = queue.wait(failed_job_id)
+    assert state['status'] == 'error'
+    assert state['error'] == 'Print service unavailable'
+    assert queue._pending['http://print'] == 0
+
+
+def test_queue_full(tmpdir):
+    queue = PrintJobQueue(PrintJobStore(str(tmpdir.join('jobs'))), max_jobs_per_backend=1, max_queued_jobs=1)
+    event = threading.Event()
+
+    def print_job(path):
+        event.wait(10)
+
+    job_ids = [queue.submit('http://print', print_job), queue.submit('http://print', print_job)]
+    with pytest.raises(PrintJobQueueFull):
+        queue.submit('http://print', print_job)
+    # Other print backends have their own queue
+    job_ids.append(queue.submit('http://other', print_job))
+    event.set()
+    for job_id in job_ids:
+        assert queue.wait(job_id)['status'] == 'finished'
+
+
+def test_init_print_job_queue(tmpdir):
+    Config._config['print']['jobs'] = {
+        'directory': str(tmpdir.join('jobs')),
+        'max_jobs_per_backend': 4,
+        'poll_interval': 1
+    }
+    try:
+        print_job_queue = init_print_job_queue()
+    finally:
+        del Config._config['print']['jobs']
+        init_print_job_queue()
+    assert isinstance(print_job_queue, PrintJobQueue)
+    assert print_job_queue.max_jobs_per_backend == 4
+    assert print_job_queue.max_queued_jobs == 20
+    assert get_print_job_queue() is None
@@ -3,7 +3,8 @@ import datetime
 import pytest
 from shapely.geometry import Point
 
-from pyramid_oereb.lib.processor import Processor, create_processor
+from pyramid_oereb.lib.config import Config
+from pyramid_oereb.lib.processor import Processor, ProcessorFactory, create_processor
 from pyramid_oereb.lib.records.extract import ExtractRecord
 from pyramid_oereb.lib.records.geometry import GeometryRecord
 from pyramid_oereb.lib.records.image import ImageRecord
@@ -42,6 +43,37 @@ def test_properties():
     assert isinstance(processor.real_estate_reader, RealEstateReader)
 
 
+def test_processor_factory():
+    factory = ProcessorFactory()
+    processor1 = factory.create_processor()
+    processor2 = factory.create_processor()
+    assert len(processor1.plr_sources) == len(factory.plr_sources)
+    for shared, context1, context2 in zip(factory.plr_sources, processor1.plr_sources,
+                                          processor2.plr_sources):
+        assert context1 is not shared
+        assert context1 is not context2
+        assert context1.availabilities is shared.availabilities
+        assert context1.datasource is shared.datasource
+        assert context1._theme_record is not context2._theme_record
+
+
+def test_processor_factory_isolates_records():
+    request = MockRequest()
+    request.matchdict.update(request_matchdict)
+    factory = ProcessorFactory()
+    webservice = PlrWebservice(request)
+    params = webservice.__validate_extract_params__()
+    processor1 = factory.create_processor()
+    real_estate = processor1.real_estate_reader.read(params, egrid=u'TEST')
+    processor1.process(real_estate[0], params, 'http://test.ch')
+    processor2 = factory.create_processor()
+    for shared, context1, context2 in zip(factory.plr_sources, processor1.plr_sources,
+                                          processor2.plr_sources):
+        assert len(context1.records) > 0
+        assert len(context2.records) == 0
+        assert len(shared.records) == 0
+
+
 def test_process():
     request = MockRequest()
     request.matchdict.update(request_matchdict)
@@ -53,6 +85,56 @@ def test_process():
     assert isinstance(extract, ExtractRecord)
 
 
+def test_process_concurrent_plr_read():
+    request = MockRequest()
+    request.matchdict.update(request_matchdict)
+    webservice = PlrWebservice(request)
+    params = webservice.__validate_extract_params__()
+    processor = create_processor()
+    real_estate = processor.real_estate_reader.read(params, egrid=u'TEST')
+    sequential = processor.process(real_estate[0], params, 'http://test.ch')
+    Config._config['extract']['concurrent_plr_read'] = {
+        'max_workers': 4,
+        'max_workers_per_connection': 2
+    }
+    try:
+        processor = create_processor()
+        real_estate = processor.real_estate_reader.read(params, egrid=u'TEST')
+        concurrent = processor.process(real_estate[0], params, 'http://test.ch')
+    finally:
+        del Config._config['extract']['concurrent_plr_read']
+    assert [plr.theme.code for plr in concurrent.real_estate.public_law_restrictions] == \
+        [plr.theme.code for plr in sequential.real_estate.public_law_restrictions]
+    assert [theme.code for theme in concurrent.concerned_theme] == \
+        [theme.code for theme in sequential.concerned_theme]
+    assert [ds.theme.code for ds in concurrent.embeddable.datasources] == \
+        [ds.theme.code for ds in sequential.embeddable.datasources]
+
+
+def test_process_combined_plr_read():
+    request = MockRequest()
+    request.matchdict.update(request_matchdict)
+    webservice = PlrWebservice(request)
+    params = webservice.__validate_extract_params__()
+    processor = create_processor()
+    real_estate = processor.real_estate_reader.read(params, egrid=u'TEST')
+    separate = processor.process(real_estate[0], params, 'http://test.ch')
+    Config._config['extract']['combined_plr_read'] = True
+    try:
+        processor = create_processor()
+        real_estate = processor.real_estate_reader.read(params, egrid=u'TEST')
+        combined = processor.process(real_estate[0], params, 'http://test.ch')
+    finally:
+        Config._config['extract']['combined_plr_read'] = False
+    assert any(plr_source._combined_result_ is not None for plr_source in processor.plr_sources)
+    assert [(plr.theme.code, plr.information) for plr in combined.real_estate.public_law_restrictions] == \
+        [(plr.theme.code, plr.information) for plr in separate.real_estate.public_law_restrictions]
+    assert [theme.code for theme in combined.concerned_theme] == \
+        [theme.code for theme in separate.concerned_theme]
+    assert [theme.code for theme in combined.not_concerned_theme] == \
+        [theme.code for theme in separate.not_concerned_theme]
+
+
 def test_process_geometry_testing():
     request = MockRequest()
     request.matchdict.update(request_matchdict)
@@ -7,6 +7,8 @@ from pyramid.httpexceptions import HTTPBadRequest, HTTPNoContent
 
 from tests import pyramid_oereb_test_config, schema_json_extract
 from tests.mockrequest import MockRequest
+from pyramid_oereb.lib import cache
+from pyramid_oereb.lib.cache import MemoryExtractCache
 from pyramid_oereb.views.webservice import PlrWebservice
 
 log = logging.getLogger('pyramid_oereb')
@@ -122,6 +124,28 @@ def test_matchdict(params, expected):
         assert getattr(params, k) == v
 
 
+def test_params_generalize():
+    request = MockRequest()
+    request.matchdict.update({
+        'flavour': 'REDUCED',
+        'format': 'JSON',
+        'param1': 'GEOMETRY',
+        'param2': 'SomeEGRID'
+    })
+    request.params.update({
+        'GENERALIZE': ''
+    })
+    params = PlrWebservice(request).__validate_extract_params__()
+    assert params.with_geometry
+    assert params.generalize
+    request.matchdict.update({
+        'param1': 'SomeEGRID',
+        'param2': None
+    })
+    with pytest.raises(HTTPBadRequest):
+        PlrWebservice(request).__validate_extract_params__()
+
+
 def test_params():
     request = MockRequest()
     request.matchdict.update({
@@ -162,6 +186,31 @@ def test_return_no_content():
     assert isinstance(response, HTTPNoContent)
 
 
+def test_return_json_cached():
+    cache.extract_cache = MemoryExtractCache()
+    try:
+        responses = list()
+        for i in range(2):
+            with pyramid_oereb_test_config() as pyramid_config:
+                pyramid_config.add_renderer('pyramid_oereb_extract_json',
+                                            'pyramid_oereb.lib.renderer.extract.json_.Renderer')
+                request = MockRequest()
+                request.matchdict.update({
+                    'flavour': 'REDUCED',
+                    'format': 'JSON',
+                    'param1': 'TEST'
+                })
+                service = PlrWebservice(request)
+                response = service.get_extract_by_id()
+            responses.append(json.loads(response.body.decode('utf-8'))['GetExtractByIdResponse']['extract'])
+        assert cache.extract_cache.stats['misses'] == 1
+        assert cache.extract_cache.stats['hits'] == 1
+    finally:
+        cache.extract_cache = None
+    assert responses[0]['ExtractIdentifier'] != responses[1]['ExtractIdentifier']
+    assert responses[0]['RealEstate'] == responses[1]['RealEstate']
+
+
 @pytest.mark.parametrize('topics', [
     'ALL',
     'ALL_FEDERAL',
@@ -27,3 +27,23 @@ def test_get_image_invalid():
     webservice = Logo(request)
     with pytest.raises(HTTPNotFound):
         webservice.get_image()
+
+
+def test_get_image_not_modified():
+    request = MockRequest()
+    request.matchdict.update({
+        'logo': 'oereb'
+    })
+    result = Logo(request).get_image()
+    logo = Config.get_logo_config().get('oereb')
+    assert result.etag == logo.etag
+    assert result.cache_control.public
+    assert result.cache_control.max_age == 3600
+    request = MockRequest()
+    request.matchdict.update({
+        'logo': 'oereb'
+    })
+    request.headers['If-None-Match'] = '"{0}"'.format(logo.etag)
+    result = Logo(request).get_image()
+    assert result.status_int == 304
+    assert result.body == b''
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+from pyramid.httpexceptions import HTTPNotFound, HTTPInternalServerError
+
+from pyramid_oereb.lib import print_jobs
+from pyramid_oereb.lib.print_jobs import PrintJobStore, PrintJobQueue
+from pyramid_oereb.views.webservice import PrintJob
+from tests import pyramid_oereb_test_config
+from tests.mockrequest import MockRequest
+
+
+@pytest.fixture
+def print_job_queue(tmpdir):
+    print_jobs.print_job_queue = PrintJobQueue(PrintJobStore(str(tmpdir.join('jobs'))))
+    yield print_jobs.print_job_queue
+    print_jobs.print_job_queue = None
+
+
+def create_request(job_id):
+    request = MockRequest()
+    request.matchdict.update({'job_id': job_id})
+    return request
+
+
+def test_get_status(print_job_queue):
+    job_id = print_job_queue.store.create()
+    with pyramid_oereb_test_config():
+        response = PrintJob(create_request(job_id)).get_status()
+    state = json.loads(response.text)
+    assert state['id'] == job_id
+    assert state['status'] == 'pending'
+    assert not state['done']
+    assert state['error'] is None
+    assert state['status_url'] == 'http://example.com/print_job/{0}/status'.format(job_id)
+    assert state['download_url'] == 'http://example.com/print_job/{0}/report'.format(job_id)
+
+
+@pytest.mark.parametrize('job_id', ['0' * 32, 'invalid'])
+def test_get_status_unknown(print_job_queue, job_id):
+    with pytest.raises(HTTPNotFound):
+        PrintJob(create_request(job_id)).get_status()
+
+
+def test_get_status_not_configured():
+    with pytest.raises(HTTPNotFound):
+        PrintJob(create_request('0' * 32)).get_status()
+
+
+def test_get_report(print_job_queue):
+    job_id = print_job_queue.store.create()
+    with pyramid_oereb_test_config():
+        response = PrintJob(create_request(job_id)).get_report()
+    assert response.status_code == 202
+    with open(print_job_queue.store.result_path(job_id), 'wb') as f:
+        f.write(b'%PDF')
+    print_job_queue.store.update(job_id, 'finished')
+    response = PrintJob(create_request(job_id)).get_report()
+    assert response.status_code == 200
+    assert response.content_type == 'application/pdf'
+    assert b''.join(response.app_iter) == b'%PDF'
+    print_job_queue.store.update(job_id, 'error', error='Connection to http://print:8080 refused')
+    with pytest.raises(HTTPInternalServerError) as e:
+        PrintJob(create_request(job_id)).get_report()
+    assert 'print:8080' not in str(e.value)
+    with pyramid_oereb_test_config():
+        response = PrintJob(create_request(job_id)).get_status()
+    state = json.loads(response.text)
+    assert state['done']
+    assert state['error'] == 'The print job failed'
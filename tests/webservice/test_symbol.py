@@ -32,3 +32,23 @@ def test_get_image_invalid():
     webservice = Symbol(request)
     with pytest.raises(HTTPNotFound):
         webservice.get_image()
+
+
+def test_get_image_not_modified():
+    request = MockRequest()
+    request.matchdict.update({
+        'theme_code': 'ContaminatedSites',
+        'view_service_id': '1',
+        'type_code': 'CodeA'
+    })
+    etag = Symbol(request).get_image().etag
+    request = MockRequest()
+    request.matchdict.update({
+        'theme_code': 'ContaminatedSites',
+        'view_service_id': '1',
+        'type_code': 'CodeA'
+    })
+    request.headers['If-None-Match'] = '"{0}"'.format(etag)
+    result = Symbol(request).get_image()
+    assert result.status_int == 304
+    assert result.body == b''